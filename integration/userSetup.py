@@ -1,13 +1,131 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
-'''Integrate Pickrunner into Maya's startup sequence.'''
+'''Integrate Pickrunner into Maya's startup sequence.
+
+Nothing in this module runs while Maya is booting. The hotkeys are registered
+once Maya is idle and they're skipped entirely in batch / mayapy sessions,
+where there's no keyboard to press arrow keys with anyway.
+
+Only the arrow keys, which replace pickWalk, are always bound. Every other
+Pickrunner hotkey (Page Up / Down, Ctrl+Alt+arrows, custom directions) is
+only bound if the key isn't already used, so the user's own bindings win.
+
+'''
 
 # IMPORT STANDARD LIBRARIES
-import textwrap
+import logging
 
 # IMPORT THIRD-PARTY LIBRARIES
-import pymel.core as pm
+from maya import cmds
+from maya import utils
+
+HOTKEY_SET_NAME = 'Pickrunner'
+LOCKED_HOTKEY_SETS = ('Maya_Default', )
+COMMAND_TEMPLATE = \
+    'python("from pickrunner import mayarunner;mayarunner.do_pickrun_motion(\'{direction}\')")'
+HISTORY_COMMAND_TEMPLATE = 'python("from pickrunner import mayarunner;mayarunner.{function}()")'
+# Ctrl+Alt+Left / Right step back and forward through past Pickrunner selections
+HISTORY_KEYS = (('Back', 'Left', 'go_back'), ('Forward', 'Right', 'go_forward'))
+HISTORY_MODIFIERS = {'ctrlModifier': True, 'altModifier': True}
+MODIFIER_FLAGS = {'ctrl': 'ctrlModifier', 'alt': 'altModifier', 'shift': 'shiftModifier'}
+# hotkeyCheck has no flag for Shift. Shifted keys are checked without it
+CHECK_MODIFIER_FLAGS = ('ctrlModifier', 'altModifier')
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def get_name_command(key):
+    '''str: The name of the nameCommand that Pickrunner binds to a key.'''
+    return 'pickrunner_{key}'.format(key=key)
+
+
+def get_hotkeys():
+    '''Find every hotkey that Pickrunner binds.
+
+    Every direction in :obj:`pickrunner.directions.REGISTRY` that has a key is
+    bound, plus the keys that go back / forward through the selection history.
+
+    Returns:
+        list[tuple[str, str, dict[str, bool], str, str, bool]]:
+            The nameCommand, key, key modifiers, MEL command and annotation
+            of each hotkey and if it replaces pickWalk (and so must be
+            bound, even if the key is already used).
+
+    '''
+    # Imported here so that batch sessions never import Pickrunner at all
+    from pickrunner import directions  # pylint: disable=import-outside-toplevel
+
+    hotkeys = []
+
+    for direction in directions.REGISTRY:
+        if not direction.key:
+            continue
+
+        hotkeys.append((
+            get_name_command(''.join(part.title() for part in direction.name.split('_'))),
+            direction.key,
+            dict((MODIFIER_FLAGS[modifier], True) for modifier in direction.modifiers),
+            COMMAND_TEMPLATE.format(direction=direction.name),
+            'Use Pickrunner to go {direction}'.format(direction=direction.label.lower()),
+            bool(direction.walk) and not direction.modifiers,
+        ))
+
+    for name, key, function in HISTORY_KEYS:
+        hotkeys.append((
+            get_name_command(name),
+            key,
+            HISTORY_MODIFIERS,
+            HISTORY_COMMAND_TEMPLATE.format(function=function),
+            'Go {name} to a previous Pickrunner selection'.format(name=name.lower()),
+            False,
+        ))
+
+    return hotkeys
+
+
+def get_existing_name_commands():
+    '''set[str]: The names of every nameCommand that Maya knows about.'''
+    return set(cmds.assignCommand(query=True, name=True) or [])
+
+
+def is_pickwalk_overridden():
+    '''bool: If every key that replaces pickWalk in the current hotkey set runs Pickrunner.'''
+    for name, key, modifiers, _, _, is_required in get_hotkeys():
+        if is_required and cmds.hotkey(key, query=True, name=True, **modifiers) != name:
+            return False
+
+    return True
+
+
+def is_key_assigned(key, modifiers):
+    '''bool: If some key (and modifiers) already runs anything in the current hotkey set.'''
+    flags = dict(
+        (flag, value) for flag, value in modifiers.items() if flag in CHECK_MODIFIER_FLAGS)
+
+    return bool(cmds.hotkeyCheck(keyString=key, **flags))
+
+
+def make_hotkey_set_editable():
+    '''Make sure the current hotkey set is one that we're allowed to edit.
+
+    Maya's default hotkey set is locked. If it's the current set, switch to
+    a copy of it (creating the copy only if it doesn't already exist).
+
+    '''
+    try:
+        current = cmds.hotkeySet(query=True, current=True)
+    except AttributeError:
+        # Maya versions before 2016 have no hotkey sets
+        return
+
+    if current not in LOCKED_HOTKEY_SETS:
+        return
+
+    if cmds.hotkeySet(HOTKEY_SET_NAME, exists=True):
+        cmds.hotkeySet(HOTKEY_SET_NAME, edit=True, current=True)
+    else:
+        cmds.hotkeySet(HOTKEY_SET_NAME, source=current, current=True)
 
 
 def override_pickwalk():
@@ -19,38 +137,62 @@ def override_pickwalk():
     If there's no mapping for the pickWalk direction defined for Pickrunner,
     just pickWalk instead.
 
+    Pickrunner's other hotkeys are only bound to keys that aren't already
+    used. Keys that are used are skipped and logged.
+
+    This function is safe to call more than once. Bindings and nameCommands
+    that already exist are left alone.
+
     '''
-    command = pm.nameCommand(
-        'pickrunner_Up',
-        command='python("from pickrunner import mayarunner;mayarunner.do_pickrun_motion(\'up\')")',
-        annotation='Use Pickrunner to go up')
-    pm.hotkey(keyShortcut='Up', name=command)
+    if not is_pickwalk_overridden():
+        make_hotkey_set_editable()
 
-    command = pm.nameCommand(
-        'pickrunner_Down',
-        command='python("from pickrunner import mayarunner;mayarunner.do_pickrun_motion(\'down\')")',
-        annotation='Use Pickrunner to go down')
-    pm.hotkey(keyShortcut='Down', name=command)
+    existing_commands = get_existing_name_commands()
 
-    command = pm.nameCommand(
-        'pickrunner_Left',
-        command='python("from pickrunner import mayarunner;mayarunner.do_pickrun_motion(\'left\')")',
-        annotation='Use Pickrunner to go left')
-    pm.hotkey(keyShortcut='Left', name=command)
+    for name, key, modifiers, command, annotation, is_required in get_hotkeys():
+        if cmds.hotkey(key, query=True, name=True, **modifiers) == name:
+            continue
 
-    command = pm.nameCommand(
-        'pickrunner_Right',
-        command='python("from pickrunner import mayarunner;mayarunner.do_pickrun_motion(\'right\')")',
-        annotation='Use Pickrunner to go right')
-    pm.hotkey(keyShortcut='Right', name=command)
+        if not is_required and is_key_assigned(key, modifiers):
+            shortcut = [flag.replace('Modifier', '').title() for flag in sorted(modifiers)]
+            _LOGGER.info('Skipped the Pickrunner hotkey "%s" because %s is already used.',
+                         name, '+'.join(shortcut + [key]))
+            continue
 
+        if name not in existing_commands:
+            cmds.nameCommand(name, command=command, annotation=annotation)
 
+        cmds.hotkey(keyShortcut=key, name=name, **modifiers)
 
 
-def main():
-    '''Override pickWalk with Pickrunner.'''
+def install():
+    '''Set up Pickrunner's hotkeys, start indexing scenes and, if enabled, start its service.'''
     override_pickwalk()
 
+    # Imported here so that batch sessions never import Pickrunner at all
+    from pickrunner import component_index  # pylint: disable=import-outside-toplevel
+    from pickrunner import scene_index  # pylint: disable=import-outside-toplevel
+    from pickrunner import service  # pylint: disable=import-outside-toplevel
+    scene_index.install()
+    component_index.install()
+
+    if service.is_enabled():
+        from pickrunner import mayarunner  # pylint: disable=import-outside-toplevel
+
+        try:
+            mayarunner.start_service()
+        except service.ServiceError as error:
+            # e.g. Another Maya is already running the service
+            cmds.warning('Pickrunner service did not start: {error}'.format(error=error))
+
+
+def main():
+    '''Override pickWalk with Pickrunner, once Maya has finished loading.'''
+    if cmds.about(batch=True):
+        return
+
+    utils.executeDeferred(install)
+
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,150 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+'''Save and load Pickrunner links to / from a local cache file.
+
+Reading the links of a large scene means visiting every node that has
+Pickrunner data. When the same scene is opened again and nothing about it
+has changed, that work can be skipped by reading the links from a cache file.
+
+The cache is optional. It's only used if the PICKRUNNER_CACHE_DIR environment
+variable points to a folder. Every scene gets one file in that folder and
+each file remembers the key that it was written with. If the key of the scene
+changes (because the scene or one of its references was saved again), the
+file is ignored and will be overwritten.
+
+'''
+
+# IMPORT STANDARD LIBRARIES
+import hashlib
+import json
+import os
+
+CACHE_DIRECTORY_ENVIRONMENT_VARIABLE = 'PICKRUNNER_CACHE_DIR'
+CACHE_VERSION = 1
+
+
+def get_cache_directory():
+    '''str: The folder that cache files are written to or "" if caching is off.'''
+    return os.getenv(CACHE_DIRECTORY_ENVIRONMENT_VARIABLE, '')
+
+
+def is_enabled():
+    '''bool: If the user wants scenes to be cached.'''
+    return bool(get_cache_directory())
+
+
+def _hash(text):
+    '''str: Get a short, filename-safe hash of some text.'''
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+def _get_file_signature(path):
+    '''str: Describe a file's path, modification time and size.'''
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return '{path}:missing'.format(path=path)
+
+    return '{path}:{time!r}:{size}'.format(path=path, time=stat.st_mtime, size=stat.st_size)
+
+
+def get_cache_key(scene, references=None):
+    '''Make a key that changes whenever a scene or its references change.
+
+    Args:
+        scene (str): The path to the scene file.
+        references (:obj:`iterable[str]`, optional):
+            The paths of every file that the scene references. Default is None.
+
+    Returns:
+        str: The key or "" if the scene has no path (it was never saved).
+
+    '''
+    if not scene:
+        return ''
+
+    signatures = [_get_file_signature(scene)]
+    signatures.extend(sorted(_get_file_signature(path) for path in references or []))
+
+    return _hash('\n'.join(signatures))
+
+
+def get_cache_path(scene):
+    '''str: The file that the cache of some scene is written to.'''
+    return os.path.join(get_cache_directory(), _hash(scene) + '.json')
+
+
+def read(scene, key):
+    '''Load the cached links of some scene.
+
+    Args:
+        scene (str): The path to the scene file.
+        key (str): The scene's key. See :func:`get_cache_key`.
+
+    Returns:
+        dict or NoneType:
+            The cached "settings" (each UUID and its links) and "names" (each
+            UUID and its name) or None, if there's no up-to-date cache.
+
+    '''
+    if not is_enabled() or not key:
+        return None
+
+    try:
+        with open(get_cache_path(scene), 'r') as handler:
+            data = json.load(handler)
+    except (IOError, OSError, ValueError):
+        return None
+
+    if not isinstance(data, dict):
+        return None
+
+    if data.get('version') != CACHE_VERSION or data.get('key') != key:
+        return None
+
+    return data
+
+
+def write(scene, key, settings, names):
+    '''Save the links of some scene so that they can be read quickly later.
+
+    Args:
+        scene (str): The path to the scene file.
+        key (str): The scene's key. See :func:`get_cache_key`.
+        settings (dict[str, dict[str, str]]): Each UUID and its links.
+        names (dict[str, str]): Each UUID and its name.
+
+    Returns:
+        bool: If the cache was written.
+
+    '''
+    if not is_enabled() or not key:
+        return False
+
+    path = get_cache_path(scene)
+    temporary_path = path + '.tmp'
+    data = {
+        'version': CACHE_VERSION,
+        'key': key,
+        'scene': scene,
+        'settings': settings,
+        'names': names,
+    }
+
+    try:
+        if not os.path.isdir(get_cache_directory()):
+            os.makedirs(get_cache_directory())
+
+        # Write to a temporary file first so a crash never leaves a half-written cache
+        with open(temporary_path, 'w') as handler:
+            json.dump(data, handler)
+
+        if os.path.isfile(path):
+            os.remove(path)
+
+        os.rename(temporary_path, path)
+    except (IOError, OSError):
+        return False
+
+    return True
@@ -0,0 +1,397 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+'''Read and write Pickrunner links between the CVs / vertices of Maya shapes.
+
+Each shape stores its links, sparsely, in an Int32Array attribute plus a small
+string attribute that names the direction of each column (see
+:mod:`pickrunner.components`). Reading a shape's links is done once, through
+the Maya API, into a :class:`pickrunner.components.ComponentLinks` table with
+one row per component of the shape. It's then kept in memory so every
+arrow-key press after that is O(1).
+
+Tables are kept by the shape's full path because UUIDs repeat when the same
+file is referenced more than once. A table is forgotten whenever its
+shape's link attributes change, even outside of Pickrunner, or the shape's
+number of components no longer matches the table.
+
+Like :mod:`pickrunner.scene_index`, this module only uses maya.cmds and the
+Maya Python API. Links are written with maya.cmds, so writes can be undone,
+and only the links themselves are written, never the whole table.
+
+'''
+
+# IMPORT STANDARD LIBRARIES
+import collections
+import json
+import logging
+import re
+
+# IMPORT THIRD-PARTY LIBRARIES
+from maya.api import OpenMaya as om
+from maya import cmds
+
+# IMPORT LOCAL LIBRARIES
+from . import components
+from . import lru
+from . import scene_index
+
+ATTRIBUTE_NAME = '__pickrunner_components'
+DIRECTIONS_ATTRIBUTE_NAME = '__pickrunner_component_directions'
+# The shape type that each supported kind of component belongs to
+COMPONENT_TYPES = {'vtx': 'mesh', 'cv': 'nurbsCurve'}
+MAX_RESIDENT_SHAPES = 16
+
+_COMPONENT_PATTERN = re.compile(
+    r'^(?P<node>[^.]+)\.(?P<kind>vtx|cv)\[(?:\d+:)?(?P<index>\d+)\]$')
+_LOGGER = logging.getLogger(__name__)
+_SHAPES = lru.LRUCache(MAX_RESIDENT_SHAPES)
+_WATCHED = dict()
+_CALLBACKS = []
+
+
+def _get_shape(node, kind):
+    '''str: Find the shape of a node that has some kind of component, if any.'''
+    shape_type = COMPONENT_TYPES[kind]
+
+    if cmds.objectType(node, isAType=shape_type):
+        return cmds.ls(node, long=True)[0]
+
+    for shape in cmds.listRelatives(node, shapes=True, noIntermediate=True, fullPath=True) or []:
+        if cmds.objectType(shape, isAType=shape_type):
+            return shape
+
+    return ''
+
+
+def parse_component(name, shapes=None):
+    '''Split the name of a selected CV / vertex into its shape and index.
+
+    Args:
+        name (str):
+            A component, as Maya names it. e.g. "pSphere1.vtx[12]". For a
+            range, like "curve1.cv[2:4]", the last component is used.
+        shapes (:obj:`dict[tuple[str, str], str]`, optional):
+            Remembers the shape of each (node, kind). Pass the same
+            dictionary to parse many components of the same nodes quickly.
+
+    Returns:
+        tuple[str, str, int] or NoneType:
+            The shape's full path, the kind of component (e.g. "vtx") and its
+            index or None if `name` isn't a supported component.
+
+    '''
+    match = _COMPONENT_PATTERN.match(name)
+
+    if not match:
+        return None
+
+    if shapes is None:
+        shapes = dict()
+
+    kind = match.group('kind')
+    key = (match.group('node'), kind)
+
+    try:
+        shape = shapes[key]
+    except KeyError:
+        shape = ''
+
+        if cmds.objExists(key[0]):
+            shape = _get_shape(*key)
+
+        shapes[key] = shape
+
+    if not shape:
+        return None
+
+    return (shape, kind, int(match.group('index')))
+
+
+def get_component_name(shape, kind, index):
+    '''str: The name that Maya selects a component by. e.g. "|pSphere1|pSphereShape1.vtx[12]".'''
+    return '{shape}.{kind}[{index}]'.format(shape=shape, kind=kind, index=index)
+
+
+def _get_component_count(node):
+    '''int: The number of vertices of a mesh or CVs of a NURBS curve.'''
+    if node.hasFn(om.MFn.kMesh):
+        return om.MFnMesh(node).numVertices
+
+    if node.hasFn(om.MFn.kNurbsCurve):
+        return om.MFnNurbsCurve(node).numCVs
+
+    return 0
+
+
+def _on_attribute_changed(_, plug, __, client_data):
+    '''Forget the table of a shape whenever its stored links change.'''
+    if om.MFnAttribute(plug.attribute()).name not in (ATTRIBUTE_NAME, DIRECTIONS_ATTRIBUTE_NAME):
+        return
+
+    key = client_data.hashCode()
+
+    for path in _SHAPES.keys():
+        if _SHAPES.peek(path)[0].hashCode() == key:
+            _SHAPES.pop(path)
+
+
+def _watch(node):
+    '''Forget the table of `node` whenever its stored links change. Each node is only watched once.'''
+    handle = om.MObjectHandle(node)
+    key = handle.hashCode()
+
+    try:
+        watched_handle, _ = _WATCHED[key]
+    except KeyError:
+        pass
+    else:
+        if watched_handle.isValid():
+            return
+
+    _WATCHED[key] = (
+        handle,
+        om.MNodeMessage.addAttributeChangedCallback(node, _on_attribute_changed, handle),
+    )
+
+
+def _is_current(shape, entry):
+    '''bool: If a cached table still belongs to the node at `shape` and matches its components.'''
+    handle, count, _ = entry
+
+    if not handle.isAlive() or not handle.isValid():
+        return False
+
+    node = handle.object()
+
+    if om.MFnDagNode(node).fullPathName() != shape:
+        # The shape was renamed / reparented and another node took its path
+        return False
+
+    return _get_component_count(node) == count
+
+
+def _read_values(node):
+    '''Get the raw, stored links of a shape through the Maya API.
+
+    Args:
+        node (:class:`maya.api.OpenMaya.MObject`): The shape to read.
+
+    Returns:
+        tuple[int, list[str], :class:`maya.api.OpenMaya.MIntArray` or NoneType]:
+            The number of components of the shape, the direction of each
+            column and every (component, column, target) link, flattened.
+            If the shape has no links, its directions and links are empty.
+
+    '''
+    count = _get_component_count(node)
+    node = om.MFnDependencyNode(node)
+
+    if not node.hasAttribute(ATTRIBUTE_NAME) or not node.hasAttribute(DIRECTIONS_ATTRIBUTE_NAME):
+        return (count, [], None)
+
+    directions = json.loads(node.findPlug(DIRECTIONS_ATTRIBUTE_NAME, False).asString())
+    values = om.MFnIntArrayData(node.findPlug(ATTRIBUTE_NAME, False).asMObject()).array()
+
+    return (count, directions, values)
+
+
+def read(shape):
+    '''Get the component links of a shape.
+
+    Args:
+        shape (str): The full path of the shape.
+
+    Returns:
+        :class:`pickrunner.components.ComponentLinks`:
+            The shape's links, with a row for each of its components. If it
+            has none, or they can't be read, the returned table is empty.
+            It's shared by every caller so copy it before changing it.
+
+    '''
+    entry = _SHAPES.get(shape)
+
+    if entry is not None and _is_current(shape, entry):
+        return entry[2]
+
+    selection = om.MSelectionList()
+
+    try:
+        selection.add(shape)
+        node = selection.getDependNode(0)
+    except RuntimeError:
+        # The shape doesn't exist (anymore)
+        return components.ComponentLinks(count=0)
+
+    _watch(node)
+
+    try:
+        count, directions, values = _read_values(node)
+    except (RuntimeError, TypeError, ValueError):
+        _LOGGER.warning('Shape "%s" has unreadable component links.', shape)
+        count, directions, values = (0, [], None)
+
+    links = components.ComponentLinks(count=count)
+
+    if values is not None:
+        try:
+            links = components.ComponentLinks.from_values(directions, values, count=count)
+        except (TypeError, ValueError):
+            _LOGGER.warning('Shape "%s" has malformed component links.', shape)
+
+        if count and len(links) > count:
+            # The shape lost components since its links were written
+            links.resize(count)
+
+    _SHAPES.set(shape, (om.MObjectHandle(node), count, links))
+
+    return links
+
+
+def _write(shape, links):
+    '''Store the component links of a shape, creating its attributes if needed.'''
+    directions, values = links.to_values()
+
+    for attribute, data_type in (
+            (ATTRIBUTE_NAME, 'Int32Array'),
+            (DIRECTIONS_ATTRIBUTE_NAME, 'string')):
+        if not cmds.attributeQuery(attribute, node=shape, exists=True):
+            cmds.addAttr(shape, longName=attribute, dataType=data_type)
+
+    cmds.setAttr(shape + '.' + ATTRIBUTE_NAME, values.tolist(), type='Int32Array')
+    cmds.setAttr(shape + '.' + DIRECTIONS_ATTRIBUTE_NAME, json.dumps(directions), type='string')
+
+
+def assign_links(links):
+    '''Create many component links, as a single undo step.
+
+    Each shape is read and written once, no matter how many of its links
+    changed. Links between the components of different shapes (or different
+    kinds of components) aren't supported and are skipped.
+
+    Args:
+        links (iterable[tuple[str, str, str]]):
+            Every (component, direction, target component) link to create.
+            Components are named the way that Maya selects them, e.g.
+            "pSphere1.vtx[12]". A target of "" removes the link.
+
+    Returns:
+        int: The number of links that were created or removed.
+
+    '''
+    links_by_shape = collections.OrderedDict()
+    shapes = dict()
+    count = 0
+
+    for source, direction, target in links:
+        parsed_source = parse_component(source, shapes)
+
+        if parsed_source is None:
+            _LOGGER.warning('"%s" is not a CV or vertex.', source)
+            continue
+
+        shape, kind, index = parsed_source
+        target_index = None
+
+        if target:
+            parsed_target = parse_component(target, shapes)
+
+            if parsed_target is None or parsed_target[:2] != (shape, kind):
+                _LOGGER.warning('"%s" and "%s" must be on the same shape.', source, target)
+                continue
+
+            target_index = parsed_target[2]
+
+        links_by_shape.setdefault(shape, []).append((index, direction, target_index))
+        count += 1
+
+    if not links_by_shape:
+        return 0
+
+    with scene_index.undo_chunk():
+        for shape, shape_links in links_by_shape.items():
+            # Change a copy, so the cached table still matches the scene if writing fails
+            table = read(shape).copy()
+            entry = _SHAPES.peek(shape)
+            table.set_links(shape_links)
+            _write(shape, table)
+
+            if entry is not None:
+                # Writing forgot the old table. The new one matches the scene
+                _SHAPES.set(shape, entry[:2] + (table,))
+
+    return count
+
+
+def find_link(name, direction):
+    '''Find the component that a CV / vertex moves to, in some direction.
+
+    Args:
+        name (str): The component to move from. e.g. "pSphere1.vtx[12]".
+        direction (str): The direction to move in.
+
+    Returns:
+        tuple[bool, str or NoneType]:
+            If `name` is a supported component and, if it is, the component
+            to move to (or None if there's no link).
+
+    '''
+    parsed = parse_component(name)
+
+    if parsed is None:
+        return (False, None)
+
+    shape, kind, index = parsed
+    target = read(shape).get_link(index, direction)
+
+    if target is None:
+        return (True, None)
+
+    return (True, get_component_name(shape, kind, target))
+
+
+def clear():
+    '''Forget every component table that was read.'''
+    _SHAPES.clear()
+
+
+def _reset(*_):
+    '''Forget every component table and stop watching every shape.'''
+    clear()
+
+    while _WATCHED:
+        _, (_, callback) = _WATCHED.popitem()
+
+        try:
+            om.MMessage.removeCallback(callback)
+        except RuntimeError:
+            # The shape was deleted and its callback was removed with it
+            pass
+
+
+def install():
+    '''Forget component tables whenever they may no longer match the scene.
+
+    Calling this function more than once does nothing.
+
+    '''
+    if _CALLBACKS:
+        return
+
+    def _clear(*_):
+        '''Forget every component table. Undo may have reverted a write.'''
+        clear()
+
+    for message in (om.MSceneMessage.kAfterOpen, om.MSceneMessage.kAfterNew):
+        _CALLBACKS.append(om.MSceneMessage.addCallback(message, _reset))
+
+    for event in ('Undo', 'Redo'):
+        _CALLBACKS.append(om.MEventMessage.addEventCallback(event, _clear))
+
+
+def uninstall():
+    '''Remove every callback that :func:`install` added.'''
+    while _CALLBACKS:
+        om.MMessage.removeCallback(_CALLBACKS.pop())
+
+    _reset()
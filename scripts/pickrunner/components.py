@@ -0,0 +1,259 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+'''Pickrunner links between the components (CVs, vertices) of one shape.
+
+A mesh can have hundreds of thousands of vertices so, unlike links between
+nodes, component links aren't stored as JSON. In memory,
+:class:`ComponentLinks` keeps them in one packed array of integers, with one
+row per component and one column per direction that's actually used. Each
+cell is the index of the component to move to or :obj:`NO_LINK`. Looking up
+a link is a single array read.
+
+Most components of a shape have no links at all so they're stored sparsely,
+as flat (component, column, target) triples: :meth:`ComponentLinks.to_values`
+only grows with the number of links, never with the size of the shape. The
+direction of each column is stored next to the triples, by name, so adding
+or re-ordering directions in :obj:`pickrunner.directions.REGISTRY` never
+breaks links that were stored before.
+
+Nothing in this module knows about any DCC.
+
+'''
+
+# IMPORT STANDARD LIBRARIES
+import array
+
+
+NO_LINK = -1
+# A signed, 32-bit integer on every platform that Maya supports
+TYPE_CODE = 'i'
+# The number of values that each stored link takes: component, column, target
+VALUES_PER_LINK = 3
+
+
+class ComponentLinks(object):
+
+    '''Every link between the components of one shape, as a packed array.'''
+
+    def __init__(self, count=0, directions=None, table=None):
+        '''Create links for some number of components.
+
+        Args:
+            count (:obj:`int`, optional): The number of components.
+            directions (:obj:`list[str]`, optional):
+                The direction of each column. Columns for other directions are
+                added as links are set in them. Default: No columns.
+            table (:obj:`array.array`, optional):
+                Existing links, `count` rows of `directions` columns.
+                Default: Every component has no links.
+
+        Raises:
+            ValueError: If `table` doesn't have a cell for every component and direction.
+
+        '''
+        super(ComponentLinks, self).__init__()
+
+        self.directions = list(directions or [])
+        self._columns = dict((name, index) for index, name in enumerate(self.directions))
+        self.count = count
+
+        if table is None:
+            table = array.array(TYPE_CODE, [NO_LINK]) * (count * len(self.directions))
+        elif len(table) != count * len(self.directions):
+            raise ValueError(
+                'Expected {expected} links but got {actual}.'.format(
+                    expected=count * len(self.directions), actual=len(table)))
+
+        self.table = table
+
+    @classmethod
+    def from_values(cls, directions, values, count=0):
+        '''Create links from the directions and sparse values of :meth:`to_values`.
+
+        Args:
+            directions (list[str]): The direction of each column.
+            values (iterable[int]): Every (component, column, target) link, flattened.
+            count (:obj:`int`, optional):
+                The number of components. The table grows past it if a
+                link needs more. Default: Just enough to fit every link.
+
+        Raises:
+            ValueError: If the values aren't whole links or a link has no column.
+
+        Returns:
+            :class:`ComponentLinks`: The links.
+
+        '''
+        values = array.array(TYPE_CODE, values)
+
+        if len(values) % VALUES_PER_LINK:
+            raise ValueError(
+                '{count} values can\'t be split into links of {size}.'.format(
+                    count=len(values), size=VALUES_PER_LINK))
+
+        links = cls(count=count, directions=directions)
+
+        for index in range(0, len(values), VALUES_PER_LINK):
+            component, column, target = values[index:index + VALUES_PER_LINK]
+
+            if not 0 <= column < len(links.directions):
+                raise ValueError('Link "{index}" has no column "{column}".'.format(
+                    index=index // VALUES_PER_LINK, column=column))
+
+            links.set_link(component, links.directions[column], target)
+
+        return links
+
+    def to_values(self):
+        '''Get every link, the way that it's stored on a shape.
+
+        Directions that have no links are left out.
+
+        Returns:
+            tuple[list[str], :obj:`array.array`]:
+                The direction of each column and every (component, column,
+                target) link, flattened.
+
+        '''
+        stride = len(self.directions)
+        columns = dict()
+        directions = []
+        values = array.array(TYPE_CODE)
+
+        for index, target in enumerate(self.table):
+            if target == NO_LINK:
+                continue
+
+            component, column = divmod(index, stride)
+
+            try:
+                used_column = columns[column]
+            except KeyError:
+                used_column = len(directions)
+                columns[column] = used_column
+                directions.append(self.directions[column])
+
+            values.extend((component, used_column, target))
+
+        return (directions, values)
+
+    def copy(self):
+        ''':class:`ComponentLinks`: A copy of these links, which can be changed independently.'''
+        return self.__class__(
+            count=self.count, directions=self.directions, table=array.array(TYPE_CODE, self.table))
+
+    def _add_direction(self, direction):
+        '''int: Add a column for a new direction and get its index.'''
+        stride = len(self.directions)
+        table = array.array(TYPE_CODE, [NO_LINK]) * (self.count * (stride + 1))
+
+        for component in range(self.count):
+            start = component * (stride + 1)
+            table[start:start + stride] = self.table[component * stride:(component + 1) * stride]
+
+        self.table = table
+        self.directions.append(direction)
+        self._columns[direction] = stride
+
+        return stride
+
+    def resize(self, count):
+        '''Change the number of components, keeping the links of those that remain.
+
+        Links that point to a removed component are removed, too.
+
+        '''
+        stride = len(self.directions)
+
+        if count > self.count:
+            self.table.extend(array.array(TYPE_CODE, [NO_LINK]) * ((count - self.count) * stride))
+        elif count < self.count:
+            del self.table[count * stride:]
+
+            for index, target in enumerate(self.table):
+                if target >= count:
+                    self.table[index] = NO_LINK
+
+        self.count = count
+
+    def get_link(self, component, direction):
+        '''Find the component that some component moves to.
+
+        Args:
+            component (int): The index of the component to move from.
+            direction (str): The direction to move in.
+
+        Returns:
+            int or NoneType: The index of the component to move to, if there's a link.
+
+        '''
+        column = self._columns.get(direction)
+
+        if column is None or not 0 <= component < self.count:
+            return None
+
+        target = self.table[component * len(self.directions) + column]
+
+        if target == NO_LINK:
+            return None
+
+        return target
+
+    def get_links(self, component):
+        '''dict[str, int]: Every direction of a component and the component it moves to.'''
+        if not 0 <= component < self.count:
+            return dict()
+
+        stride = len(self.directions)
+        row = self.table[component * stride:(component + 1) * stride]
+
+        return dict(
+            (direction, target) for direction, target in zip(self.directions, row)
+            if target != NO_LINK
+        )
+
+    def set_link(self, component, direction, target):
+        '''Make one component move to another, for some direction.
+
+        The table grows to fit `component` and `target`, if needed.
+
+        Args:
+            component (int): The index of the component to move from.
+            direction (str): The direction to move in.
+            target (int or NoneType):
+                The index of the component to move to. None or
+                :obj:`NO_LINK` removes the link.
+
+        Raises:
+            ValueError: If a component index is negative.
+
+        '''
+        if target is None:
+            target = NO_LINK
+
+        if component < 0 or target < NO_LINK:
+            raise ValueError(
+                'Components must be positive, not "{component}" / "{target}".'.format(
+                    component=component, target=target))
+
+        count = max(component, target) + 1
+
+        if count > self.count:
+            self.resize(count)
+
+        column = self._columns.get(direction)
+
+        if column is None:
+            column = self._add_direction(direction)
+
+        self.table[component * len(self.directions) + column] = target
+
+    def set_links(self, links):
+        '''Add many (component, direction, target) links.'''
+        for component, direction, target in links:
+            self.set_link(component, direction, target)
+
+    def __len__(self):
+        '''int: The number of components.'''
+        return self.count
@@ -0,0 +1,505 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+'''Check that a :class:`pickrunner.gui.BehaviorControl` behaves like Pickrunner expects.
+
+The GUI and the navigation hotkeys only talk to a controller through
+:class:`pickrunner.gui.BehaviorControl`. :func:`check` runs the same checks on
+any controller, so a new backend can be verified without a person clicking
+through the GUI:
+
+- objects survive a round trip through their identifiers
+- new objects have no links
+- an assignment is stored on the object and shows up in the graph
+- re-assigning a direction replaces the old link, in both directions of the graph
+- a motion selects the linked object and a missing link selects nothing new
+- a batch of links is written by :meth:`pickrunner.gui.BehaviorControl.assign_links`
+- through :class:`pickrunner.gui.AssignmentManagerWidget`, Auto-Pair links
+  both ways, "Chain" links a whole selection, mirroring copies links onto the
+  other side and buffered edits only reach the controller when committed
+- each operation stays within its time budget
+
+:mod:`pickrunner.memory` is the reference implementation. Check it from a
+shell, with the "scripts" folder on the PYTHONPATH and Qt.py installed:
+
+.. code-block :: bash
+
+    QT_QPA_PLATFORM=offscreen python -m pickrunner.conformance --objects 10000
+
+The GUI checks need a Qt application, which Maya already has. In Maya, pass
+the Maya controller and a function that makes a node:
+
+Example:
+    >>> from pickrunner import conformance, mayarunner
+    >>> import pymel.core as pm
+    >>> conformance.check(
+    ...     mayarunner.MayaBehaviorControl(),
+    ...     lambda name: pm.createNode('transform', name=name),
+    ...     count=1000,
+    ... )
+
+'''
+
+# IMPORT STANDARD LIBRARIES
+import argparse
+import collections
+import json
+import sys
+import time
+
+# IMPORT THIRD-PARTY LIBRARIES
+from Qt import QtCore
+
+# IMPORT LOCAL LIBRARIES
+from . import directions
+from . import gui
+from . import session
+
+
+# The most seconds that each operation may take, on average
+BUDGETS = {
+    'get_identifier': 0.001,
+    'get_object': 0.001,
+    'get_settings': 0.001,
+    'assign': 0.005,
+    'assign_links': 0.5,
+    'get_graph': 1.0,
+    'do_motion': 0.005,
+    'select': 0.005,
+    'gui_assign': 0.01,
+    'gui_chain': 0.05,
+    'mirror_links': 1.0,
+    'commit_session': 0.05,
+}
+# The sides of the objects that mirroring is checked with. They're unusual so
+# that no other object in the scene is mirrored along with them
+#
+MIRROR_LEFT = 'pickrunnerConformanceLeft_'
+MIRROR_RIGHT = 'pickrunnerConformanceRight_'
+
+
+class ConformanceError(Exception):
+
+    '''An error that is raised when a controller doesn't behave as expected.'''
+
+    pass
+
+
+class _Timer(object):
+
+    '''Run functions and remember how long they took, by name.'''
+
+    def __init__(self):
+        '''Start with no timings.'''
+        super(_Timer, self).__init__()
+        self.timings = collections.defaultdict(list)
+
+    def __call__(self, name, function, *args):
+        '''Run `function` with `args` and remember how long it took, under `name`.'''
+        start = time.time()
+        result = function(*args)
+        self.timings[name].append(time.time() - start)
+
+        return result
+
+    def get_timings(self):
+        '''dict[str, dict[str, float]]: The count, mean and max seconds of each operation.'''
+        return dict(
+            (name, {
+                'count': len(times),
+                'mean': sum(times) / len(times),
+                'max': max(times),
+            })
+            for name, times in self.timings.items()
+        )
+
+
+def _expect(condition, message, **kwargs):
+    '''Raise a :class:`ConformanceError` with a formatted message, if `condition` is False.'''
+    if not condition:
+        raise ConformanceError(message.format(**kwargs))
+
+
+def _check_identifiers(controller, timer, objects):
+    '''Make sure that every object can be found again from its identifier.'''
+    identifiers = []
+
+    for obj in objects:
+        identifier = timer('get_identifier', controller.get_identifier, obj)
+        _expect(identifier, 'Object "{obj!r}" has no identifier.', obj=obj)
+
+        found = timer('get_object', controller.get_object, identifier)
+        _expect(
+            found is not None and controller.get_identifier(found) == identifier,
+            'Identifier "{identifier}" did not find its object.',
+            identifier=identifier,
+        )
+        _expect(
+            controller.get_object_name(obj),
+            'Object "{identifier}" has no name.',
+            identifier=identifier,
+        )
+
+        identifiers.append(identifier)
+
+    _expect(
+        len(set(identifiers)) == len(identifiers),
+        'Different objects share the same identifier.',
+    )
+
+    return identifiers
+
+
+def _check_assign(controller, timer, objects, identifiers, direction, opposite):
+    '''Link neighbouring objects, one at a time, and then re-link one of them.'''
+    for obj in objects:
+        settings = timer('get_settings', controller.get_settings, obj)
+        _expect(
+            settings == dict(),
+            'New object "{name}" already has settings "{settings}".',
+            name=controller.get_object_name(obj),
+            settings=settings,
+        )
+
+    for index in range(len(objects) - 1):
+        timer('assign', controller.assign, objects[index], direction, objects[index + 1])
+
+    for index in range(len(objects) - 1):
+        settings = controller.get_settings(objects[index])
+        _expect(
+            settings.get(direction) == identifiers[index + 1],
+            'Object "{name}" should link "{direction}" to "{target}", not "{settings}".',
+            name=controller.get_object_name(objects[index]),
+            direction=direction,
+            target=identifiers[index + 1],
+            settings=settings,
+        )
+
+    graph = timer('get_graph', controller.get_graph)
+
+    for index in range(len(objects) - 1):
+        _expect(
+            graph.get_link(identifiers[index], direction) == identifiers[index + 1],
+            'The graph is missing "{source}" -> "{direction}" -> "{target}".',
+            source=identifiers[index],
+            direction=direction,
+            target=identifiers[index + 1],
+        )
+
+    # Re-linking the first object must replace its old link, not add to it
+    timer('assign', controller.assign, objects[0], direction, objects[-1])
+    settings = controller.get_settings(objects[0])
+    _expect(
+        settings == {direction: identifiers[-1]},
+        'Re-assigning "{direction}" gave "{settings}".',
+        direction=direction,
+        settings=settings,
+    )
+
+    graph = controller.get_graph()
+    _expect(
+        (identifiers[0], direction) not in graph.get_incoming(identifiers[1]),
+        'The graph still has the replaced link to "{target}".',
+        target=identifiers[1],
+    )
+    _expect(
+        (identifiers[0], direction) in graph.get_incoming(identifiers[-1]),
+        'The graph is missing the re-assigned link to "{target}".',
+        target=identifiers[-1],
+    )
+
+    # Restore the chain, so the motions can walk it
+    controller.assign(objects[0], direction, objects[1])
+
+    _expect(
+        opposite not in controller.get_settings(objects[0]),
+        'Assigning "{direction}" also wrote "{opposite}".',
+        direction=direction,
+        opposite=opposite,
+    )
+
+
+def _check_motion(controller, timer, objects, identifiers, direction):
+    '''Walk the chain of links and make sure that missing links go nowhere.'''
+    timer('select', controller.select, [objects[0]])
+    selection = [controller.get_identifier(obj) for obj in controller.get_selection()]
+    _expect(
+        selection == [identifiers[0]],
+        'Selecting "{identifier}" selected "{selection}".',
+        identifier=identifiers[0],
+        selection=selection,
+    )
+
+    current = objects[0]
+
+    for index in range(1, len(objects)):
+        timer('do_motion', controller.do_motion, direction, current)
+        selection = controller.get_selection()
+        _expect(
+            [controller.get_identifier(obj) for obj in selection] == [identifiers[index]],
+            'Moving "{direction}" from "{source}" did not select "{target}".',
+            direction=direction,
+            source=identifiers[index - 1],
+            target=identifiers[index],
+        )
+        current = selection[0]
+
+    # The last object has no link in `direction` so nothing else may be selected
+    moved = timer('do_motion', controller.do_motion, direction, current)
+    selection = [controller.get_identifier(obj) for obj in controller.get_selection()]
+    _expect(
+        not moved and selection == [identifiers[-1]],
+        'Moving "{direction}" without a link selected "{selection}".',
+        direction=direction,
+        selection=selection,
+    )
+
+
+def _check_assign_links(controller, timer, objects, identifiers, opposite):
+    '''Write every opposite link in one batch.'''
+    links = [
+        (identifiers[index], opposite, identifiers[index - 1])
+        for index in range(1, len(identifiers))
+    ]
+    timer('assign_links', controller.assign_links, links)
+
+    graph = controller.get_graph()
+
+    for source, direction, target in links:
+        _expect(
+            graph.get_link(source, direction) == target,
+            'assign_links did not create "{source}" -> "{direction}" -> "{target}".',
+            source=source,
+            direction=direction,
+            target=target,
+        )
+
+    settings = controller.get_settings(objects[-1])
+    _expect(
+        settings.get(opposite) == identifiers[-2],
+        'assign_links did not store "{opposite}" on "{name}".',
+        opposite=opposite,
+        name=controller.get_object_name(objects[-1]),
+    )
+
+
+def _expect_link(controller, objects, source, direction, target, reason, graph=None):
+    '''Make sure that the controller stores, and indexes, a link between two objects.'''
+    source_id = controller.get_identifier(objects[source])
+    target_id = controller.get_identifier(objects[target])
+
+    if graph is None:
+        graph = controller.get_graph()
+
+    _expect(
+        controller.get_settings(objects[source]).get(direction) == target_id
+        and graph.get_link(source_id, direction) == target_id,
+        '{reason} did not link "{source}" -> "{direction}" -> "{target}".',
+        reason=reason,
+        source=controller.get_object_name(objects[source]),
+        direction=direction,
+        target=controller.get_object_name(objects[target]),
+    )
+
+
+def _check_gui_assign(controller, timer, widget, create_object, direction):
+    '''Assign one link and then a chain with Auto-Pair, like a user would.'''
+    opposite = directions.REGISTRY.get_opposite(direction)
+    objects = [
+        create_object('pickrunner_conformance_pair_{index}'.format(index=index))
+        for index in range(6)
+    ]
+
+    widget.autopair_check_box.setChecked(True)
+
+    try:
+        timer('gui_assign', widget.assign, objects[0], direction, objects[1])
+        _expect_link(controller, objects, 0, direction, 1, 'Auto-Pair')
+
+        if opposite:
+            _expect_link(controller, objects, 1, opposite, 0, 'Auto-Pair')
+
+        widget.chain_check_box.setChecked(True)
+        chain = objects[2:]
+        timer('gui_chain', widget.assign_chain, chain, direction)
+
+        for index in range(len(chain) - 1):
+            _expect_link(controller, chain, index, direction, index + 1, 'Chain')
+
+            if opposite:
+                _expect_link(controller, chain, index + 1, opposite, index, 'Chain with Auto-Pair')
+    finally:
+        widget.autopair_check_box.setChecked(False)
+        widget.chain_check_box.setChecked(False)
+
+
+def _check_gui_mirror(controller, timer, widget, create_object, direction):
+    '''Link two objects on one side of a "rig" and mirror the link onto the other side.'''
+    objects = [
+        create_object('{side}pickrunner_conformance_{name}'.format(side=side, name=name))
+        for side in (MIRROR_LEFT, MIRROR_RIGHT)
+        for name in ('arm', 'hand')
+    ]
+    options = widget.mirror_options_widget
+    options.kind_widget.setCurrentIndex(options.kind_options.index(options.prefix_label))
+    options.left_widget.setText(MIRROR_LEFT)
+    options.right_widget.setText(MIRROR_RIGHT)
+
+    identifiers = [controller.get_identifier(obj) for obj in objects]
+    mirrored = (identifiers[2], directions.REGISTRY.get_mirror(direction), identifiers[3])
+
+    controller.assign(objects[0], direction, objects[1])
+    links = timer('mirror_links', widget.mirror_links)
+
+    _expect(
+        mirrored in links,
+        'Mirroring did not return "{mirrored}", only "{links}".',
+        mirrored=mirrored,
+        links=links,
+    )
+    _expect_link(controller, objects, 2, mirrored[1], 3, 'Mirroring')
+
+
+def _check_gui_session(controller, timer, widget, create_object, direction):
+    '''Buffer a link, make sure only the GUI sees it and then commit and discard edits.'''
+    objects = [
+        create_object('pickrunner_conformance_session_{index}'.format(index=index))
+        for index in range(3)
+    ]
+    identifiers = [controller.get_identifier(obj) for obj in objects]
+
+    session.start()
+
+    try:
+        widget.assign(objects[0], direction, objects[1])
+        _expect(
+            direction not in controller.get_settings(objects[0])
+            and controller.get_graph().get_link(identifiers[0], direction) is None,
+            'A buffered link was written before it was committed.',
+        )
+        _expect(
+            widget.get_settings(objects[0]).get(direction) == identifiers[1]
+            and widget.get_graph().get_link(identifiers[0], direction) == identifiers[1],
+            'The GUI does not show the buffered link.',
+        )
+
+        links = timer('commit_session', widget.commit_session)
+        _expect(
+            links == [(identifiers[0], direction, identifiers[1])],
+            'Committing the session wrote "{links}".',
+            links=links,
+        )
+        _expect_link(controller, objects, 0, direction, 1, 'Committing the session')
+
+        widget.assign(objects[1], direction, objects[2])
+        widget.discard_session()
+        _expect(
+            direction not in controller.get_settings(objects[1])
+            and widget.get_graph().get_link(identifiers[1], direction) is None,
+            'A discarded link was kept.',
+        )
+    finally:
+        session.stop()
+
+
+def check(controller, create_object, count=100, direction='right', opposite='left', budgets=None):
+    '''Run every conformance check on a controller.
+
+    Args:
+        controller (:class:`pickrunner.gui.BehaviorControl`): The controller to check.
+        create_object (callable[str]):
+            A function that makes a new, unlinked object with some name and
+            returns it, as the controller expects its objects.
+        count (:obj:`int`, optional): The number of objects to create. At least 3.
+        direction (:obj:`str`, optional): The direction to link objects in.
+        opposite (:obj:`str`, optional): A different direction, used for batches.
+        budgets (:obj:`dict[str, float]`, optional):
+            The most seconds that each operation may take, on average.
+            Default: :obj:`BUDGETS`.
+
+    Raises:
+        :class:`ConformanceError`:
+            If the controller behaves incorrectly or an edit session is
+            already active, which would buffer every assignment.
+
+    Returns:
+        dict[str, object]: The "timings" and "over_budget" operations.
+
+    '''
+    if count < 3:
+        raise ValueError('count must be at least 3, not "{count}".'.format(count=count))
+
+    _expect(
+        session.get_active() is None,
+        'An edit session is active. Commit or discard it before checking.',
+    )
+
+    if budgets is None:
+        budgets = BUDGETS
+
+    timer = _Timer()
+    objects = [
+        create_object('pickrunner_conformance_{index}'.format(index=index))
+        for index in range(count)
+    ]
+
+    identifiers = _check_identifiers(controller, timer, objects)
+    _check_assign(controller, timer, objects, identifiers, direction, opposite)
+    _check_motion(controller, timer, objects, identifiers, direction)
+    _check_assign_links(controller, timer, objects, identifiers, opposite)
+
+    widget = gui.AssignmentManagerWidget(controller)
+
+    try:
+        for check_gui in (_check_gui_assign, _check_gui_mirror, _check_gui_session):
+            check_gui(controller, timer, widget, create_object, direction)
+    finally:
+        widget.deleteLater()
+        QtCore.QCoreApplication.sendPostedEvents(widget, QtCore.QEvent.DeferredDelete)
+
+    timings = timer.get_timings()
+
+    return {
+        'objects': count,
+        'timings': timings,
+        'over_budget': dict(
+            (name, timing['mean']) for name, timing in timings.items()
+            if timing['mean'] > budgets.get(name, float('inf'))
+        ),
+    }
+
+
+def main(arguments=None):
+    '''Check :class:`pickrunner.memory.MemoryBehaviorControl` and print the result as JSON.
+
+    Returns:
+        int: 0 if everything passed, otherwise 1.
+
+    '''
+    from Qt import QtWidgets
+    from . import memory
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--objects', type=int, default=1000, help='The number of objects.')
+    options = parser.parse_args(arguments)
+
+    # The GUI checks need an application, even offscreen
+    application = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])  # pylint: disable=unused-variable
+    controller = memory.MemoryBehaviorControl()
+
+    try:
+        result = check(controller, controller.create_object, count=options.objects)
+    except ConformanceError as error:
+        print('Failed: {error}'.format(error=error))
+        return 1
+
+    print(json.dumps(result, indent=4, sort_keys=True))
+
+    if result['over_budget']:
+        return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
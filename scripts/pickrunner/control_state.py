@@ -0,0 +1,256 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+'''Know which controls the user can actually see and select.
+
+Rigs hide controls all the time (level-of-detail switches, IK / FK modes,
+display layers) and Pickrunner shouldn't move the selection onto a control
+that isn't visible. Asking Maya about every node and all of its parents, on
+every key press, would be slow. So the answer is cached per node and the
+cache is only cleared when an attribute that affects it is set, when the
+DAG changes, on undo / redo or when the current frame changes. Attributes
+that are driven by a connection (animation, an expression, a set driven
+key, etc) are only re-evaluated on those events, too, so that playback
+runs one tiny callback per frame instead of one per dirtied attribute.
+
+This module only uses maya.cmds and the Maya Python API.
+
+'''
+
+# IMPORT THIRD-PARTY LIBRARIES
+from maya.api import OpenMaya as om
+
+
+# Every attribute of a DAG node that can hide it or make it unselectable.
+# Display layers drive the "override" attributes through "drawOverride"
+#
+NODE_ATTRIBUTES = (
+    'visibility',
+    'lodVisibility',
+    'template',
+    'overrideEnabled',
+    'overrideVisibility',
+    'overrideDisplayType',
+    'drawOverride',
+)
+LAYER_ATTRIBUTES = ('visibility', 'displayType', 'enabled', 'drawInfo')
+WATCHED_ATTRIBUTES = frozenset(NODE_ATTRIBUTES + LAYER_ATTRIBUTES)
+# Template and Reference, respectively. Neither can be selected in the viewport
+UNSELECTABLE_DISPLAY_TYPES = (1, 2)
+
+_STATES = dict()
+_NAVIGABLE = dict()
+_WATCHED = dict()
+_CALLBACKS = []
+
+
+def _get_value(node, name, default=1):
+    '''int: Get the value of an attribute of some node, or `default` if it doesn't exist.'''
+    node = om.MFnDependencyNode(node)
+
+    if not node.hasAttribute(name):
+        return default
+
+    return node.findPlug(name, False).asInt()
+
+
+def _get_display_layer(node):
+    ''':class:`maya.api.OpenMaya.MObject` or NoneType: The display layer of a node.'''
+    plug = om.MFnDependencyNode(node).findPlug('drawOverride', False)
+    source = plug.source()
+
+    if source.isNull:
+        return None
+
+    return source.node()
+
+
+def _on_attribute_changed(_, plug, *__):
+    '''Forget every cached state if an attribute that affects visibility changed.'''
+    if om.MFnAttribute(plug.attribute()).name in WATCHED_ATTRIBUTES:
+        clear()
+
+
+def _watch(node):
+    '''Forget the cache whenever an attribute of `node` is changed.
+
+    Each node is only watched once.
+
+    Args:
+        node (:class:`maya.api.OpenMaya.MObject`): The node to watch.
+
+    '''
+    handle = om.MObjectHandle(node)
+    key = handle.hashCode()
+
+    try:
+        watched_handle, _ = _WATCHED[key]
+    except KeyError:
+        pass
+    else:
+        if watched_handle.isValid():
+            return
+
+    _WATCHED[key] = (
+        handle,
+        om.MNodeMessage.addAttributeChangedCallback(node, _on_attribute_changed),
+    )
+
+
+def _is_shown(node):
+    '''bool: If a node is visible and selectable, ignoring its parents.'''
+    _watch(node)
+
+    if not _get_value(node, 'visibility') or not _get_value(node, 'lodVisibility'):
+        return False
+
+    if _get_value(node, 'template', default=0):
+        return False
+
+    layer = _get_display_layer(node)
+    if layer is not None:
+        # The layer drives the override attributes but changing the layer
+        # doesn't count as changing the node, so watch the layer, too
+        #
+        _watch(layer)
+
+    if not _get_value(node, 'overrideEnabled', default=0):
+        return True
+
+    if not _get_value(node, 'overrideVisibility'):
+        return False
+
+    return _get_value(node, 'overrideDisplayType') not in UNSELECTABLE_DISPLAY_TYPES
+
+
+def _is_path_shown(path):
+    '''bool: If a DAG node and all of its parents are visible and selectable.'''
+    node = path.node()
+    key = om.MObjectHandle(node).hashCode()
+
+    try:
+        return _STATES[key]
+    except KeyError:
+        pass
+
+    state = _is_shown(node)
+
+    if state and path.length() > 1:
+        parent = om.MDagPath(path)
+        parent.pop()
+        state = _is_path_shown(parent)
+
+    _STATES[key] = state
+
+    return state
+
+
+def is_navigable(name):
+    '''Check if Pickrunner is allowed to move the selection onto some node.
+
+    The answer is cached by name, so asking about the same node again
+    doesn't even look up its DAG path or shapes.
+
+    Args:
+        name (str): The name of the node to check.
+
+    Returns:
+        bool:
+            False if the node, any of its parents, every one of its shapes or
+            its display layer is hidden, templated or unselectable.
+            Otherwise, True.
+
+    '''
+    install()
+
+    try:
+        return _NAVIGABLE[name]
+    except KeyError:
+        pass
+
+    state = _is_navigable(name)
+    _NAVIGABLE[name] = state
+
+    return state
+
+
+def _is_navigable(name):
+    '''bool: Check if some node can be navigated to, without using the cache of names.'''
+    selection = om.MSelectionList()
+
+    try:
+        selection.add(name)
+    except RuntimeError:
+        return False
+
+    try:
+        path = selection.getDagPath(0)
+    except TypeError:
+        # Only DAG nodes can be hidden
+        return True
+
+    if not _is_path_shown(path):
+        return False
+
+    count = path.numberOfShapesDirectlyBelow()
+    if not count:
+        return True
+
+    for index in range(count):
+        shape = om.MDagPath(path)
+        shape.extendToShape(index)
+
+        if not om.MFnDagNode(shape).isIntermediateObject and _is_path_shown(shape):
+            return True
+
+    return False
+
+
+def clear(*_):
+    '''Forget every cached state.'''
+    _STATES.clear()
+    _NAVIGABLE.clear()
+
+
+def _reset(*_):
+    '''Forget every cached state and stop watching every node.'''
+    clear()
+
+    for _, callback in _WATCHED.values():
+        try:
+            om.MMessage.removeCallback(callback)
+        except RuntimeError:
+            # The node was deleted and its callback was removed with it
+            pass
+
+    _WATCHED.clear()
+
+
+def install():
+    '''Forget cached states whenever the DAG, the current frame or the scene changes.
+
+    Calling this function more than once does nothing.
+
+    '''
+    if _CALLBACKS:
+        return
+
+    for message in (om.MSceneMessage.kAfterOpen, om.MSceneMessage.kAfterNew):
+        _CALLBACKS.append(om.MSceneMessage.addCallback(message, _reset))
+
+    # Visibility can be animated, so every frame can have different states
+    for event in ('Undo', 'Redo', 'timeChanged'):
+        _CALLBACKS.append(om.MEventMessage.addEventCallback(event, clear))
+
+    _CALLBACKS.append(om.MDagMessage.addParentAddedCallback(clear))
+    _CALLBACKS.append(om.MDagMessage.addParentRemovedCallback(clear))
+    # States are also cached by name, which another node may take over
+    _CALLBACKS.append(om.MNodeMessage.addNameChangedCallback(om.MObject(), clear))
+
+
+def uninstall():
+    '''Remove every callback that :func:`install` added.'''
+    while _CALLBACKS:
+        om.MMessage.removeCallback(_CALLBACKS.pop())
+
+    _reset()
@@ -0,0 +1,208 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+'''Every direction that Pickrunner can link objects in.
+
+Directions used to be hard-coded as the four arrow keys. Now each direction
+is described once, here, along with its opposite, where it points on screen,
+which key runs it and what to do when an object has no link for it. The GUI,
+hotkeys, Auto-Pair, mirroring and the graph view are all generated from
+:obj:`REGISTRY`.
+
+To add a custom direction, register it before Pickrunner's hotkeys and GUI are
+created (e.g. in userSetup.py):
+
+Example:
+    >>> from pickrunner import directions
+    >>> directions.REGISTRY.register(
+    ...     'ik_fk', label='IK / FK', opposite='ik_fk', key='i', modifiers=('alt', ))
+
+Links are still stored by direction name so existing scenes keep working.
+Each direction also gets a stable, small integer index for compact in-memory
+tables. Looking up a direction, by name or by index, is O(1).
+
+'''
+
+# IMPORT STANDARD LIBRARIES
+import collections
+
+
+class Direction(object):
+
+    '''A named direction and everything that Pickrunner needs to know about it.'''
+
+    def __init__(
+            self,
+            name,
+            label='',
+            opposite='',
+            vector=(0, 0),
+            key='',
+            modifiers=(),
+            walk='',
+            mirror=''):
+        '''Describe a direction.
+
+        Args:
+            name (str): The unique name that links are stored under. e.g. "up".
+            label (:obj:`str`, optional):
+                The text to show for this direction. Default: The name, in title-case.
+            opposite (:obj:`str`, optional):
+                The direction that undoes this one. Auto-Pair uses it.
+                "" means that there is no opposite.
+            vector (:obj:`tuple[int, int]`, optional):
+                Where this direction points on-screen as (x, y), where +y is
+                up. (0, 0) means that the direction isn't spatial, like "next".
+            key (:obj:`str`, optional):
+                The key that runs this direction. "" means no hotkey.
+            modifiers (:obj:`tuple[str]`, optional):
+                Any of "ctrl", "alt" and "shift", to hold with `key`.
+            walk (:obj:`str`, optional):
+                The pickWalk direction to use if there's no link. "" means
+                that nothing happens when there's no link.
+            mirror (:obj:`str`, optional):
+                The direction that this one becomes when a link is mirrored
+                to the other side of a rig. Default: This direction.
+
+        '''
+        super(Direction, self).__init__()
+        self.name = name
+        self.label = label or name.replace('_', ' ').title()
+        self.opposite = opposite
+        self.vector = tuple(vector)
+        self.key = key
+        self.modifiers = tuple(modifiers)
+        self.walk = walk
+        self.mirror = mirror or name
+        self.index = -1
+
+    def is_spatial(self):
+        '''bool: If this direction points somewhere on-screen.'''
+        return self.vector != (0, 0)
+
+    def __repr__(self):
+        '''str: Show how to make this direction.'''
+        return '{cls}({name!r})'.format(cls=self.__class__.__name__, name=self.name)
+
+
+class Registry(object):
+
+    '''Every known :class:`Direction`, in the order that they were registered.'''
+
+    def __init__(self):
+        '''Create an empty registry.'''
+        super(Registry, self).__init__()
+        self._directions = collections.OrderedDict()
+        self._indexes = []
+
+    def register(self, name, **kwargs):
+        '''Add a new direction or replace an existing direction.
+
+        If the direction declares an opposite that's already registered and
+        that opposite has no opposite of its own, the two are paired.
+
+        Args:
+            name (str): The name of the direction.
+            **kwargs: Everything else that :class:`Direction` accepts.
+
+        Returns:
+            :class:`Direction`: The registered direction.
+
+        '''
+        direction = Direction(name, **kwargs)
+
+        try:
+            direction.index = self._directions[name].index
+        except KeyError:
+            direction.index = len(self._indexes)
+            self._indexes.append(name)
+
+        self._directions[name] = direction
+
+        opposite = self._directions.get(direction.opposite)
+        if opposite is not None and not opposite.opposite:
+            opposite.opposite = name
+
+        return direction
+
+    def get(self, name):
+        ''':class:`Direction` or NoneType: Find a direction by its name.'''
+        return self._directions.get(name)
+
+    def get_by_index(self, index):
+        ''':class:`Direction` or NoneType: Find a direction by its index.'''
+        if index < 0:
+            return None
+
+        try:
+            return self._directions[self._indexes[index]]
+        except IndexError:
+            return None
+
+    def get_index(self, name):
+        '''int: The index of some direction or -1 if it isn't registered.'''
+        try:
+            return self._directions[name].index
+        except KeyError:
+            return -1
+
+    def get_opposite(self, name):
+        '''str: The direction that undoes `name` or "" if there isn't one.'''
+        try:
+            return self._directions[name].opposite
+        except KeyError:
+            return ''
+
+    def get_mirror(self, name):
+        '''str: The direction that `name` becomes on the other side of a rig.'''
+        try:
+            return self._directions[name].mirror
+        except KeyError:
+            return name
+
+    def get_names(self):
+        '''list[str]: The name of every direction.'''
+        return list(self._directions)
+
+    def get_spatial(self):
+        '''list[:class:`Direction`]: Every direction that points somewhere on-screen.'''
+        return [direction for direction in self if direction.is_spatial()]
+
+    def __contains__(self, name):
+        '''bool: If a direction with this name is registered.'''
+        return name in self._directions
+
+    def __iter__(self):
+        '''Iterate over every :class:`Direction`, in registration order.'''
+        return iter(list(self._directions.values()))
+
+    def __len__(self):
+        '''int: The number of registered directions.'''
+        return len(self._directions)
+
+
+def _register_defaults(registry):
+    '''Add the directions that Pickrunner has out of the box.'''
+    registry.register('up', opposite='down', vector=(0, 1), key='Up', walk='up')
+    registry.register('down', opposite='up', vector=(0, -1), key='Down', walk='down')
+    registry.register(
+        'left', opposite='right', vector=(-1, 0), key='Left', walk='left', mirror='right')
+    registry.register(
+        'right', opposite='left', vector=(1, 0), key='Right', walk='right', mirror='left')
+
+    # Diagonals have no hotkey because arrow keys can't be pressed together
+    registry.register('up_left', opposite='down_right', vector=(-1, 1), mirror='up_right')
+    registry.register('up_right', opposite='down_left', vector=(1, 1), mirror='up_left')
+    registry.register('down_left', opposite='up_right', vector=(-1, -1), mirror='down_right')
+    registry.register('down_right', opposite='up_left', vector=(1, -1), mirror='down_left')
+
+    registry.register('next', opposite='previous', key='Page_Down')
+    registry.register('previous', opposite='next', key='Page_Up')
+    registry.register(
+        'parent_ctrl', opposite='child_ctrl', key='Up', modifiers=('ctrl', 'alt'))
+    registry.register(
+        'child_ctrl', opposite='parent_ctrl', key='Down', modifiers=('ctrl', 'alt'))
+
+
+REGISTRY = Registry()
+_register_defaults(REGISTRY)
@@ -0,0 +1,187 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+'''An in-memory description of every Pickrunner link in a scene.
+
+Pickrunner stores its links on each object, one object at a time. That is
+great for navigation but terrible for any tool that needs to see the whole
+picture, like drawing a graph or finding every link that points to some object.
+
+:class:`LinkGraph` is that whole picture. It knows nothing about any DCC.
+Objects are referred to by a hashable identifier (in Maya, a node UUID).
+
+'''
+
+
+class LinkGraph(object):
+
+    '''A directed graph of object-direction-object links.
+
+    Every link is stored twice, once as an outgoing link of its source and
+    once as an incoming link of its target, so that looking up links in
+    either direction is O(1).
+
+    '''
+
+    def __init__(self):
+        '''Create an empty graph.'''
+        super(LinkGraph, self).__init__()
+        self.names = dict()
+        self._outgoing = dict()
+        self._incoming = dict()
+
+    @classmethod
+    def from_settings(cls, settings):
+        '''Create a graph from the settings of many objects.
+
+        Args:
+            settings (dict[str, dict[str, str]]):
+                Each object identifier and the settings that are stored on it.
+                See :func:`pickrunner.gui.BehaviorControl.get_settings`.
+
+        Returns:
+            :class:`LinkGraph`: The created graph.
+
+        '''
+        graph = cls()
+
+        for source, info in settings.items():
+            graph.add_node(source)
+
+            for direction, target in info.items():
+                graph.set_link(source, direction, target)
+
+        return graph
+
+    def add_node(self, identifier, name=''):
+        '''Add an object to the graph, even if it has no links.
+
+        Args:
+            identifier (str): The object to add.
+            name (:obj:`str`, optional): A display name for the object.
+
+        '''
+        self._outgoing.setdefault(identifier, dict())
+
+        if name:
+            self.names[identifier] = name
+
+    def has_node(self, identifier):
+        '''bool: If the given object has been added to this graph.'''
+        return identifier in self._outgoing or identifier in self._incoming
+
+    def remove_node(self, identifier):
+        '''Remove an object and every link that goes to or from it.
+
+        Args:
+            identifier (str): The object to remove.
+
+        '''
+        for direction in list(self._outgoing.get(identifier, dict())):
+            self.remove_link(identifier, direction)
+
+        for source, direction in list(self._incoming.get(identifier, set())):
+            self.remove_link(source, direction)
+
+        self._outgoing.pop(identifier, None)
+        self._incoming.pop(identifier, None)
+        self.names.pop(identifier, None)
+
+    def set_link(self, source, direction, target):
+        '''Make `source` point to `target`, for some direction.
+
+        If source already pointed somewhere else in that direction, the old
+        link is replaced.
+
+        Args:
+            source (str): The object to move from.
+            direction (str): The direction to move in.
+            target (str): The object to move to.
+
+        '''
+        self.remove_link(source, direction)
+
+        if not target:
+            return
+
+        self._outgoing.setdefault(source, dict())[direction] = target
+        self._outgoing.setdefault(target, dict())
+        self._incoming.setdefault(target, set()).add((source, direction))
+
+    def set_links(self, source, links):
+        '''Replace every outgoing link of `source` with new links.
+
+        Args:
+            source (str): The object to move from.
+            links (dict[str, str]): Each direction and the object to move to.
+
+        '''
+        for direction in list(self._outgoing.get(source, dict())):
+            self.remove_link(source, direction)
+
+        self._outgoing.setdefault(source, dict())
+
+        for direction, target in links.items():
+            self.set_link(source, direction, target)
+
+    def remove_link(self, source, direction):
+        '''Delete the link of `source`, for some direction, if it exists.
+
+        Returns:
+            str or NoneType: The target that source used to point to.
+
+        '''
+        try:
+            target = self._outgoing[source].pop(direction)
+        except KeyError:
+            return None
+
+        try:
+            self._incoming[target].discard((source, direction))
+        except KeyError:
+            pass
+
+        return target
+
+    def get_link(self, source, direction):
+        '''str or NoneType: Get the object that `source` points to, if any.'''
+        try:
+            return self._outgoing[source][direction]
+        except KeyError:
+            return None
+
+    def get_links(self, source):
+        '''dict[str, str]: Every direction and target of `source`.'''
+        return dict(self._outgoing.get(source, dict()))
+
+    def get_incoming(self, target):
+        '''set[tuple[str, str]]: Every (source, direction) that points to `target`.'''
+        return set(self._incoming.get(target, set()))
+
+    def get_name(self, identifier):
+        '''str: The display name of some object, if one was given.'''
+        return self.names.get(identifier, identifier)
+
+    def nodes(self):
+        '''list[str]: Every object in this graph.'''
+        return list(self._outgoing)
+
+    def edges(self):
+        '''Iterate over every link in this graph.
+
+        Yields:
+            tuple[str, str, str]: Each (source, direction, target) link.
+
+        '''
+        for source, info in self._outgoing.items():
+            for direction, target in info.items():
+                yield (source, direction, target)
+
+    def to_settings(self):
+        '''dict[str, dict[str, str]]: Every object that has links, and its links.'''
+        return dict(
+            (source, dict(info)) for source, info in self._outgoing.items() if info)
+
+    def __len__(self):
+        '''int: The number of objects in this graph.'''
+        return len(self._outgoing)
@@ -0,0 +1,591 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+'''A panel that draws every Pickrunner link as a graph of nodes and arrows.
+
+Rigs can have thousands of controls so this module is careful about how
+much it draws. The scene is spatially indexed, items drop their details as
+the user zooms out, and the scene is only rebuilt when explicitly asked to.
+Selection changes and new links only touch the items that they affect.
+
+'''
+
+# IMPORT STANDARD LIBRARIES
+import collections
+import math
+
+# IMPORT THIRD-PARTY LIBRARIES
+from Qt import QtWidgets
+from Qt import QtCore
+from Qt import QtGui
+
+# IMPORT LOCAL LIBRARIES
+from . import directions
+
+NODE_WIDTH = 120.0
+NODE_HEIGHT = 30.0
+GRID_SPACING_X = 180.0
+GRID_SPACING_Y = 80.0
+
+# Below this zoom level, items are drawn as plain shapes without any text
+TEXT_LEVEL_OF_DETAIL = 0.45
+# Below this zoom level, edges are drawn without arrow heads
+ARROW_LEVEL_OF_DETAIL = 0.25
+
+# How a direction without any on-screen vector moves a node on the layout grid
+DEFAULT_OFFSET = (1, 0)
+
+
+def _get_level_of_detail(painter, option):
+    '''float: How zoomed-in the view that is painting an item is.'''
+    try:
+        return option.levelOfDetailFromTransform(painter.worldTransform())
+    except AttributeError:
+        # Qt4 stores the level of detail directly on the option
+        return option.levelOfDetail
+
+
+def get_offset(direction):
+    '''tuple[int, int]: How a direction moves a node on the layout grid, as (column, row).'''
+    direction = directions.REGISTRY.get(direction)
+
+    if direction is None or not direction.is_spatial():
+        return DEFAULT_OFFSET
+
+    x, y = direction.vector
+
+    # Qt's Y axis points down the screen
+    return (x, -y)
+
+
+def get_direction_from_offset(offset):
+    '''str: Get the direction that best matches some 2D drag, in scene space.'''
+    # Measure the drag in grid cells so that diagonal neighbours read as diagonal
+    x = offset.x() / GRID_SPACING_X
+    y = offset.y() / GRID_SPACING_Y
+    length = math.hypot(x, y) or 1.0
+    best = ''
+    best_score = -float('inf')
+
+    for direction in directions.REGISTRY.get_spatial():
+        column, row = get_offset(direction.name)
+        score = (x * column + y * row) / (length * math.hypot(column, row))
+
+        if score > best_score:
+            best = direction.name
+            best_score = score
+
+    return best
+
+
+def get_layout(graph):
+    '''Find a position for every node so that links point the way they say.
+
+    If "A" is linked "left" to "B", "B" gets placed to the left of "A". Each
+    connected group of nodes is laid out with a breadth-first walk and then
+    the groups are stacked on top of each other. This runs in linear time.
+
+    Args:
+        graph (:class:`pickrunner.graph.LinkGraph`): The links to lay out.
+
+    Returns:
+        dict[str, tuple[int, int]]: Each node and its (column, row) position.
+
+    '''
+    positions = dict()
+    row_offset = 0
+
+    for root in sorted(graph.nodes(), key=graph.get_name):
+        if root in positions:
+            continue
+
+        occupied = dict()
+        queue = collections.deque([(root, (0, 0))])
+
+        while queue:
+            node, cell = queue.popleft()
+            if node in positions:
+                continue
+
+            # Step to the right until an empty cell is found
+            column, row = cell
+            radius = 0
+            while (column, row) in occupied:
+                radius += 1
+                column, row = cell[0] + radius, cell[1]
+
+            occupied[(column, row)] = node
+            positions[node] = (column, row)
+
+            neighbours = [
+                (target, get_offset(direction))
+                for direction, target in graph.get_links(node).items()
+            ]
+            neighbours.extend(
+                (source, _get_opposite_offset(direction))
+                for source, direction in graph.get_incoming(node))
+
+            for neighbour, (column_step, row_step) in neighbours:
+                if neighbour not in positions:
+                    queue.append(
+                        (neighbour, (column + column_step, row + row_step)))
+
+        rows = [row for _, row in occupied]
+        top = min(rows)
+        for node in occupied.values():
+            column, row = positions[node]
+            positions[node] = (column, row - top + row_offset)
+
+        row_offset += max(rows) - top + 2
+
+    return positions
+
+
+def _get_opposite_offset(direction):
+    '''tuple[int, int]: Get the grid offset that undoes some direction.'''
+    column, row = get_offset(direction)
+    return (-column, -row)
+
+
+class NodeItem(QtWidgets.QGraphicsItem):
+
+    '''A box that represents one object in the graph.'''
+
+    normal_color = QtGui.QColor(70, 70, 70)
+    highlight_color = QtGui.QColor(65, 130, 130)
+    outline_color = QtGui.QColor(30, 30, 30)
+
+    def __init__(self, identifier, name, parent=None):
+        '''Create the item.
+
+        Args:
+            identifier (str): The object that this item represents.
+            name (str): The text to show on this item.
+            parent (:obj:`<QtWidgets.QGraphicsItem>`, optional):
+                The item that this item will be parented to. Default is None.
+
+        '''
+        super(NodeItem, self).__init__(parent)
+        self.identifier = identifier
+        self.name = name
+        self.edges = set()
+        self.highlighted = False
+
+        self.setCacheMode(QtWidgets.QGraphicsItem.DeviceCoordinateCache)
+        self.setToolTip(name)
+
+    def boundingRect(self):
+        '''<QtCore.QRectF>: The area that this item draws into.'''
+        return QtCore.QRectF(-NODE_WIDTH / 2.0, -NODE_HEIGHT / 2.0, NODE_WIDTH, NODE_HEIGHT)
+
+    def set_highlighted(self, highlighted):
+        '''Draw this item with a different color if it is highlighted.'''
+        if highlighted == self.highlighted:
+            return
+
+        self.highlighted = highlighted
+        self.update()
+
+    def paint(self, painter, option, widget=None):
+        '''Draw the item, with less detail the further the view is zoomed-out.'''
+        rect = self.boundingRect()
+        color = self.highlight_color if self.highlighted else self.normal_color
+        level_of_detail = _get_level_of_detail(painter, option)
+
+        if level_of_detail < ARROW_LEVEL_OF_DETAIL:
+            painter.fillRect(rect, color)
+            return
+
+        painter.setPen(self.outline_color)
+        painter.setBrush(color)
+        painter.drawRect(rect)
+
+        if level_of_detail < TEXT_LEVEL_OF_DETAIL:
+            return
+
+        painter.setPen(QtCore.Qt.white)
+        painter.drawText(
+            rect,
+            QtCore.Qt.AlignCenter,
+            painter.fontMetrics().elidedText(
+                self.name, QtCore.Qt.ElideMiddle, int(rect.width()) - 6),
+        )
+
+
+class EdgeItem(QtWidgets.QGraphicsItem):
+
+    '''An arrow that represents one link, from one node to another.'''
+
+    color = QtGui.QColor(180, 180, 180)
+    arrow_size = 8.0
+
+    def __init__(self, source, direction, target, parent=None):
+        '''Create the item.
+
+        Args:
+            source (:class:`NodeItem`): The node that the link starts from.
+            direction (str): The direction of the link.
+            target (:class:`NodeItem`): The node that the link goes to.
+            parent (:obj:`<QtWidgets.QGraphicsItem>`, optional):
+                The item that this item will be parented to. Default is None.
+
+        '''
+        super(EdgeItem, self).__init__(parent)
+        self.source = source
+        self.direction = direction
+        self.target = target
+        self._line = QtCore.QLineF()
+        self._rect = QtCore.QRectF()
+
+        self.setZValue(-1)
+        self.setToolTip(direction)
+        self.update_position()
+
+    def update_position(self):
+        '''Re-compute the line of this edge from its nodes' positions.'''
+        self.prepareGeometryChange()
+        self._line = QtCore.QLineF(self.source.pos(), self.target.pos())
+
+        margin = self.arrow_size
+        self._rect = QtCore.QRectF(self._line.p1(), self._line.p2()).normalized().adjusted(
+            -margin, -margin, margin, margin)
+
+    def boundingRect(self):
+        '''<QtCore.QRectF>: The area that this item draws into.'''
+        return self._rect
+
+    def paint(self, painter, option, widget=None):
+        '''Draw a line and, if the view is zoomed-in enough, an arrow head.'''
+        painter.setPen(self.color)
+        painter.drawLine(self._line)
+
+        if _get_level_of_detail(painter, option) < ARROW_LEVEL_OF_DETAIL:
+            return
+
+        length = self._line.length()
+        if not length:
+            return
+
+        # Put the arrow head in the middle so that it isn't hidden by a node
+        unit = QtCore.QPointF(
+            (self._line.x2() - self._line.x1()) / length,
+            (self._line.y2() - self._line.y1()) / length,
+        )
+        normal = QtCore.QPointF(-unit.y(), unit.x())
+        tip = self._line.pointAt(0.5) + unit * self.arrow_size
+        base = tip - unit * self.arrow_size * 2
+
+        painter.setBrush(self.color)
+        painter.drawPolygon(QtGui.QPolygonF([
+            tip,
+            base + normal * self.arrow_size * 0.6,
+            base - normal * self.arrow_size * 0.6,
+        ]))
+
+
+class GraphScene(QtWidgets.QGraphicsScene):
+
+    '''A scene that holds one :class:`NodeItem` per object and one arrow per link.'''
+
+    def __init__(self, parent=None):
+        '''Create an empty scene.
+
+        Args:
+            parent (:obj:`<QtCore.QObject>`, optional):
+                Qt-based associated object. Default is None.
+
+        '''
+        super(GraphScene, self).__init__(parent=parent)
+        self.nodes = dict()
+        self.edges = dict()
+        self._highlighted = set()
+
+        # A BSP tree makes finding the items under the cursor / in the
+        # viewport a logarithmic-time lookup instead of a linear one
+        #
+        self.setItemIndexMethod(QtWidgets.QGraphicsScene.BspTreeIndex)
+
+    def set_graph(self, graph):
+        '''Remove every item in the scene and draw the given graph, instead.
+
+        Args:
+            graph (:class:`pickrunner.graph.LinkGraph`): The links to draw.
+
+        '''
+        self.clear()
+        self.nodes.clear()
+        self.edges.clear()
+        self._highlighted.clear()
+
+        # Adding thousands of items is much faster when the index isn't
+        # being rebuilt after every single item
+        #
+        self.setItemIndexMethod(QtWidgets.QGraphicsScene.NoIndex)
+
+        for identifier, (column, row) in get_layout(graph).items():
+            item = self._add_node(identifier, graph.get_name(identifier))
+            item.setPos(column * GRID_SPACING_X, row * GRID_SPACING_Y)
+
+        for source, direction, target in graph.edges():
+            self.set_link(source, direction, target)
+
+        self.setItemIndexMethod(QtWidgets.QGraphicsScene.BspTreeIndex)
+        self.setSceneRect(self.itemsBoundingRect().adjusted(
+            -GRID_SPACING_X, -GRID_SPACING_Y, GRID_SPACING_X, GRID_SPACING_Y))
+
+    def _add_node(self, identifier, name):
+        ''':class:`NodeItem`: Create and add a new node to the scene.'''
+        item = NodeItem(identifier, name)
+        self.addItem(item)
+        self.nodes[identifier] = item
+
+        return item
+
+    def _get_or_add_node(self, identifier, name=''):
+        '''Find the item for some object, making a new item if needed.
+
+        New items are placed just below everything else in the scene.
+
+        '''
+        try:
+            return self.nodes[identifier]
+        except KeyError:
+            pass
+
+        item = self._add_node(identifier, name or identifier)
+        bottom = self.itemsBoundingRect().bottom() if len(self.nodes) > 1 else 0.0
+        item.setPos(0.0, bottom + GRID_SPACING_Y)
+
+        return item
+
+    def set_link(self, source, direction, target, names=None):
+        '''Add or replace one link without touching the rest of the scene.
+
+        Args:
+            source (str): The object to move from.
+            direction (str): The direction to move in.
+            target (str): The object to move to.
+            names (:obj:`dict[str, str]`, optional):
+                Display names for source and target, in case either of them
+                is new to this scene.
+
+        '''
+        names = names or dict()
+        self.remove_link(source, direction)
+
+        source_item = self._get_or_add_node(source, names.get(source, ''))
+        target_item = self._get_or_add_node(target, names.get(target, ''))
+
+        edge = EdgeItem(source_item, direction, target_item)
+        self.addItem(edge)
+        self.edges[(source, direction)] = edge
+        source_item.edges.add(edge)
+        target_item.edges.add(edge)
+
+    def remove_link(self, source, direction):
+        '''Delete the arrow for some link, if it exists.'''
+        edge = self.edges.pop((source, direction), None)
+        if edge is None:
+            return
+
+        edge.source.edges.discard(edge)
+        edge.target.edges.discard(edge)
+        self.removeItem(edge)
+
+    def set_highlighted(self, identifiers):
+        '''Highlight some objects and un-highlight every other object.
+
+        Only the items whose state changed are redrawn.
+
+        Args:
+            identifiers (iterable[str]): The objects to highlight.
+
+        '''
+        identifiers = set(identifier for identifier in identifiers
+                          if identifier in self.nodes)
+
+        for identifier in self._highlighted - identifiers:
+            self.nodes[identifier].set_highlighted(False)
+
+        for identifier in identifiers - self._highlighted:
+            self.nodes[identifier].set_highlighted(True)
+
+        self._highlighted = identifiers
+
+    def get_node_at(self, position):
+        ''':class:`NodeItem` or NoneType: The node at some scene position.'''
+        for item in self.items(position):
+            if isinstance(item, NodeItem):
+                return item
+
+        return None
+
+
+class GraphView(QtWidgets.QGraphicsView):
+
+    '''A view that can zoom, pan, click, and drag links between nodes.
+
+    Left-click a node to select it. Left-drag from one node onto another to
+    link them together, using the direction of the drag. Middle-drag to pan
+    and use the mouse wheel to zoom.
+
+    '''
+
+    node_clicked = QtCore.Signal(str)
+    link_requested = QtCore.Signal(str, str, str)
+
+    zoom_factor = 1.15
+
+    def __init__(self, scene, parent=None):
+        '''Create the view and make it fast to draw.
+
+        Args:
+            scene (:class:`GraphScene`): The scene to show.
+            parent (:obj:`<QtCore.QObject>`, optional):
+                Qt-based associated object. Default is None.
+
+        '''
+        super(GraphView, self).__init__(scene, parent)
+        self._drag_source = None
+        self._drag_line = None
+        self._pan_position = None
+
+        self.setRenderHint(QtGui.QPainter.Antialiasing, False)
+        self.setViewportUpdateMode(QtWidgets.QGraphicsView.SmartViewportUpdate)
+        self.setOptimizationFlags(
+            QtWidgets.QGraphicsView.DontSavePainterState
+            | QtWidgets.QGraphicsView.DontAdjustForAntialiasing)
+        self.setCacheMode(QtWidgets.QGraphicsView.CacheBackground)
+        self.setTransformationAnchor(QtWidgets.QGraphicsView.AnchorUnderMouse)
+        self.setHorizontalScrollBarPolicy(QtCore.Qt.ScrollBarAlwaysOff)
+        self.setVerticalScrollBarPolicy(QtCore.Qt.ScrollBarAlwaysOff)
+
+    def wheelEvent(self, event):
+        '''Zoom in or out, centered on the mouse.'''
+        try:
+            delta = event.angleDelta().y()
+        except AttributeError:
+            delta = event.delta()
+
+        factor = self.zoom_factor if delta > 0 else 1.0 / self.zoom_factor
+        self.scale(factor, factor)
+
+    def mousePressEvent(self, event):
+        '''Start panning or start dragging a link out of a node.'''
+        if event.button() == QtCore.Qt.MiddleButton:
+            self._pan_position = event.pos()
+            self.setCursor(QtCore.Qt.ClosedHandCursor)
+            return
+
+        if event.button() == QtCore.Qt.LeftButton:
+            self._drag_source = self.scene().get_node_at(self.mapToScene(event.pos()))
+
+            if self._drag_source is not None:
+                return
+
+        super(GraphView, self).mousePressEvent(event)
+
+    def mouseMoveEvent(self, event):
+        '''Pan the view or draw the link that is being dragged.'''
+        if self._pan_position is not None:
+            offset = event.pos() - self._pan_position
+            self._pan_position = event.pos()
+            self.translate_view(offset)
+            return
+
+        if self._drag_source is not None:
+            line = QtCore.QLineF(self._drag_source.pos(), self.mapToScene(event.pos()))
+
+            if self._drag_line is None:
+                self._drag_line = self.scene().addLine(line, QtGui.QPen(QtCore.Qt.yellow))
+            else:
+                self._drag_line.setLine(line)
+
+            return
+
+        super(GraphView, self).mouseMoveEvent(event)
+
+    def mouseReleaseEvent(self, event):
+        '''Finish panning, select a node, or request a new link.'''
+        if self._pan_position is not None:
+            self._pan_position = None
+            self.unsetCursor()
+            return
+
+        if self._drag_source is None:
+            super(GraphView, self).mouseReleaseEvent(event)
+            return
+
+        source = self._drag_source
+        self._drag_source = None
+
+        if self._drag_line is not None:
+            self.scene().removeItem(self._drag_line)
+            self._drag_line = None
+
+        position = self.mapToScene(event.pos())
+        target = self.scene().get_node_at(position)
+
+        if target is None:
+            return
+
+        if target is source:
+            self.node_clicked.emit(source.identifier)
+            return
+
+        direction = get_direction_from_offset(target.pos() - source.pos())
+        self.link_requested.emit(source.identifier, direction, target.identifier)
+
+    def translate_view(self, offset):
+        '''Move the view by some amount of pixels.'''
+        center = self.mapToScene(self.viewport().rect().center())
+        scale = self.transform().m11() or 1.0
+        self.centerOn(center - QtCore.QPointF(offset) / scale)
+
+    def fit(self):
+        '''Zoom so that every item is visible.'''
+        self.fitInView(self.scene().itemsBoundingRect(), QtCore.Qt.KeepAspectRatio)
+
+
+class GraphPanel(QtWidgets.QWidget):
+
+    '''A :class:`GraphView` with buttons to rebuild and frame it.'''
+
+    refresh_requested = QtCore.Signal()
+
+    def __init__(self, parent=None):
+        '''Create the panel and its child widgets.
+
+        Args:
+            parent (:obj:`<QtCore.QObject>`, optional):
+                Qt-based associated object. Default is None.
+
+        '''
+        super(GraphPanel, self).__init__(parent=parent)
+        self.setLayout(QtWidgets.QVBoxLayout())
+
+        self.graph_scene = GraphScene(parent=self)
+        self.view = GraphView(self.graph_scene)
+        self.refresh_button = QtWidgets.QPushButton('Refresh')
+        self.fit_button = QtWidgets.QPushButton('Frame All')
+
+        buttons_layout = QtWidgets.QHBoxLayout()
+        buttons_layout.addWidget(self.refresh_button)
+        buttons_layout.addWidget(self.fit_button)
+
+        self.layout().addLayout(buttons_layout)
+        self.layout().addWidget(self.view)
+
+        self.refresh_button.setToolTip('Re-read every Pickrunner link in the scene')
+        self.fit_button.setToolTip('Zoom to show the whole graph')
+        self.view.setToolTip(
+            'Click a node to select it. Drag from one node to another to link them')
+        self.view.setMinimumSize(200, 150)
+
+        self.refresh_button.clicked.connect(self.refresh_requested.emit)
+        self.fit_button.clicked.connect(self.view.fit)
+
+    def set_graph(self, graph):
+        '''Redraw the whole panel using the given graph.'''
+        self.graph_scene.set_graph(graph)
+        self.view.fit()
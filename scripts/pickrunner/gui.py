@@ -14,27 +14,68 @@ import textwrap
 
 # IMPORT THIRD-PARTY LIBRARIES
 from Qt import QtWidgets
+from Qt import QtCompat
+from Qt import QtCore
 
 # IMPORT LOCAL LIBRARIES
 from . import visibility_widget
+from . import directions
+from . import graph_view
+from . import mirror
+from . import graph
+from . import replace
+from . import session
+
+
+def get_chain_links(identifiers, direction, opposite_direction=''):
+    '''Link every object to the object that comes after it.
+
+    Args:
+        identifiers (list[str]): The objects to link, in order.
+        direction (str): The direction that moves forward along the chain.
+        opposite_direction (:obj:`str`, optional):
+            If given, also link every object back to the object before it,
+            using this direction. Default: "".
+
+    Returns:
+        list[tuple[str, str, str]]: Every (source, direction, target) link.
+
+    '''
+    links = []
+
+    for source, target in zip(identifiers, identifiers[1:]):
+        if source == target:
+            continue
+
+        links.append((source, direction, target))
+
+        if opposite_direction:
+            links.append((target, opposite_direction, source))
+
+    return links
 
 
 class DirectionPad(QtWidgets.QWidget):
 
-    '''A widget that shows buttons in a grid for up/down/left/right.
+    '''A widget that shows a button for every registered direction.
 
-    Like the name implies, this widget lays out its default directions like a "+"
-    sign, with "main_widget" in the middle.
+    Directions that point somewhere on-screen are laid out in a 3x3 grid,
+    around "main_widget" in the middle. Every other direction, like "next",
+    is added in rows underneath the grid.
 
     By default this widget doesn't do anything. It's meant to be added to other
     widgets and have functions connected to its buttons.
 
     '''
 
-    def __init__(self, parent=None):
+    columns = 3
+
+    def __init__(self, registry=directions.REGISTRY, parent=None):
         '''Create the default children for this widget.
 
         Args:
+            registry (:obj:`pickrunner.directions.Registry`, optional):
+                The directions to make buttons for.
             parent (:obj:`<QtCore.QObject>`, optional):
                 Qt-based associated object. Default is None.
 
@@ -46,34 +87,154 @@ class DirectionPad(QtWidgets.QWidget):
         self.main_widget = QtWidgets.QPushButton('Load selection')
         self.direction_layout = QtWidgets.QGridLayout()
 
-        left_button = QtWidgets.QPushButton('Left')
-        right_button = QtWidgets.QPushButton('Right')
-        up_button = QtWidgets.QPushButton('Up')
-        down_button = QtWidgets.QPushButton('Down')
-
-        widgets = [
-            ('center', self.main_widget),
-            ('left', left_button),
-            ('right', right_button),
-            ('up', up_button),
-            ('down', down_button),
-        ]
+        self.directions['center'] = self.main_widget
+        self.direction_layout.addWidget(self.main_widget, 1, 1)
 
-        for storage_name, widget in widgets:
-            self.directions[storage_name] = widget
-            widget.setObjectName(storage_name)
+        occupied = set([(1, 1)])
+        others = []
 
-        self.direction_layout.addWidget(up_button, 0, 1)
-        self.direction_layout.addWidget(left_button, 1, 0)
-        self.direction_layout.addWidget(self.main_widget, 1, 1)
-        self.direction_layout.addWidget(right_button, 1, 2)
-        self.direction_layout.addWidget(down_button, 2, 1)
+        for direction in registry:
+            button = QtWidgets.QPushButton(direction.label)
+            button.setObjectName(direction.name)
+            self.directions[direction.name] = button
+
+            x, y = direction.vector
+            cell = (1 - y, 1 + x)
+
+            if direction.is_spatial() and abs(x) <= 1 and abs(y) <= 1 and cell not in occupied:
+                occupied.add(cell)
+                self.direction_layout.addWidget(button, *cell)
+            else:
+                others.append(button)
+
+        for index, button in enumerate(others):
+            row, column = divmod(index, self.columns)
+            self.direction_layout.addWidget(button, 3 + row, column)
 
         self.layout().addLayout(self.direction_layout)
 
         self.main_widget.setObjectName('load_selection_widget')
 
 
+class AssignmentInfoModel(QtCore.QAbstractTableModel):
+
+    '''A table of every direction that's assigned to some objects.
+
+    Each row is one link, (from-object, direction, to-object). Names are only
+    looked up once a view actually asks to draw a row so showing hundreds of
+    links costs about as much as showing the handful that fit on-screen.
+
+    '''
+
+    headers = ('Object', 'Direction', 'Assigned To')
+
+    def __init__(self, controller, parent=None):
+        '''Create the model with no rows.
+
+        Args:
+            controller (BehaviorControl):
+                The environment controller that is used to get object names.
+            parent (:obj:`<QtCore.QObject>`, optional):
+                Qt-based associated object. Default is None.
+
+        '''
+        super(AssignmentInfoModel, self).__init__(parent=parent)
+        self.controller = controller
+        self._rows = []
+        self._names = dict()
+
+    def _get_name(self, obj):
+        '''str: Get the name of an object, using a cached name if possible.'''
+        try:
+            return self._names[obj]
+        except KeyError:
+            pass
+        except TypeError:
+            # The object isn't hashable so it can't be cached
+            return self.controller.get_object_name(obj)
+
+        name = self.controller.get_object_name(obj)
+        self._names[obj] = name
+        return name
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        '''int: The number of links in this model.'''
+        if parent.isValid():
+            return 0
+
+        return len(self._rows)
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        '''int: The number of columns for each link.'''
+        if parent.isValid():
+            return 0
+
+        return len(self.headers)
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        '''str or NoneType: The column labels of this model.'''
+        if role != QtCore.Qt.DisplayRole or orientation != QtCore.Qt.Horizontal:
+            return None
+
+        try:
+            return self.headers[section]
+        except IndexError:
+            return None
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        '''str or NoneType: Get the display text for some row and column.'''
+        if not index.isValid() or role != QtCore.Qt.DisplayRole:
+            return None
+
+        from_object, direction, to_object = self._rows[index.row()]
+        column = index.column()
+
+        if column == 0:
+            return self._get_name(from_object)
+        elif column == 1:
+            return direction
+
+        return self._get_name(to_object)
+
+    def set_rows(self, rows):
+        '''Replace the links in this model with new links.
+
+        Rows that already exist are updated in-place with dataChanged and only
+        the difference in row count is inserted or removed. That way, the view
+        never has to reset itself.
+
+        Args:
+            rows (list[tuple]): Every (from-object, direction, to-object) link.
+
+        '''
+        rows = list(rows)
+        self._names.clear()
+
+        old_count = len(self._rows)
+        new_count = len(rows)
+
+        if new_count < old_count:
+            self.beginRemoveRows(QtCore.QModelIndex(), new_count, old_count - 1)
+            del self._rows[new_count:]
+            self.endRemoveRows()
+        elif new_count > old_count:
+            self.beginInsertRows(QtCore.QModelIndex(), old_count, new_count - 1)
+            self._rows.extend(rows[old_count:])
+            self.endInsertRows()
+
+        changed = [
+            row for row in range(min(old_count, new_count))
+            if self._rows[row] != rows[row]
+        ]
+        self._rows[:] = rows
+
+        if changed:
+            self.dataChanged.emit(
+                self.index(changed[0], 0),
+                self.index(changed[-1], self.columnCount() - 1),
+            )
+
+
 class BehaviorControl(object):
 
     '''An abstract controller that must be implemented in subclasses.
@@ -104,6 +265,38 @@ class BehaviorControl(object):
         '''str: Find the unique-name of the given object.'''
         return ''
 
+    @classmethod
+    @abc.abstractmethod
+    def get_identifier(cls, obj):
+        '''str: Find an ID for the given object that never changes.'''
+        return ''
+
+    @classmethod
+    @abc.abstractmethod
+    def get_object(cls, identifier):
+        '''Find the object that has some ID, if it exists.
+
+        Args:
+            identifier (str): An ID from :func:`BehaviorControl.get_identifier`.
+
+        Returns:
+            The found object or None.
+
+        '''
+        return None
+
+    @classmethod
+    @abc.abstractmethod
+    def get_graph(cls):
+        ''':class:`pickrunner.graph.LinkGraph`: Every link, keyed by object ID.'''
+        return graph.LinkGraph()
+
+    @classmethod
+    @abc.abstractmethod
+    def select(cls, objects):
+        '''Replace the current selection with the given objects.'''
+        pass
+
     @classmethod
     @abc.abstractmethod
     def assign(cls, from_object, direction, to_object, settings=None):
@@ -123,6 +316,29 @@ class BehaviorControl(object):
         '''
         pass
 
+    @classmethod
+    @abc.abstractmethod
+    def assign_links(cls, links):
+        '''Create many links at once.
+
+        Subclasses should override this method to write everything in one
+        batch (and, if the environment has undo, as one undo step).
+
+        Args:
+            links (iterable[tuple[str, str, str]]):
+                Every (source, direction, target) link to create. Each
+                source and target is an ID from :func:`get_identifier`. A
+                target of "" means that the link should be removed, which
+                subclasses must support.
+
+        '''
+        for source, direction, target in links:
+            from_object = cls.get_object(source)
+            to_object = cls.get_object(target)
+
+            if from_object is not None and to_object is not None:
+                cls.assign(from_object, direction, to_object)
+
     @classmethod
     @abc.abstractmethod
     def do_motion(cls, direction, obj):
@@ -140,6 +356,81 @@ class BehaviorControl(object):
         pass
 
 
+class MirrorWidget(QtWidgets.QWidget):
+
+    '''A widget that describes how to find the other side of a symmetric rig.'''
+
+    prefix_label = 'Prefix'
+    suffix_label = 'Suffix'
+    regex_label = 'Regex'
+    kind_options = (prefix_label, suffix_label, regex_label)
+
+    def __init__(self, parent=None):
+        '''Create the default children for this widget.
+
+        Args:
+            parent (:obj:`<QtCore.QObject>`, optional):
+                Qt-based associated object. Default is None.
+
+        '''
+        super(MirrorWidget, self).__init__(parent=parent)
+        self.setLayout(QtWidgets.QGridLayout())
+
+        self.kind_widget = QtWidgets.QComboBox()
+        self.pattern_widget = QtWidgets.QLineEdit()
+        self.left_widget = QtWidgets.QLineEdit('L_')
+        self.right_widget = QtWidgets.QLineEdit('R_')
+        self.overwrite_check_box = QtWidgets.QCheckBox('Overwrite')
+        self.mirror_button = QtWidgets.QPushButton('Mirror Links')
+
+        self.kind_widget.addItems(self.kind_options)
+
+        self.layout().addWidget(self.kind_widget, 0, 0)
+        self.layout().addWidget(self.pattern_widget, 0, 1, 1, 2)
+        self.layout().addWidget(QtWidgets.QLabel('Left:'), 1, 0)
+        self.layout().addWidget(self.left_widget, 1, 1)
+        self.layout().addWidget(self.overwrite_check_box, 1, 2)
+        self.layout().addWidget(QtWidgets.QLabel('Right:'), 2, 0)
+        self.layout().addWidget(self.right_widget, 2, 1)
+        self.layout().addWidget(self.mirror_button, 2, 2)
+
+        self.pattern_widget.setPlaceholderText(r'e.g. _([LR])_')
+        self.pattern_widget.setToolTip(
+            'A regex whose first group captures the side token of a name')
+        self.overwrite_check_box.setToolTip(
+            'If enabled, mirrored links replace links that already exist')
+        self.mirror_button.setToolTip(
+            'Copy every link of one side of the rig onto its other side')
+
+        self.kind_widget.currentIndexChanged.connect(self.update_appearance)
+        self.update_appearance()
+
+    def get_rules(self):
+        '''list[:class:`pickrunner.mirror.MirrorRule`]: The rules that the user wrote.'''
+        left = self.left_widget.text()
+        right = self.right_widget.text()
+        kind = self.kind_widget.currentText()
+
+        if not left or not right:
+            return []
+
+        if kind == self.prefix_label:
+            return [mirror.MirrorRule.from_prefix(left, right)]
+        elif kind == self.suffix_label:
+            return [mirror.MirrorRule.from_suffix(left, right)]
+
+        return [mirror.MirrorRule(self.pattern_widget.text(), left, right)]
+
+    def is_overwrite_enabled(self):
+        '''bool: If mirrored links should replace existing links.'''
+        return self.overwrite_check_box.isChecked()
+
+    def update_appearance(self):
+        '''Only show the regex pattern when it would actually be used.'''
+        self.pattern_widget.setVisible(
+            self.kind_widget.currentText() == self.regex_label)
+
+
 class AssignmentManagerWidget(QtWidgets.QWidget):
 
     '''A Qt widget used to pair objects together.
@@ -177,12 +468,28 @@ class AssignmentManagerWidget(QtWidgets.QWidget):
         self.setLayout(QtWidgets.QVBoxLayout())
 
         self.autopair_check_box = QtWidgets.QCheckBox('Auto-Pair')
+        self.chain_check_box = QtWidgets.QCheckBox('Chain')
+        self.session_check_box = QtWidgets.QCheckBox('Buffer Edits')
+        self.commit_button = QtWidgets.QPushButton('Commit')
+        self.discard_button = QtWidgets.QPushButton('Discard')
         self.mode_button = QtWidgets.QPushButton(self.selection_mode_label)
         self.loaded_object_widget = QtWidgets.QLineEdit()
         self.loaded_object_label = QtWidgets.QLabel('Loaded object:')
 
         self.manager = DirectionPad()
+        self.graph_widget = visibility_widget.ExpandCollapseWidget('Graph')
+        self.graph_panel = graph_view.GraphPanel()
+        self.graph_widget.add_widget(self.graph_panel)
+        self._is_graph_loaded = False
+        self.mirror_widget = visibility_widget.ExpandCollapseWidget('Mirror')
+        self.mirror_options_widget = MirrorWidget()
+        self.mirror_widget.add_widget(self.mirror_options_widget)
+        self.replace_button = QtWidgets.QPushButton('Replace')
         self.assignment_info_widget = visibility_widget.ExpandCollapseWidget('Assignment Info')
+        self.assignment_info_model = AssignmentInfoModel(self.controller, parent=self)
+        self.assignment_info_view = QtWidgets.QTableView()
+        self.assignment_info_view.setModel(self.assignment_info_model)
+        self.assignment_info_widget.add_widget(self.assignment_info_view)
 
         self.layout().addWidget(self.mode_button)
         self.layout().addStretch(1)
@@ -191,16 +498,27 @@ class AssignmentManagerWidget(QtWidgets.QWidget):
         self.load_widget.layout().addWidget(self.loaded_object_label)
         self.load_widget.layout().addWidget(self.loaded_object_widget)
         self.layout().addWidget(self.load_widget)
-        self.layout().addWidget(self.manager)
+        self.session_widget = QtWidgets.QWidget()
+        self.session_widget.setLayout(QtWidgets.QHBoxLayout())
+        self.session_widget.layout().addWidget(self.session_check_box)
+        self.session_widget.layout().addStretch(1)
+        self.session_widget.layout().addWidget(self.commit_button)
+        self.session_widget.layout().addWidget(self.discard_button)
+        self.layout().addWidget(self.session_widget)
+        pad_layout = QtWidgets.QHBoxLayout()
+        pad_layout.addWidget(self.manager)
+        pad_layout.addWidget(self.graph_widget)
+        self.layout().addLayout(pad_layout)
+        self.layout().addWidget(self.mirror_widget)
+        self.layout().addWidget(self.replace_button)
         self.layout().addWidget(self.assignment_info_widget)
 
-        # Put the "Auto-Pair" checkbox widget next to the up-direction button
-        index = self.manager.direction_layout.indexOf(self.manager.directions['up'])
-        if index == -1:
-            raise RuntimeError('No up arrow widget could be found')
-
-        row, column, _, _ = self.manager.direction_layout.getItemPosition(index)
-        self.manager.direction_layout.addWidget(self.autopair_check_box, row, column + 1)
+        # Put the "Chain" and "Auto-Pair" checkboxes above the direction buttons
+        options_layout = QtWidgets.QHBoxLayout()
+        options_layout.addWidget(self.chain_check_box)
+        options_layout.addStretch(1)
+        options_layout.addWidget(self.autopair_check_box)
+        self.manager.layout().insertLayout(0, options_layout)
 
         self.init_default_settings()
         self.init_interactive_settings()
@@ -213,6 +531,7 @@ class AssignmentManagerWidget(QtWidgets.QWidget):
         '''
         self.loaded_object_widget.setReadOnly(True)
         self.autopair_check_box.setChecked(True)
+        self.session_check_box.setChecked(session.get_active() is not None)
         self.update_appearance()
 
         self.setMinimumHeight(270)
@@ -220,6 +539,19 @@ class AssignmentManagerWidget(QtWidgets.QWidget):
         self.autopair_check_box.setToolTip(
             'If disabled, connects are only 1-way. But if enabled, connecting an '
             'objects will be connected 2-ways, by default.')
+        self.chain_check_box.setToolTip(
+            'If enabled, clicking a direction links every selected object to '
+            'the object selected after it, in the order they were selected.')
+        self.session_check_box.setToolTip(
+            'If enabled, new links are kept in memory and used right away but '
+            'are only written to the scene when you click "Commit". '
+            'Disabling this option commits any remaining links.')
+        self.commit_button.setToolTip('Write every buffered link, as one undo step.')
+        self.discard_button.setToolTip('Forget every buffered link.')
+        self.replace_button.setToolTip(
+            'Select an old object and then the object that replaces it (or '
+            'many old / new pairs) and click to move every link to and from '
+            'each old object onto its replacement.')
 
         load_tooltip = 'Select an object and then click load selection to load it'
         self.loaded_object_widget.setToolTip(load_tooltip)
@@ -264,8 +596,22 @@ class AssignmentManagerWidget(QtWidgets.QWidget):
         )
         self.mode_button.setObjectName('mode_button')
         self.manager.setObjectName('manager_widget')
+        self.graph_widget.setObjectName('graph_widget')
+        self.mirror_widget.setObjectName('mirror_widget')
+        self.replace_button.setObjectName('replace_button')
         self.assignment_info_widget.setObjectName('info_widget')
 
+        # Every row is the same height so the view never needs to measure them
+        self.assignment_info_view.verticalHeader().setVisible(False)
+        QtCompat.QHeaderView.setSectionResizeMode(
+            self.assignment_info_view.verticalHeader(), QtWidgets.QHeaderView.Fixed)
+        self.assignment_info_view.horizontalHeader().setStretchLastSection(True)
+        self.assignment_info_view.setEditTriggers(
+            QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.assignment_info_view.setSelectionBehavior(
+            QtWidgets.QAbstractItemView.SelectRows)
+        self.assignment_info_view.setObjectName('info_view')
+
     def init_interactive_settings(self):
         '''Create all of the button load/selection functionality of this GUI.'''
         def load_selection():
@@ -279,6 +625,9 @@ class AssignmentManagerWidget(QtWidgets.QWidget):
 
         self.manager.main_widget.clicked.connect(load_selection)
         self.mode_button.clicked.connect(self.toggle_mode)
+        self.session_check_box.toggled.connect(self._toggle_session)
+        self.commit_button.clicked.connect(self.commit_session)
+        self.discard_button.clicked.connect(self.discard_session)
 
         for widget in self.manager.directions.values():
             if self.is_load_selection_widget(widget):
@@ -286,19 +635,166 @@ class AssignmentManagerWidget(QtWidgets.QWidget):
 
             widget.clicked.connect(self.do_action)
 
-    def _make_info_line_widget(self, label, obj):
-        '''Create a widget that will display the direction and object info.'''
-        container = QtWidgets.QWidget()
-        container.setLayout(QtWidgets.QHBoxLayout())
+        self.graph_widget.toggled.connect(self._load_graph_if_needed)
+        self.graph_panel.refresh_requested.connect(self.refresh_graph)
+        self.graph_panel.view.node_clicked.connect(self._select_identifier)
+        self.graph_panel.view.link_requested.connect(self._assign_identifiers)
+        self.mirror_options_widget.mirror_button.clicked.connect(self.mirror_links)
+        self.replace_button.clicked.connect(self.replace_selection)
+
+    def _load_graph_if_needed(self):
+        '''Build the graph the first time that it is shown, but not before.'''
+        if self._is_graph_loaded or self.graph_widget.expand_widget.isHidden():
+            return
+
+        self.refresh_graph()
+
+    def _select_identifier(self, identifier):
+        '''Select the object that was clicked in the graph.'''
+        obj = self.controller.get_object(identifier)
+
+        if obj is not None:
+            self.controller.select([obj])
+
+    def _assign_identifiers(self, source, direction, target):
+        '''Link two objects that were dragged together in the graph.'''
+        from_object = self.controller.get_object(source)
+        to_object = self.controller.get_object(target)
+
+        if from_object is None or to_object is None:
+            return
+
+        self.assign(from_object, direction, to_object)
+        self.update_appearance()
+
+    def mirror_links(self):
+        '''Copy the links of one side of the rig to its other side.
+
+        Returns:
+            list[tuple[str, str, str]]: Every link that was created.
+
+        '''
+        rules = self.mirror_options_widget.get_rules()
+        if not rules:
+            return []
+
+        links = mirror.get_mirrored_links(
+            self.get_graph(),
+            rules,
+            overwrite=self.mirror_options_widget.is_overwrite_enabled(),
+        )
+        self._assign_links(links)
+
+        if self._is_graph_loaded and links:
+            self.refresh_graph()
+        else:
+            self.update_appearance()
+
+        return links
+
+    def replace_selection(self):
+        '''Replace every other selected object with the object selected after it.
+
+        Every link to and from each old object is moved onto its replacement,
+        in a single undoable step.
+
+        Returns:
+            list[tuple[str, str, str]]: Every link that was written or removed.
+
+        '''
+        identifiers = [self.controller.get_identifier(obj) for obj in self.controller.get_selection()]
+        if len(identifiers) < 2 or len(identifiers) % 2:
+            return []
+
+        try:
+            links = replace.get_replaced_links(
+                self.get_graph(), zip(identifiers[::2], identifiers[1::2]))
+        except ValueError:
+            # e.g. "A" was replaced with "B" and "B" was replaced with "A"
+            return []
+
+        self._assign_links(links)
+
+        if self._is_graph_loaded and links:
+            self.refresh_graph()
+        else:
+            self.update_appearance()
+
+        return links
+
+    def _toggle_session(self, is_enabled):
+        '''Start buffering edits or commit the buffered edits and stop.'''
+        if is_enabled:
+            session.start()
+        else:
+            self.commit_session()
+            session.stop()
+
+        self.update_appearance()
+
+    def commit_session(self):
+        '''Write every buffered link to the scene in one batch.
+
+        Returns:
+            list[tuple[str, str, str]]: Every link that was written.
+
+        '''
+        active = session.get_active()
+        if active is None:
+            return []
+
+        links = active.commit(self.controller)
+        self.update_appearance()
+
+        return links
+
+    def discard_session(self):
+        '''Forget every buffered link and redraw anything that showed them.'''
+        active = session.get_active()
+        if active is None or not active:
+            return
+
+        active.discard()
+
+        if self._is_graph_loaded:
+            self.refresh_graph()
+        else:
+            self.update_appearance()
+
+    def get_settings(self, obj):
+        '''dict[str, str]: The settings of an object, including buffered links.'''
+        settings = self.controller.get_settings(obj)
+        active = session.get_active()
+
+        if active is None:
+            return settings
 
-        obj_widget = QtWidgets.QLineEdit()
-        obj_widget.setText(self.controller.get_object_name(obj))
-        obj_widget.setReadOnly(True)
+        return active.apply(self.controller.get_identifier(obj), settings)
 
-        container.layout().addWidget(QtWidgets.QLabel(label))
-        container.layout().addWidget(obj_widget)
+    def get_graph(self):
+        ''':class:`pickrunner.graph.LinkGraph`: Every link, including buffered links.'''
+        graph_ = self.controller.get_graph()
+        active = session.get_active()
 
-        return container
+        if active is None or not active:
+            return graph_
+
+        return active.apply_to_graph(graph_)
+
+    def _assign_links(self, links):
+        '''Write (source ID, direction, target ID) links or buffer them.'''
+        active = session.get_active()
+
+        if active is None:
+            self.controller.assign_links(links)
+        else:
+            active.set_links(links)
+
+    def refresh_graph(self):
+        '''Re-read every link from the controller and redraw the graph.'''
+        self.graph_panel.set_graph(self.get_graph())
+        self._is_graph_loaded = True
+        self.update_appearance()
 
     def is_load_selection_widget(self, widget):
         '''bool: If the given widget is the "Load Selection" widget.'''
@@ -311,6 +807,10 @@ class AssignmentManagerWidget(QtWidgets.QWidget):
         '''bool: If the user wants to make assignments reflective.'''
         return self.autopair_check_box.isChecked()
 
+    def is_chain_enabled(self):
+        '''bool: If the user wants to link their whole selection, in order.'''
+        return self.chain_check_box.isChecked()
+
     def has_loaded_object(self):
         '''bool: If this widget has an associated object.'''
         return self.loaded_object is not None
@@ -336,15 +836,6 @@ class AssignmentManagerWidget(QtWidgets.QWidget):
         self._current_mode = mode
         self.update_appearance()
 
-    def clear_info_widgets(self):
-        '''Delete all of the info widgets in the GUI.'''
-        expand_layout = self.assignment_info_widget.expand_widget.layout()
-        for index in reversed(range(expand_layout.count())):
-            try:
-                expand_layout.itemAt(index).widget().deleteLater()
-            except AttributeError:
-                pass
-
     def do_action(self):
         '''Do the associated action for the button that called this method.
 
@@ -370,6 +861,14 @@ class AssignmentManagerWidget(QtWidgets.QWidget):
             self.controller.do_motion(direction, selected)
             return
 
+        if self.is_chain_enabled():
+            selection = self.controller.get_selection()
+            if len(selection) > 1:
+                self.assign_chain(selection, direction)
+
+            self.update_appearance()
+            return
+
         # Add the selected object as the "object to jump to" for our loaded
         # object + the given direction
         #
@@ -378,21 +877,93 @@ class AssignmentManagerWidget(QtWidgets.QWidget):
         except IndexError:
             pass
         else:
-            opposite_directions = {
-                'up': 'down',
-                'down': 'up',
-                'left': 'right',
-                'right': 'left',
-            }
-            self.controller.assign(self.loaded_object, direction, driven_object)
-            if self.is_pairing_enabled():
-                self.controller.assign(
-                        driven_object,
-                        opposite_directions[direction],
-                        self.loaded_object)
+            self.assign(self.loaded_object, direction, driven_object)
 
         self.update_appearance()
 
+    def _add_graph_links(self, links, names):
+        '''Draw new links in the graph, if the graph is being shown.
+
+        Args:
+            links (list[tuple[str, str, str]]): The (source, direction, target) links.
+            names (dict[str, str]): The display name of every object in `links`.
+
+        '''
+        if not self._is_graph_loaded:
+            return
+
+        for source, direction, target in links:
+            self.graph_panel.graph_scene.set_link(source, direction, target, names=names)
+
+    def assign(self, from_object, direction, to_object):
+        '''Link two objects together, and back again if Auto-Pair is enabled.
+
+        Both links are written as one undo step.
+
+        Args:
+            from_object: The object to move from.
+            direction (str): The direction to move in.
+            to_object: The object to move to.
+
+        Returns:
+            list[tuple[str, str, str]]: Every link that was created.
+
+        '''
+        source = self.controller.get_identifier(from_object)
+        target = self.controller.get_identifier(to_object)
+        links = [(source, direction, target)]
+
+        if self.is_pairing_enabled():
+            opposite_direction = directions.REGISTRY.get_opposite(direction)
+
+            if opposite_direction:
+                links.append((target, opposite_direction, source))
+
+        if len(links) == 1 and session.get_active() is None:
+            self.controller.assign(from_object, direction, to_object)
+        else:
+            self._assign_links(links)
+
+        if self._is_graph_loaded:
+            names = dict(
+                (self.controller.get_identifier(obj), self.controller.get_object_name(obj))
+                for obj in (from_object, to_object)
+            )
+            self._add_graph_links(links, names)
+
+        return links
+
+    def assign_chain(self, objects, direction):
+        '''Link every object to the next object, in one batch.
+
+        If Auto-Pair is enabled, every object is linked back to the previous
+        object, too.
+
+        Args:
+            objects (list): The objects to link, in order.
+            direction (str): The direction that moves forward along the chain.
+
+        Returns:
+            list[tuple[str, str, str]]: Every link that was created.
+
+        '''
+        identifiers = [self.controller.get_identifier(obj) for obj in objects]
+        opposite_direction = ''
+        if self.is_pairing_enabled():
+            opposite_direction = directions.REGISTRY.get_opposite(direction)
+
+        links = get_chain_links(identifiers, direction, opposite_direction)
+        self._assign_links(links)
+
+        if self._is_graph_loaded:
+            names = dict(
+                (identifier, self.controller.get_object_name(obj))
+                for identifier, obj in zip(identifiers, objects)
+            )
+            self._add_graph_links(links, names)
+
+        return links
+
     def toggle_mode(self):
         '''Change from Selection Mode to Assignment Mode or vice-versa.'''
         index_for_the_new_mode = 1 - self.mode_options.index(self._current_mode)
@@ -418,28 +989,33 @@ class AssignmentManagerWidget(QtWidgets.QWidget):
         self.loaded_object_widget.setText(
             'Click "{label}"'.format(label=self.manager.main_widget.text()))
 
-        # Repopulate the assignment details for the loaded object
-        self.clear_info_widgets()
-
-        reference_object = None
+        reference_objects = []
 
         if self._current_mode == self.assignment_mode_label:
-            reference_object = self.loaded_object
+            reference_objects = [self.loaded_object]
         elif self._current_mode == self.selection_mode_label:
-            try:
-                reference_object = self.controller.get_selection()[-1]
-            except IndexError:
-                pass
+            reference_objects = self.controller.get_selection()
 
-        info = self.controller.get_settings(reference_object)
+        reference_object = None
+        if reference_objects:
+            reference_object = reference_objects[-1]
 
-        for key in sorted(info.keys()):
-            if self.is_load_selection_widget(key):
-                continue
+        # Repopulate the assignment details for the loaded / selected objects
+        rows = []
+        for obj in reference_objects:
+            info = self.get_settings(obj)
+
+            for key in sorted(info.keys()):
+                if self.is_load_selection_widget(key) or not info[key]:
+                    continue
+
+                rows.append((obj, key, info[key]))
+
+        self.assignment_info_model.set_rows(rows)
 
-            assigned_direction_object = info[key]
-            self.assignment_info_widget.add_widget(
-                self._make_info_line_widget(key, assigned_direction_object))
+        if self._is_graph_loaded:
+            self.graph_panel.graph_scene.set_highlighted(
+                self.controller.get_identifier(obj) for obj in reference_objects)
 
         is_assignment_mode = self._current_mode == self.assignment_mode_label
 
@@ -448,7 +1024,17 @@ class AssignmentManagerWidget(QtWidgets.QWidget):
                 self.controller.get_object_name(reference_object))
 
         self.load_widget.setVisible(is_assignment_mode)
+        self.mirror_widget.setVisible(is_assignment_mode)
+        self.replace_button.setVisible(is_assignment_mode)
         self.autopair_check_box.setVisible(is_assignment_mode)
+        self.chain_check_box.setVisible(is_assignment_mode)
+        self.session_widget.setVisible(is_assignment_mode)
+
+        active = session.get_active()
+        pending = len(active) if active is not None else 0
+        self.commit_button.setText('Commit ({count})'.format(count=pending))
+        self.commit_button.setEnabled(bool(pending))
+        self.discard_button.setEnabled(bool(pending))
         self.manager.main_widget.setEnabled(is_assignment_mode)
         self.manager.main_widget.setVisible(is_assignment_mode)
 
@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+'''Remember where the user has navigated so that they can go back again.
+
+:class:`NavigationHistory` works just like the back / forward buttons of a
+web browser. It holds a fixed number of entries so its memory use never grows,
+no matter how long the session is.
+
+'''
+
+# IMPORT STANDARD LIBRARIES
+import collections
+
+DEFAULT_SIZE = 64
+
+
+class NavigationHistory(object):
+
+    '''A bounded list of visited entries with a "current" position.
+
+    Recording a new entry removes every entry that was ahead of the current
+    position, like a web browser. When the history is full, the oldest entry
+    is dropped.
+
+    '''
+
+    def __init__(self, max_size=DEFAULT_SIZE, key=None):
+        '''Create an empty history.
+
+        Args:
+            max_size (:obj:`int`, optional):
+                The most entries to remember. Default: :obj:`DEFAULT_SIZE`.
+            key (:obj:`callable[object] -> object`, optional):
+                A function that makes an entry comparable to other entries.
+                Recording an entry that's equal to the current entry does
+                nothing. Default: Compare entries directly.
+
+        '''
+        super(NavigationHistory, self).__init__()
+        self._entries = collections.deque(maxlen=max_size)
+        self._index = -1
+        self._key = key or (lambda entry: entry)
+
+    def get_current(self):
+        '''object or NoneType: The entry at the current position, if any.'''
+        if self._index < 0:
+            return None
+
+        return self._entries[self._index]
+
+    def record(self, entry):
+        '''Add a new entry after the current position and make it current.
+
+        Args:
+            entry: The entry to add.
+
+        Returns:
+            bool: If the entry was added. Duplicates of the current entry aren't.
+
+        '''
+        current = self.get_current()
+        if current is not None and self._key(current) == self._key(entry):
+            return False
+
+        while len(self._entries) > self._index + 1:
+            self._entries.pop()
+
+        self._entries.append(entry)
+        self._index = len(self._entries) - 1
+
+        return True
+
+    def can_go_back(self):
+        '''bool: If there's an entry before the current position.'''
+        return self._index > 0
+
+    def can_go_forward(self):
+        '''bool: If there's an entry after the current position.'''
+        return self._index < len(self._entries) - 1
+
+    def back(self):
+        '''object or NoneType: Move to the previous entry and return it, if any.'''
+        if not self.can_go_back():
+            return None
+
+        self._index -= 1
+        return self._entries[self._index]
+
+    def forward(self):
+        '''object or NoneType: Move to the next entry and return it, if any.'''
+        if not self.can_go_forward():
+            return None
+
+        self._index += 1
+        return self._entries[self._index]
+
+    def clear(self):
+        '''Forget every entry.'''
+        self._entries.clear()
+        self._index = -1
+
+    def __len__(self):
+        '''int: The number of remembered entries.'''
+        return len(self._entries)
@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+'''A small, size-bounded cache that forgets whatever was used least recently.'''
+
+# IMPORT STANDARD LIBRARIES
+import collections
+
+
+class LRUCache(object):
+
+    '''A dictionary-like cache that holds, at most, some number of items.
+
+    Whenever a new item would make the cache too big, the item that was used
+    the longest time ago is removed. The cache also counts how often lookups
+    found an item (hits) or didn't (misses) so that its size can be tuned.
+
+    '''
+
+    def __init__(self, max_size):
+        '''Create an empty cache.
+
+        Args:
+            max_size (int): The most items that the cache can hold at once.
+
+        Raises:
+            ValueError: If max_size is less than 1.
+
+        '''
+        super(LRUCache, self).__init__()
+
+        if max_size < 1:
+            raise ValueError('Max size: "{size}" must be at least 1.'.format(size=max_size))
+
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._items = collections.OrderedDict()
+
+    def get(self, key, default=None):
+        '''Get an item and mark it as the most recently used item.
+
+        Args:
+            key: The item to get.
+            default (:obj:`object`, optional):
+                The value to return if the item isn't in the cache.
+
+        Returns:
+            The found item or `default`.
+
+        '''
+        try:
+            value = self._items.pop(key)
+        except KeyError:
+            self.misses += 1
+            return default
+
+        self.hits += 1
+        self._items[key] = value
+
+        return value
+
+    def peek(self, key, default=None):
+        '''Get an item without changing how recently it was used or any counters.'''
+        return self._items.get(key, default)
+
+    def set(self, key, value):
+        '''Add or replace an item, removing the least-recently-used item if needed.'''
+        self._items.pop(key, None)
+        self._items[key] = value
+
+        while len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+            self.evictions += 1
+
+    def pop(self, key, default=None):
+        '''Remove an item and return it or `default` if it isn't in the cache.'''
+        return self._items.pop(key, default)
+
+    def keys(self):
+        '''list: Every key in the cache, from least to most recently used.'''
+        return list(self._items)
+
+    def clear(self):
+        '''Remove every item. The counters are kept.'''
+        self._items.clear()
+
+    def reset_stats(self):
+        '''Set every counter back to zero.'''
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_stats(self):
+        '''dict[str, int]: The size of the cache and how well it has performed.'''
+        return {
+            'size': len(self._items),
+            'max_size': self.max_size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
+
+    def __contains__(self, key):
+        '''bool: If the item is in the cache. This doesn't count as a hit / miss.'''
+        return key in self._items
+
+    def __len__(self):
+        '''int: The number of items in the cache.'''
+        return len(self._items)
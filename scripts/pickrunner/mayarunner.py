@@ -17,54 +17,58 @@ Take that, pickWalk!
 '''
 
 # IMPORT STANDARD LIBRARIES
+import functools
 import json
+import logging
+import os
 
 # IMPORT THIRD-PARTY LIBRARIES
 from Qt import QtCore
+from maya.api import OpenMaya as om
 from maya import cmds
+from maya import utils
 import pymel.core as pm
 
 # IMPORT LOCAL LIBRARIES
+from . import component_index
+from . import control_state
+from . import directions
 from . import gui
+from . import history
+from . import merge
 from . import mui
+from . import replace
+from . import scene_index
+from . import service
+from . import session
+from . import stats
+from . import templates
+from . import viewport
 
 WINDOW_TITLE = 'Pickrunner'
+_LOGGER = logging.getLogger(__name__)
+_WINDOW = None
+_TEMPLATES = None
+_TEMPLATE_CALLBACKS = []
+_HISTORY = None
+_SERVICE = None
+_SERVICE_CALLBACKS = []
 
 
 class MayaBehaviorControl(gui.BehaviorControl):
 
     '''A controller that implements Maya-specific functions to Pickrunner.'''
 
-    reserved_attribute_name = '__mayarunner_info'
+    reserved_attribute_name = scene_index.ATTRIBUTE_NAME
 
     def __init__(self):
         '''Initialize the object and do nothing else.'''
         super(MayaBehaviorControl, self).__init__()
 
-    @classmethod
-    def _create_hidden_metadata_attribute(cls, node):
-        '''Get the hidden attribute that we store Pickrunner values onto.
-
-        If the attribute doesn't exist, create it and hide it from the user
-        so they can't mess with it easily.
-
-        Args:
-            node (<pm.general.PyNode>): The node to add the attribute onto.
-
-        '''
-        try:
-            node.attr(cls.reserved_attribute_name)
-        except pm.MayaAttributeError:
-            node.addAttr(cls.reserved_attribute_name, dataType='string')
-
-        attr = node.attr(cls.reserved_attribute_name)
-        pm.setAttr(attr, keyable=False, channelBox=False)
-        attr.setLocked(True)
-
     @staticmethod
     def get_selection():
-        '''list[<pm.general.PyNode>]: The selected objects in the Maya scene.'''
-        return pm.selected()
+        '''list[<pm.general.PyNode>]: The selected objects, in the order they were selected.'''
+        return pm.ls(orderedSelection=True)
 
     @classmethod
     def get_settings(cls, node):
@@ -104,6 +108,37 @@ class MayaBehaviorControl(gui.BehaviorControl):
 
         return obj.nodeName()
 
+    @classmethod
+    def get_identifier(cls, obj):
+        '''str: Get the UUID of the given node.'''
+        return get_uuid(obj)
+
+    @classmethod
+    def get_object(cls, identifier):
+        '''<pm.general.PyNode> or NoneType: Find the node for some UUID.'''
+        try:
+            return pm.ls(identifier)[0]
+        except IndexError:
+            return None
+
+    @classmethod
+    def get_graph(cls):
+        '''Get every Pickrunner link in the scene.
+
+        The links come from the scene's index so, most of the time, this
+        method doesn't need to read anything from the scene at all.
+
+        Returns:
+            :class:`pickrunner.graph.LinkGraph`: Every link, keyed by node UUID.
+
+        '''
+        return scene_index.get_graph()
+
+    @staticmethod
+    def select(objects):
+        '''Replace Maya's selection with the given nodes.'''
+        pm.select(objects)
+
     @classmethod
     def assign(cls, from_object, direction, to_object, settings=None):
         '''Set an object to be remapped to another object, given some direction.
@@ -126,31 +161,119 @@ class MayaBehaviorControl(gui.BehaviorControl):
         if not settings:
             settings = cls.get_settings(from_object)
 
-        settings[direction] = get_uuid(to_object)
+        to_uuid = get_uuid(to_object)
+        settings[direction] = to_uuid
 
-        # Dump settings onto the node
-        cls._create_hidden_metadata_attribute(from_object)
-        attr = from_object.attr(cls.reserved_attribute_name)
-        is_locked = attr.isLocked()
-        attr.setLocked(False)
-        attr.set(json.dumps(settings))
-        attr.setLocked(is_locked)
+        # Dump settings onto the node. If it already has these settings,
+        # nothing is written and the scene isn't modified
+        #
+        if not scene_index.write_settings(
+                cls.reserved_attribute_name, {from_object.name(): settings}):
+            return
+
+        scene_index.update_links([(get_uuid(from_object), direction, to_uuid)])
+
+    @classmethod
+    def assign_links(cls, links):
+        '''Create many links at once, as a single undo step.
+
+        Every node is read and written exactly once, no matter how many of
+        its links were changed.
+
+        Args:
+            links (iterable[tuple[str, str, str]]):
+                Every (source UUID, direction, target UUID) link to create.
+                A target of "" removes the link.
+
+        '''
+        links = list(links)
+        settings_by_node = dict()
+
+        for source, direction, target in links:
+            try:
+                settings = settings_by_node[source]
+            except KeyError:
+                settings = scene_index.read_settings(cls.reserved_attribute_name, source)
+                settings_by_node[source] = settings
+
+            if target:
+                settings[direction] = target
+            else:
+                settings.pop(direction, None)
+
+        if scene_index.write_settings(cls.reserved_attribute_name, settings_by_node):
+            scene_index.update_links(links)
+
+    @classmethod
+    def _find_target(cls, direction, obj):
+        '''str or NoneType: Get the name of the node that obj links to, if any.'''
+        active = session.get_active()
+
+        if active is not None:
+            # Links that are buffered in an edit session win over the scene
+            is_buffered, target = active.get_link(get_uuid(obj), direction)
+
+            if is_buffered:
+                return target
+
+        # Referenced nodes share their links with every other instance of
+        # the same asset. It's cheaper to look them up by relative name,
+        # which also avoids jumping into a different instance of the asset
+        #
+        is_templated, name = get_template_cache().get_link(
+            cls.get_object_name(obj), direction)
+
+        if is_templated:
+            return name
+
+        # Links that leave the namespace (and nodes without a template) are
+        # looked up by UUID, instead
+        #
+        is_indexed, node_to_select = scene_index.find_link(
+            cls.get_object_name(obj), get_uuid(obj), direction)
+
+        if not is_indexed:
+            # The index is still being built so read the node directly
+            node_to_select = cls.get_settings(obj).get(direction)
+
+        return node_to_select
 
     @classmethod
     def do_motion(cls, direction, obj):
         '''Change selection to an associated node of obj, given some direction.
 
+        Nodes that are hidden or can't be selected in the viewport are
+        skipped, by continuing to move in the same direction.
+
         Args:
             direction (str): The direction to move to.
             obj (<pm.general.PyNode>): The object to get the associated object from.
 
         '''
-        uuid_of_the_node_to_select = cls.get_settings(obj).get(direction)
+        visited = set()
+        node = obj
 
-        try:
-            node = pm.ls(uuid_of_the_node_to_select)[0]
-        except IndexError:
-            return
+        while True:
+            node_to_select = cls._find_target(direction, node)
+
+            if not node_to_select:
+                return None
+
+            try:
+                node = pm.ls(node_to_select)[0]
+            except IndexError:
+                return None
+
+            name = node.longName()
+
+            if control_state.is_navigable(name):
+                break
+
+            if name in visited:
+                # Every node in this direction is hidden
+                return None
+
+            visited.add(name)
 
         pm.select(node)
 
@@ -173,15 +296,27 @@ class PickrunnerMayaWindow(gui.AssignmentManagerWidget):
             controller=MayaBehaviorControl(),
             parent=parent)
 
-        # Whenever the user changes selection, try to update the GUI
+        # Whenever the user changes selection, try to update the GUI.
+        # The jobs live as long as this window does. While the window is
+        # hidden they're suspended instead of killed so that re-showing the
+        # window doesn't have to recreate them.
+        #
         self.jobs = []
+        self.jobs_suspended = False
 
         selection_job_id = pm.scriptJob(
-            event=['SelectionChanged', self.update_appearance])
+            event=['SelectionChanged', self._on_maya_event])
         new_scene_job_id = pm.scriptJob(
-            event=['deleteAll', self.update_appearance])
+            event=['deleteAll', self._on_maya_event])
         self.jobs.append(selection_job_id)
         self.jobs.append(new_scene_job_id)
+        self.destroyed.connect(functools.partial(kill_jobs, list(self.jobs)))
+
+        # Chains need to know the order that the user selected objects in.
+        # That's a user preference, so it's only changed while it's needed
+        #
+        self._selection_order_preference = None
+        self.chain_check_box.toggled.connect(self._track_selection_order)
 
         selection = self.controller.get_selection()
         if selection:
@@ -193,12 +328,98 @@ class PickrunnerMayaWindow(gui.AssignmentManagerWidget):
         self.toggle_mode()  # Place into "Assignment Mode" by default
         self.resize(320, 100)
 
-    def closeEvent(self, event):
-        '''When the window is closed, stop trying to update the GUI.'''
-        for job_id in self.jobs:
-            pm.scriptJob(kill=job_id)
+    def _on_maya_event(self):
+        '''Update the GUI from a scriptJob, unless the jobs are suspended.'''
+        if self.jobs_suspended:
+            return
+
+        self.update_appearance()
+
+    def refresh(self):
+        '''Sync the GUI with the scene after it was hidden for a while.
+
+        Anything could have happened to the scene while this window was hidden,
+        including the loaded object being deleted. So check for that and then
+        redraw everything.
+
+        '''
+        try:
+            exists = self.loaded_object.exists()
+        except AttributeError:
+            exists = True
+
+        if not exists:
+            self.loaded_object = None
+
+        self.update_appearance()
+
+    def _track_selection_order(self, is_enabled):
+        '''Make Maya track the order of the selection or restore the user's preference.
+
+        Args:
+            is_enabled (bool):
+                If True, enable "Track selection order" and remember what the
+                user had. If False, put back what the user had.
+
+        '''
+        if is_enabled and self._selection_order_preference is None:
+            self._selection_order_preference = cmds.selectPref(
+                query=True, trackSelectionOrder=True)
+            cmds.selectPref(trackSelectionOrder=True)
+        elif not is_enabled and self._selection_order_preference is not None:
+            cmds.selectPref(trackSelectionOrder=self._selection_order_preference)
+            self._selection_order_preference = None
+
+    def showEvent(self, event):
+        '''Resume the scriptJobs and refresh the GUI when it is shown.'''
+        self.jobs_suspended = False
+        self._track_selection_order(self.is_chain_enabled())
+        self.refresh()
+        super(PickrunnerMayaWindow, self).showEvent(event)
+
+    def hideEvent(self, event):
+        '''Suspend the scriptJobs and restore the user's preferences while nobody can see the GUI.'''
+        self.jobs_suspended = True
+        self._track_selection_order(False)
+        super(PickrunnerMayaWindow, self).hideEvent(event)
+
+
+def kill_jobs(jobs):
+    '''Kill every scriptJob in the given list, if it still exists.
+
+    Args:
+        jobs (list[int]): The scriptJob IDs to kill.
+
+    '''
+    for job_id in jobs:
+        if cmds.scriptJob(exists=job_id):
+            cmds.scriptJob(kill=job_id, force=True)
+
 
-        super(PickrunnerMayaWindow, self).closeEvent(event)
+def get_window():
+    '''Get the Pickrunner GUI, creating it only if it doesn't exist yet.
+
+    Returns:
+        :class:`PickrunnerMayaWindow`: The one and only Pickrunner window.
+
+    '''
+    global _WINDOW  # pylint: disable=global-statement
+
+    if _WINDOW is not None:
+        try:
+            _WINDOW.objectName()
+        except RuntimeError:
+            # The window's C++ object was deleted out from under us
+            _WINDOW = None
+
+    if _WINDOW is None:
+        scene_index.install()
+        _WINDOW = PickrunnerMayaWindow(mui.get_main_window())
+        _WINDOW.setWindowFlags(QtCore.Qt.Window)
+        _WINDOW.setWindowTitle(WINDOW_TITLE)
+        _WINDOW.setObjectName(WINDOW_TITLE)
+
+    return _WINDOW
 
 
 def get_uuid(node):
@@ -214,32 +435,448 @@ def get_uuid(node):
         return ''
 
 
+def _normalize_path(path):
+    '''str: Make a file path comparable to other file paths.'''
+    return os.path.normcase(os.path.normpath(path))
+
+
+def get_reference_asset(node):
+    '''str: Get the file that a node is referenced from or "" if it's not referenced.'''
+    try:
+        if not cmds.referenceQuery(node, isNodeReferenced=True):
+            return ''
+
+        path = cmds.referenceQuery(node, filename=True, withoutCopyNumber=True)
+    except RuntimeError:
+        return ''
+
+    return _normalize_path(path)
+
+
+def get_template_cache():
+    '''Get the cache of every referenced asset's links.
+
+    The first time that this function is called, callbacks are added so that
+    assets are forgotten whenever their reference is unloaded and everything
+    is forgotten whenever a new scene is opened.
+
+    Returns:
+        :class:`pickrunner.templates.TemplateCache`: The cache.
+
+    '''
+    global _TEMPLATES  # pylint: disable=global-statement
+
+    if _TEMPLATES is not None:
+        return _TEMPLATES
+
+    _TEMPLATES = templates.TemplateCache(
+        get_reference_asset,
+        scene_index.get_relative_links,
+        scene_index.get_namespace_signature,
+    )
+
+    def _evict_reference(file_object, *_):
+        '''Forget the asset of a reference that was just unloaded / reloaded.'''
+        _TEMPLATES.evict_asset(_normalize_path(file_object.resolvedFullName()))
+
+    def _clear(*_):
+        '''Forget every asset.'''
+        _TEMPLATES.clear()
+
+    for message in (
+            om.MSceneMessage.kAfterUnloadReference,
+            om.MSceneMessage.kAfterRemoveReference,
+            om.MSceneMessage.kAfterLoadReference,
+    ):
+        _TEMPLATE_CALLBACKS.append(
+            om.MSceneMessage.addReferenceCallback(message, _evict_reference))
+
+    for message in (om.MSceneMessage.kAfterOpen, om.MSceneMessage.kAfterNew):
+        _TEMPLATE_CALLBACKS.append(om.MSceneMessage.addCallback(message, _clear))
+
+    return _TEMPLATES
+
+
+def export_graph(path):
+    '''Save every Pickrunner link in the scene so that it can be merged later.
+
+    Args:
+        path (str): The JSON file to write.
+
+    '''
+    merge.write_graph(path, scene_index.get_graph())
+
+
+def merge_graph(base_path, their_path, prefer=None):
+    '''Combine someone else's Pickrunner links with the links in this scene.
+
+    Both files must come from :func:`export_graph`. Every changed node is
+    written at once, as a single undo step. Nodes that only exist in their
+    scene can't be written to, so their links are skipped and logged as
+    unresolved.
+
+    Args:
+        base_path (str): The links of the scene that both versions started from.
+        their_path (str): The links of the other version of the scene.
+        prefer (:obj:`str`, optional):
+            How to resolve conflicts. See :func:`pickrunner.merge.merge_graphs`.
+
+    Returns:
+        list[:class:`pickrunner.merge.Conflict`]: Every link that both versions changed.
+
+    '''
+    ours = scene_index.get_graph()
+    merged, conflicts = merge.merge_graphs(
+        merge.read_graph(base_path), ours, merge.read_graph(their_path), prefer=prefer)
+
+    for conflict in conflicts:
+        _LOGGER.warning(
+            'Conflict on "%s" %s: base "%s", ours "%s", theirs "%s".',
+            ours.get_name(conflict.source),
+            conflict.direction,
+            conflict.base,
+            conflict.ours,
+            conflict.theirs,
+        )
+
+    changes = merge.diff_graphs(ours, merged)
+    missing = set(source for source, _ in changes if not cmds.ls(source))
+
+    for source in sorted(missing):
+        # Their scene had a node that this one doesn't. There's nothing to write to
+        _LOGGER.warning('Unresolved node "%s": it is not in this scene, so its links '
+                        'were skipped.', merged.get_name(source))
+
+    changes = dict(
+        (key, change) for key, change in changes.items() if key[0] not in missing)
+    links = [(source, direction, target) for (source, direction), (_, target) in changes.items()]
+
+    scene_index.write_settings(
+        MayaBehaviorControl.reserved_attribute_name,
+        merge.get_changed_settings(merged, changes),
+    )
+    scene_index.update_links(links)
+
+    return conflicts
+
+
+def replace_nodes(replacements):
+    '''Move every Pickrunner link to and from some nodes onto new nodes.
+
+    Use this after rebuilding controls. Every link is written at once, as a
+    single undo step.
+
+    Args:
+        replacements (dict or iterable[tuple]):
+            Each old node and the node that replaces it, as node names,
+            PyNodes or UUIDs. The old nodes may already be deleted, as long
+            as they're given by UUID.
+
+    Raises:
+        ValueError: If the replacements loop back on themselves.
+
+    Returns:
+        list[tuple[str, str, str]]: Every (source, direction, target) link that
+        was written. A target of "" means that the link was removed.
+
+    '''
+    if isinstance(replacements, dict):
+        replacements = replacements.items()
+
+    def _get_identifier(node):
+        # Deleted nodes have no UUID to look up, so they must be given as one
+        return get_uuid(node) or node
+
+    links = replace.get_replaced_links(
+        scene_index.get_graph(),
+        [(_get_identifier(old), _get_identifier(new)) for old, new in replacements],
+    )
+    MayaBehaviorControl.assign_links(links)
+
+    return links
+
+
+def get_report():
+    '''dict[str, object]: Describe how complete this scene's Pickrunner setup is.'''
+    return stats.get_report(scene_index.get_graph(), scene=scene_index.get_scene_path())
+
+
+def export_report(path):
+    '''Save :func:`get_report` as a JSON file.'''
+    stats.write_report(path, get_report())
+
+
+def get_selection_handles():
+    '''Get the current selection, in a form that survives renames and reparenting.
+
+    Returns:
+        tuple[:class:`maya.api.OpenMaya.MObjectHandle`]: Every selected node.
+
+    '''
+    selection = om.MGlobal.getActiveSelectionList()
+
+    return tuple(
+        om.MObjectHandle(selection.getDependNode(index))
+        for index in range(selection.length())
+    )
+
+
+def _get_history_key(handles):
+    '''tuple[int]: Make a selection from :func:`get_selection_handles` comparable.'''
+    return tuple(handle.hashCode() for handle in handles)
+
+
+def get_history():
+    ''':class:`pickrunner.history.NavigationHistory`: Every recent Pickrunner selection.'''
+    global _HISTORY  # pylint: disable=global-statement
+
+    if _HISTORY is None:
+        _HISTORY = history.NavigationHistory(key=_get_history_key)
+
+    return _HISTORY
+
+
+def _restore_selection(handles):
+    '''Select every node in `handles` that still exists, all at once.
+
+    Returns:
+        bool: If anything was selected. Deleted nodes are skipped.
+
+    '''
+    selection = om.MSelectionList()
+
+    for handle in handles:
+        if handle.isValid():
+            selection.add(handle.object())
+
+    if selection.isEmpty():
+        return False
+
+    om.MGlobal.setActiveSelectionList(selection)
+
+    return True
+
+
+def _step_history(step):
+    '''Restore the next entry of the history that still has existing nodes.
+
+    Args:
+        step (callable[] -> tuple or NoneType):
+            The history method that moves to the next entry.
+
+    '''
+    entry = step()
+
+    while entry is not None:
+        if _restore_selection(entry):
+            return
+
+        entry = step()
+
+
+def go_back():
+    '''Re-select whatever was selected before the last Pickrunner motion.'''
+    # If the user selected something by hand since, come back to it with go_forward
+    navigation = get_history()
+    navigation.record(get_selection_handles())
+    _step_history(navigation.back)
+
+
+def go_forward():
+    '''Undo the last :func:`go_back`.'''
+    _step_history(get_history().forward)
+
+
+def _get_walk_direction(direction):
+    '''str: The pickWalk direction to use for a Pickrunner direction, if any.'''
+    try:
+        return directions.REGISTRY.get(direction).walk
+    except AttributeError:
+        return ''
+
+
+def _fall_back(direction, node):
+    '''Move the selection without Pickrunner's links.
+
+    If the viewport fallback is enabled, the nearest control on-screen is
+    selected. Otherwise (or if there is no such control), pickWalk is used,
+    if the direction has a pickWalk equivalent.
+
+    Args:
+        direction (str): The direction to move in.
+        node (:class:`pymel.core.nodetypes.DependNode`): The node to move from.
+
+    '''
+    if viewport.is_enabled():
+        target = viewport.find_nearest(node.name(), direction)
+
+        if target:
+            pm.select(target)
+            return
+
+    walk = _get_walk_direction(direction)
+
+    if walk:
+        # Pickrun failed for some reason so lets pickWalk, instead
+        pm.pickWalk(direction=walk)
+
+
+def _do_component_motion(direction):
+    '''Move a selected CV / vertex along its component links, if it has any.
+
+    Args:
+        direction (str): The direction to move in.
+
+    Returns:
+        bool: If the last selected item was a CV / vertex and so it was handled.
+
+    '''
+    selection = cmds.ls(orderedSelection=True) or cmds.ls(selection=True)
+
+    if not selection or '[' not in selection[-1]:
+        return False
+
+    is_component, target = component_index.find_link(selection[-1], direction)
+
+    if not is_component:
+        return False
+
+    if target and cmds.objExists(target):
+        cmds.select(target)
+        stats.record_motion(direction)
+
+        return True
+
+    walk = _get_walk_direction(direction)
+
+    if walk:
+        cmds.pickWalk(direction=walk)
+
+    stats.record_motion(direction, fell_back=True)
+
+    return True
+
+
+def assign_component_chain(direction, opposite_direction='', selection=None):
+    '''Link every CV / vertex to the one selected after it.
+
+    Maya only remembers the order that components were selected in if
+    "Track selection order" is enabled in its preferences.
+
+    Args:
+        direction (str): The direction that moves forward along the chain.
+        opposite_direction (:obj:`str`, optional):
+            If given, also link every component back to the one before it.
+        selection (:obj:`list[str]`, optional):
+            The components to link, in order. Default: The selected components.
+
+    Returns:
+        int: The number of links that were created.
+
+    '''
+    if selection is None:
+        selection = cmds.ls(orderedSelection=True, flatten=True) or []
+
+    return component_index.assign_links(
+        gui.get_chain_links(selection, direction, opposite_direction))
+
+
 def do_pickrun_motion(direction):
     '''Try to pickrun in a given direction. Otherwise, pickWalk.
 
     Args:
         direction (str):
-            The direction to walk. Options are: ("up", "down", "left", "right").
+            The direction to walk. Any name in :obj:`pickrunner.directions.REGISTRY`.
 
     '''
+    if _do_component_motion(direction):
+        return
+
     try:
         node = pm.selected()[-1]
     except IndexError:
-        pm.pickWalk(direction=direction)
+        stats.record_motion(direction, fell_back=True)
+        walk = _get_walk_direction(direction)
+
+        if walk:
+            pm.pickWalk(direction=walk)
+
         return
 
+    navigation = get_history()
+    navigation.record(get_selection_handles())
+
     new_node = MayaBehaviorControl.do_motion(direction, node)
     if not new_node:
-        # Pickrun failed for some reason so lets pickWalk, instead
-        pm.pickWalk(direction=direction)
+        _fall_back(direction, node)
+
+    stats.record_motion(direction, fell_back=not new_node)
+    navigation.record(get_selection_handles())
+
+
+def start_service(address=None):
+    '''Let other local tools read Pickrunner links and move the selection.
+
+    Requests are answered in Maya's main thread, one batch at a time.
+    See :mod:`pickrunner.service`.
+
+    Args:
+        address (:obj:`str`, optional):
+            A Unix socket path or "host:port" to listen on.
+            Default: :func:`pickrunner.service.get_default_address`.
+
+    Raises:
+        :class:`pickrunner.service.ServiceError`:
+            If another process, like another Maya, already listens on the address.
+
+    Returns:
+        :class:`pickrunner.service.Service`: The running service.
+
+    '''
+    global _SERVICE  # pylint: disable=global-statement
+
+    if _SERVICE is not None:
+        return _SERVICE
+
+    handler = service.Handler(
+        MayaBehaviorControl(),
+        run=utils.executeInMainThreadWithResult,
+        motion=do_pickrun_motion,
+    )
+    running = service.Service(handler, address=address)
+    running.start()
+    _SERVICE = running
+    _LOGGER.info('Pickrunner is listening on "%s".', _SERVICE.address)
+
+    _SERVICE_CALLBACKS.append(
+        om.MSceneMessage.addCallback(om.MSceneMessage.kMayaExiting, lambda *_: stop_service()))
+
+    return _SERVICE
+
+
+def stop_service():
+    '''Stop the service from :func:`start_service`, if it's running.'''
+    global _SERVICE  # pylint: disable=global-statement
+
+    while _SERVICE_CALLBACKS:
+        om.MMessage.removeCallback(_SERVICE_CALLBACKS.pop())
+
+    if _SERVICE is None:
+        return
+
+    _SERVICE.stop()
+    _SERVICE = None
 
 
-@mui.delete_ui_if_exists(WINDOW_TITLE)
 def show():
-    '''Create and show the Pickrunner GUI for Maya.'''
-    window = PickrunnerMayaWindow(mui.get_main_window())
-    window.setWindowFlags(QtCore.Qt.Window)
-    window.setWindowTitle(WINDOW_TITLE)
-    window.setObjectName(WINDOW_TITLE)
+    '''Show the Pickrunner GUI for Maya.
+
+    The window is only built once. Every call after that re-shows and refreshes
+    the existing window, which is much faster than rebuilding it.
+
+    '''
+    window = get_window()
     window.manager.main_widget.setFocus()
     window.show()
+    window.raise_()
+    window.activateWindow()
@@ -0,0 +1,219 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+'''A :class:`pickrunner.gui.BehaviorControl` that works without any DCC.
+
+:class:`MemoryBehaviorControl` stores its links on the nodes of a
+:class:`pickrunner.standin.Scene`, exactly like
+:class:`pickrunner.mayarunner.MayaBehaviorControl` stores them on Maya nodes:
+as JSON, keyed by direction, pointing to the UUID of each target. Objects are
+simply node UUIDs.
+
+It's the reference implementation that :mod:`pickrunner.conformance` checks
+other controllers against. And because it only needs Qt, it can run the
+Pickrunner GUI offscreen, for example on a Linux CI machine:
+
+Example:
+    >>> # QT_QPA_PLATFORM=offscreen
+    >>> from Qt import QtWidgets
+    >>> from pickrunner import gui, memory
+    >>> application = QtWidgets.QApplication([])
+    >>> controller = memory.MemoryBehaviorControl()
+    >>> widget = gui.AssignmentManagerWidget(controller)
+
+'''
+
+# IMPORT STANDARD LIBRARIES
+import json
+
+# IMPORT LOCAL LIBRARIES
+from . import graph as graph_
+from . import gui
+from . import session
+from . import standin
+
+
+class MemoryBehaviorControl(gui.BehaviorControl):
+
+    '''A controller for an in-memory scene.
+
+    Unlike :class:`pickrunner.mayarunner.MayaBehaviorControl`, every method is
+    an instance method because each controller has its own scene and selection.
+
+    '''
+
+    reserved_attribute_name = standin.ATTRIBUTE_NAME
+
+    def __init__(self, scene=None):
+        '''Create a controller for some scene.
+
+        Args:
+            scene (:obj:`pickrunner.standin.Scene`, optional):
+                The scene to read and write. Default: A new, empty scene.
+
+        '''
+        super(MemoryBehaviorControl, self).__init__()
+        self.scene = scene or standin.Scene()
+        self.selection = []
+        self._graph = None
+        self._changed = set()
+        self._is_writing = False
+        self.scene.add_callback(self._on_attribute_changed)
+
+    def _on_attribute_changed(self, uuid, attribute):
+        '''Remember nodes whose links were changed by anything but this controller, e.g. undo.'''
+        if attribute == self.reserved_attribute_name and not self._is_writing:
+            self._changed.add(uuid)
+
+    def create_object(self, name):
+        '''str: Add a new node to the scene and get its UUID.'''
+        uuid = self.scene.create_node(name)
+
+        if self._graph is not None:
+            # Mirroring finds nodes by the names in the index
+            self._graph.add_node(uuid, name)
+
+        return uuid
+
+    def get_selection(self):
+        '''list[str]: The UUID of every selected node that still exists.'''
+        return [obj for obj in self.selection if self.scene.exists(obj)]
+
+    def get_settings(self, obj):
+        '''dict[str, str]: The links that are stored on a node.'''
+        return standin.read_settings(self.scene, obj)
+
+    def get_object_name(self, obj):
+        '''str: The name of a node or, if it doesn't exist, the given object.'''
+        return self.scene.get_name(obj) or obj
+
+    def get_identifier(self, obj):
+        '''str: Nodes are their own UUID.'''
+        return obj
+
+    def get_object(self, identifier):
+        '''str or NoneType: The node with some UUID, if it exists.'''
+        if self.scene.exists(identifier):
+            return identifier
+
+        return None
+
+    def get_graph(self):
+        ''':class:`pickrunner.graph.LinkGraph`: Every link, built once and then kept up-to-date.'''
+        if self._graph is None:
+            self._changed.clear()
+            self._graph = graph_.LinkGraph.from_settings(dict(
+                (uuid, self.get_settings(uuid))
+                for uuid in self.scene.get_nodes(self.reserved_attribute_name)
+            ))
+
+            for uuid in self.scene.get_nodes():
+                self._graph.add_node(uuid, self.scene.get_name(uuid))
+
+        while self._changed:
+            # Only the nodes that actually changed are read again
+            uuid = self._changed.pop()
+            self._graph.set_links(uuid, self.get_settings(uuid))
+
+        return self._graph
+
+    def select(self, objects):
+        '''Replace the selection with every given node that exists.'''
+        self.selection = [obj for obj in objects if self.scene.exists(obj)]
+
+    def _write(self, settings_by_node):
+        '''Store settings onto many nodes as one undo step and update the index.'''
+        self._is_writing = True
+
+        try:
+            with self.scene.undo_chunk():
+                for uuid, settings in settings_by_node.items():
+                    self.scene.set_attribute(
+                        uuid, self.reserved_attribute_name, json.dumps(settings, sort_keys=True))
+        finally:
+            self._is_writing = False
+
+        if self._graph is not None:
+            for uuid, settings in settings_by_node.items():
+                self._graph.set_links(uuid, settings)
+
+    def assign(self, from_object, direction, to_object, settings=None):
+        '''Link one node to another, for some direction.
+
+        Args:
+            from_object (str): The node to move from.
+            direction (str): The direction to move in.
+            to_object (str): The node to move to.
+            settings (:obj:`dict[str, str]`, optional):
+                The current settings of `from_object`, if they're already known.
+
+        '''
+        if not settings:
+            settings = self.get_settings(from_object)
+
+        settings[direction] = to_object
+        self._write({from_object: settings})
+
+    def assign_links(self, links):
+        '''Create (or, if a target is "", remove) many links as one undo step.
+
+        Each node is read and written once.
+
+        '''
+        settings_by_node = dict()
+
+        for source, direction, target in links:
+            if not self.scene.exists(source):
+                continue
+
+            try:
+                settings = settings_by_node[source]
+            except KeyError:
+                settings = self.get_settings(source)
+                settings_by_node[source] = settings
+
+            if target:
+                settings[direction] = target
+            else:
+                settings.pop(direction, None)
+
+        if settings_by_node:
+            self._write(settings_by_node)
+
+    def do_motion(self, direction, obj):
+        '''Select the node that `obj` links to, in some direction.
+
+        Links in the active :mod:`pickrunner.session` are used first.
+
+        Returns:
+            str or NoneType: The selected node, if there was a link to follow.
+
+        '''
+        active = session.get_active()
+        is_buffered = False
+        target = None
+
+        if active is not None:
+            is_buffered, target = active.get_link(obj, direction)
+
+        if not is_buffered:
+            target = self.get_graph().get_link(obj, direction)
+
+        if not target or not self.scene.exists(target):
+            return None
+
+        self.select([target])
+
+        return target
+
+    def undo(self):
+        '''Undo the last change to the scene.
+
+        The index re-reads only the nodes that the undo changed, the next
+        time that it's used.
+
+        Returns:
+            bool: If there was anything to undo.
+
+        '''
+        return self.scene.undo()
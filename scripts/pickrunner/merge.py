@@ -0,0 +1,198 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+'''Compare and combine the Pickrunner links of different versions of a scene.
+
+Every link is identified by its source object and direction, so two graphs can
+be compared one link at a time. When two people edit copies of the same scene,
+:func:`merge_graphs` combines their edits. It does this the same way that
+version control combines text, using the scene that both copies started from
+("base") to tell which side changed each link.
+
+Like :mod:`pickrunner.graph`, nothing in this module knows about any DCC.
+
+'''
+
+# IMPORT STANDARD LIBRARIES
+import collections
+import json
+
+# IMPORT LOCAL LIBRARIES
+from . import graph as graph_
+
+
+FORMAT_VERSION = 1
+PREFER_OURS = 'ours'
+PREFER_THEIRS = 'theirs'
+
+Conflict = collections.namedtuple('Conflict', 'source direction base ours theirs')
+
+
+def get_edges(graph):
+    '''dict[tuple[str, str], str]: Each (source, direction) of a graph and its target.'''
+    return dict(((source, direction), target) for source, direction, target in graph.edges())
+
+
+def diff_edges(old, new):
+    '''Find every link that is different between two sets of edges.
+
+    Args:
+        old (dict[tuple[str, str], str]): The edges to compare from.
+        new (dict[tuple[str, str], str]): The edges to compare to.
+
+    Returns:
+        dict[tuple[str, str], tuple[str or NoneType, str or NoneType]]:
+            Each (source, direction) that changed and its old / new target.
+            A target is None if the link didn't exist.
+
+    '''
+    changes = dict()
+
+    for key, target in old.items():
+        new_target = new.get(key)
+
+        if new_target != target:
+            changes[key] = (target, new_target)
+
+    for key, target in new.items():
+        if key not in old:
+            changes[key] = (None, target)
+
+    return changes
+
+
+def diff_graphs(old, new):
+    '''Find every link that is different between two graphs.
+
+    Args:
+        old (:class:`pickrunner.graph.LinkGraph`): The graph to compare from.
+        new (:class:`pickrunner.graph.LinkGraph`): The graph to compare to.
+
+    Returns:
+        dict[tuple[str, str], tuple[str or NoneType, str or NoneType]]:
+            Each (source, direction) that changed and its old / new target.
+
+    '''
+    return diff_edges(get_edges(old), get_edges(new))
+
+
+def merge_graphs(base, ours, theirs, prefer=None):
+    '''Combine the changes that two graphs made to the same original graph.
+
+    A link that was only changed in one graph keeps that change. A link that
+    both graphs changed in the same way is fine, too. But a link that both
+    graphs changed differently is a conflict.
+
+    Args:
+        base (:class:`pickrunner.graph.LinkGraph`):
+            The graph that `ours` and `theirs` were both made from.
+        ours (:class:`pickrunner.graph.LinkGraph`): One edited graph.
+        theirs (:class:`pickrunner.graph.LinkGraph`): The other edited graph.
+        prefer (:obj:`str`, optional):
+            How to resolve conflicts. :obj:`PREFER_THEIRS` uses the link in
+            `theirs`. Anything else keeps the link in `ours`.
+
+    Returns:
+        tuple[:class:`pickrunner.graph.LinkGraph`, list[:class:`Conflict`]]:
+            The combined graph and every conflict that was found.
+
+    '''
+    base_edges = get_edges(base)
+    our_changes = diff_edges(base_edges, get_edges(ours))
+    their_changes = diff_edges(base_edges, get_edges(theirs))
+
+    merged = graph_.LinkGraph()
+    for identifier in ours.nodes():
+        merged.add_node(identifier)
+    for source, direction, target in ours.edges():
+        merged.set_link(source, direction, target)
+
+    for identifier in theirs.nodes():
+        merged.add_node(identifier)
+
+    merged.names.update(theirs.names)
+    merged.names.update(ours.names)
+
+    conflicts = []
+
+    for key, (original, their_target) in sorted(
+            their_changes.items(), key=lambda item: item[0]):
+        try:
+            _, our_target = our_changes[key]
+        except KeyError:
+            merged.set_link(key[0], key[1], their_target)
+            continue
+
+        if our_target == their_target:
+            continue
+
+        source, direction = key
+        conflicts.append(Conflict(source, direction, original, our_target, their_target))
+
+        if prefer == PREFER_THEIRS:
+            merged.set_link(source, direction, their_target)
+
+    return (merged, conflicts)
+
+
+def get_changed_settings(graph, changes):
+    '''Get the links that must be written to apply some changes.
+
+    Args:
+        graph (:class:`pickrunner.graph.LinkGraph`): The links that should exist.
+        changes (dict[tuple[str, str], tuple[str or NoneType, str or NoneType]]):
+            The changes that led to `graph`. See :func:`diff_graphs`.
+
+    Returns:
+        dict[str, dict[str, str]]:
+            Each object that changed and every one of its links in `graph`.
+
+    '''
+    sources = set(source for source, _ in changes)
+
+    return dict((source, graph.get_links(source)) for source in sources)
+
+
+def write_graph(path, graph):
+    '''Save a graph to a JSON file so that it can be merged later.
+
+    Args:
+        path (str): The file to write.
+        graph (:class:`pickrunner.graph.LinkGraph`): The links to save.
+
+    '''
+    data = {
+        'version': FORMAT_VERSION,
+        'settings': graph.to_settings(),
+        'names': graph.names,
+    }
+
+    with open(path, 'w') as handler:
+        json.dump(data, handler, indent=4, sort_keys=True)
+
+
+def read_graph(path):
+    '''Load a graph that was saved with :func:`write_graph`.
+
+    Args:
+        path (str): The file to read.
+
+    Raises:
+        ValueError: If the file isn't a graph that Pickrunner saved.
+
+    Returns:
+        :class:`pickrunner.graph.LinkGraph`: The loaded links.
+
+    '''
+    with open(path, 'r') as handler:
+        data = json.load(handler)
+
+    if not isinstance(data, dict) or data.get('version') != FORMAT_VERSION:
+        raise ValueError('Path: "{path}" is not a Pickrunner graph.'.format(path=path))
+
+    graph = graph_.LinkGraph.from_settings(data.get('settings', dict()))
+
+    for identifier, name in data.get('names', dict()).items():
+        graph.add_node(identifier, name)
+
+    return graph
@@ -0,0 +1,201 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+'''Copy the Pickrunner links of one side of a rig onto its other side.
+
+Symmetric rigs name their controls with some side token, like "L_arm_ctrl"
+and "R_arm_ctrl". A :class:`MirrorRule` describes where that token is. Given
+some rules, :func:`get_mirrored_links` finds every link on one side, swaps its
+names and mirrored directions (e.g. "left" / "right"), and returns the links for the other
+side, using a name-to-object dictionary so that each lookup is O(1).
+
+Example:
+    >>> rules = [MirrorRule.from_prefix('L_', 'R_')]
+    >>> links = get_mirrored_links(controller.get_graph(), rules)
+    >>> controller.assign_links(links)
+
+'''
+
+# IMPORT STANDARD LIBRARIES
+import re
+
+# IMPORT LOCAL LIBRARIES
+from . import directions
+
+
+class MirrorRule(object):
+
+    '''A description of where a side token lives in an object's name.
+
+    Every rule is a regex whose first group captures the side token.
+    If the captured token is the rule's "left" token, it gets replaced with its
+    "right" token and vice-versa.
+
+    '''
+
+    def __init__(self, pattern, left, right):
+        '''Create the rule.
+
+        Args:
+            pattern (str):
+                A regex with at least one group. The first group must capture
+                the side token of a name.
+            left (str): The token that marks one side, e.g. "L_".
+            right (str): The token that marks the other side, e.g. "R_".
+
+        Raises:
+            ValueError: If the pattern has no group to capture the token with.
+
+        '''
+        super(MirrorRule, self).__init__()
+        self.pattern = re.compile(pattern)
+        self.left = left
+        self.right = right
+
+        if not self.pattern.groups:
+            raise ValueError('Pattern: "{pattern}" needs a group to capture '
+                             'the side token with.'.format(pattern=pattern))
+
+    @classmethod
+    def from_prefix(cls, left, right):
+        ''':class:`MirrorRule`: Make a rule for tokens at the start of a name.'''
+        return cls('^({left}|{right})'.format(
+            left=re.escape(left), right=re.escape(right)), left, right)
+
+    @classmethod
+    def from_suffix(cls, left, right):
+        ''':class:`MirrorRule`: Make a rule for tokens at the end of a name.'''
+        return cls('({left}|{right})$'.format(
+            left=re.escape(left), right=re.escape(right)), left, right)
+
+    def get_side(self, name):
+        '''str: Get "left", "right", or "" if the name has no side token.'''
+        match = self.pattern.search(name)
+        if not match:
+            return ''
+
+        token = match.group(1)
+        if token == self.left:
+            return 'left'
+        elif token == self.right:
+            return 'right'
+
+        return ''
+
+    def mirror(self, name):
+        '''str or NoneType: Swap the side token of a name, if it has one.'''
+        match = self.pattern.search(name)
+        if not match:
+            return None
+
+        token = match.group(1)
+        if token == self.left:
+            replacement = self.right
+        elif token == self.right:
+            replacement = self.left
+        else:
+            return None
+
+        start, end = match.span(1)
+        return name[:start] + replacement + name[end:]
+
+
+def _split_name(name):
+    '''tuple[str, str]: Split a name into its namespace / path and its short name.'''
+    index = max(name.rfind(':'), name.rfind('|'))
+    return (name[:index + 1], name[index + 1:])
+
+
+def get_mirrored_name(name, rules):
+    '''Find the name of the object on the other side of a rig.
+
+    Namespaces and DAG paths are kept as they are and only the short name is
+    given to the rules. The first rule that matches is used.
+
+    Args:
+        name (str): The name to mirror.
+        rules (iterable[:class:`MirrorRule`]): The rules to try.
+
+    Returns:
+        tuple[str, str]:
+            The mirrored name and the side that the original name was on.
+            If no rule matched, the name is returned as-is with no side.
+
+    '''
+    prefix, short_name = _split_name(name)
+
+    for rule in rules:
+        mirrored = rule.mirror(short_name)
+        if mirrored is not None:
+            return (prefix + mirrored, rule.get_side(short_name))
+
+    return (name, '')
+
+
+def get_mirrored_links(graph, rules, overwrite=False):
+    '''Find the links that would make one side of a rig match the other side.
+
+    Objects that don't match any rule, like a "chest" control, are treated
+    as their own mirror. So "chest" -> left -> "L_arm" mirrors to "chest" ->
+    right -> "R_arm".
+
+    Args:
+        graph (:class:`pickrunner.graph.LinkGraph`):
+            Every link in the scene. Its names are used to match objects.
+        rules (iterable[:class:`MirrorRule`]): The rules to mirror names with.
+        overwrite (:obj:`bool`, optional):
+            If False, mirrored links that would replace an existing link are
+            skipped. If True, they're returned too and, if both sides disagree,
+            links that were mirrored from the "left" side win. Default is False.
+
+    Returns:
+        list[tuple[str, str, str]]: Every (source, direction, target) link to add.
+
+    '''
+    rules = list(rules)
+    index = dict((graph.get_name(identifier), identifier) for identifier in graph.nodes())
+    mirrors = dict()
+
+    def _get_mirror(identifier):
+        '''tuple[str or NoneType, str]: Get the mirrored object and original side.'''
+        try:
+            return mirrors[identifier]
+        except KeyError:
+            pass
+
+        name, side = get_mirrored_name(graph.get_name(identifier), rules)
+        mirrors[identifier] = (index.get(name), side)
+        return mirrors[identifier]
+
+    from_right = dict()
+    from_left = dict()
+
+    for source, direction, target in graph.edges():
+        mirrored_source, source_side = _get_mirror(source)
+        mirrored_target, target_side = _get_mirror(target)
+
+        if not source_side and not target_side:
+            # A center control linked to another center control
+            continue
+
+        if mirrored_source is None or mirrored_target is None:
+            # The other side of the rig is missing this object
+            continue
+
+        key = (mirrored_source, directions.REGISTRY.get_mirror(direction))
+
+        if not overwrite and graph.get_link(*key) is not None:
+            continue
+
+        if 'left' in (source_side, target_side):
+            from_left[key] = mirrored_target
+        else:
+            from_right[key] = mirrored_target
+
+    from_right.update(from_left)
+
+    return [
+        (source, direction, target)
+        for (source, direction), target in from_right.items()
+        if graph.get_link(source, direction) != target
+    ]
@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+'''Swap an object for another one in every Pickrunner link.
+
+Links point to node UUIDs so when a control is rebuilt (and gets a new UUID)
+every link to it breaks. :func:`get_replaced_links` finds every link that must
+change so that a replacement takes the old object's place: the old object's
+own links move onto the replacement and every link that pointed to the old
+object points to the replacement, instead. Incoming links come straight from
+the graph's index so only objects that are actually affected are visited, no
+matter how big the scene is.
+
+Example:
+    >>> links = get_replaced_links(controller.get_graph(), {old_uuid: new_uuid})
+    >>> controller.assign_links(links)
+
+'''
+
+# IMPORT STANDARD LIBRARIES
+import collections
+
+
+def resolve_replacements(replacements):
+    '''Make every old object point straight to its final replacement.
+
+    If "A" is replaced by "B" and "B" is replaced by "C", "A" is replaced by "C".
+
+    Args:
+        replacements (dict[str, str] or iterable[tuple[str, str]]):
+            Each old object and the object that replaces it.
+
+    Raises:
+        ValueError: If the replacements loop back on themselves, like "A" -> "B" -> "A".
+
+    Returns:
+        collections.OrderedDict[str, str]: Each old object and its final replacement.
+
+    '''
+    if isinstance(replacements, dict):
+        replacements = replacements.items()
+
+    replacements = collections.OrderedDict(
+        (old, new) for old, new in replacements if old != new)
+    resolved = collections.OrderedDict()
+
+    for old in replacements:
+        seen = set([old])
+        new = replacements[old]
+
+        while new in replacements:
+            if new in seen:
+                raise ValueError('Replacing "{old}" loops back onto itself.'.format(old=old))
+
+            seen.add(new)
+            new = replacements[new]
+
+        resolved[old] = new
+
+    return resolved
+
+
+def get_replaced_links(graph, replacements):
+    '''Find every link that changes when some objects are replaced.
+
+    The outgoing links of each old object are moved onto its replacement,
+    replacing any link that the replacement already had in the same direction.
+    Every incoming link of each old object is pointed to the replacement.
+    Links that would make an object point to itself are removed.
+
+    Args:
+        graph (:class:`pickrunner.graph.LinkGraph`): Every link in the scene.
+        replacements (dict[str, str] or iterable[tuple[str, str]]):
+            Each old object and the object that replaces it.
+
+    Raises:
+        ValueError: If the replacements loop back on themselves.
+
+    Returns:
+        list[tuple[str, str, str]]:
+            Every (source, direction, target) link to write. A target of ""
+            means that the link is removed.
+
+    '''
+    replacements = resolve_replacements(replacements)
+    changes = collections.OrderedDict()
+
+    for old, new in replacements.items():
+        for direction, target in graph.get_links(old).items():
+            changes[(old, direction)] = ''
+            changes[(new, direction)] = replacements.get(target, target)
+
+    for old, new in replacements.items():
+        for source, direction in graph.get_incoming(old):
+            if source in replacements or (source, direction) in changes:
+                # The link was already moved from an old object, with its
+                # target replaced, and it wins over the replacement's own link
+                #
+                continue
+
+            changes[(source, direction)] = new
+
+    links = []
+
+    for (source, direction), target in changes.items():
+        if target == source:
+            target = ''
+
+        if (graph.get_link(source, direction) or '') != target:
+            links.append((source, direction, target))
+
+    return links
@@ -0,0 +1,1131 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+'''Read, write, and keep an index of every Pickrunner link in the Maya scene.
+
+This module only uses maya.cmds and the Maya Python API so that it's cheap to
+import during Maya's startup. It doesn't import PyMEL or Qt.
+
+The index is a :class:`pickrunner.graph.LinkGraph` that is loaded whenever a
+scene is opened. If a local cache is enabled (see :mod:`pickrunner.cache`)
+and it is still up-to-date, the index is read from the cache instead of the
+scene, which is much faster for large scenes.
+
+'''
+
+# IMPORT STANDARD LIBRARIES
+import contextlib
+import functools
+import logging
+import json
+import time
+import re
+
+# IMPORT THIRD-PARTY LIBRARIES
+from maya.api import OpenMaya as om
+from maya import cmds
+from maya import utils
+
+# IMPORT LOCAL LIBRARIES
+from . import cache
+from . import graph
+from . import lru
+from . import session
+from . import templates
+
+ATTRIBUTE_NAME = '__mayarunner_info'
+UNDO_CHUNK_NAME = 'Pickrunner'
+WARMUP_CHUNK_SIZE = 200
+WARMUP_IDLE_BUDGET = 0.01
+MAX_RESIDENT_NAMESPACES = 8
+
+_LOGGER = logging.getLogger(__name__)
+_GRAPH = None
+_NAMESPACES = lru.LRUCache(MAX_RESIDENT_NAMESPACES)
+_NAMESPACE_WARMUPS = dict()
+_SIGNATURES = dict()
+_ATTRIBUTE_STATES = dict()
+_WATCHED = dict()
+_PENDING = set()
+_ADDED = []
+_IS_WRITING = []
+_CALLBACKS = []
+LAST_LOAD = dict()
+
+
+@contextlib.contextmanager
+def undo_chunk(name=UNDO_CHUNK_NAME):
+    '''Group every Maya command run inside this context into one undo step.'''
+    cmds.undoInfo(openChunk=True, chunkName=name)
+
+    try:
+        yield
+    finally:
+        cmds.undoInfo(closeChunk=True)
+
+
+def get_uuid(node):
+    '''str: Get the UUID of a node's name, if the node exists.'''
+    try:
+        return cmds.ls(node, uuid=True)[0]
+    except IndexError:
+        return ''
+
+
+def read_settings(attribute, uuid):
+    '''dict[str, str]: Get the Pickrunner data of some node, using its UUID.'''
+    try:
+        node = cmds.ls(uuid)[0]
+    except IndexError:
+        return dict()
+
+    plug = node + '.' + attribute
+
+    if not cmds.objExists(plug):
+        return dict()
+
+    try:
+        settings = json.loads(cmds.getAttr(plug))
+    except (TypeError, ValueError):
+        return dict()
+
+    if not isinstance(settings, dict):
+        return dict()
+
+    return settings
+
+
+def _get_attribute_state(node, attribute):
+    '''Find out if a node has Pickrunner's attribute and if it is locked.
+
+    The answer is cached so asking about the same node again is free.
+
+    Args:
+        node (str): The name of the node to check.
+        attribute (str): The name of the attribute that the data is stored on.
+
+    Returns:
+        dict[str, bool]: If the attribute "exists" and if it is "locked".
+
+    '''
+    try:
+        return _ATTRIBUTE_STATES[node]
+    except KeyError:
+        pass
+
+    plug = node + '.' + attribute
+    exists = cmds.objExists(plug)
+    state = {
+        'exists': exists,
+        'locked': exists and cmds.getAttr(plug, lock=True),
+    }
+    _ATTRIBUTE_STATES[node] = state
+
+    return state
+
+
+def _write_node_settings(node, attribute, settings):
+    '''Store Pickrunner data onto one node, touching as little as possible.
+
+    The attribute is only created / hidden / locked if it wasn't already and
+    it is only unlocked for as long as it takes to set its value.
+
+    Args:
+        node (str): The name of the node to write to.
+        attribute (str): The name of the attribute to store data onto.
+        settings (dict[str, str]): The settings to store.
+
+    '''
+    plug = node + '.' + attribute
+    state = _get_attribute_state(node, attribute)
+
+    if not state['exists']:
+        cmds.addAttr(node, longName=attribute, dataType='string')
+        cmds.setAttr(plug, keyable=False, channelBox=False)
+        state['exists'] = True
+
+    if state['locked']:
+        cmds.setAttr(plug, lock=False)
+
+    cmds.setAttr(plug, json.dumps(settings, sort_keys=True), type='string')
+    cmds.setAttr(plug, lock=True)
+    state['locked'] = True
+
+
+def _is_stored(node, attribute, settings):
+    '''bool: If some node already stores exactly these settings.'''
+    if not _get_attribute_state(node, attribute)['exists']:
+        return False
+
+    try:
+        return json.loads(cmds.getAttr(node + '.' + attribute)) == settings
+    except (TypeError, ValueError):
+        return False
+
+
+def write_settings(attribute, settings_by_node):
+    '''Store Pickrunner data onto many nodes, as a single undo step.
+
+    The attribute is created and hidden on any node that doesn't have it yet.
+    Nodes that already store the same settings aren't written to at all, so
+    redundant writes don't dirty the scene or add anything to the undo queue.
+
+    Args:
+        attribute (str): The name of the attribute to store data onto.
+        settings_by_node (dict[str, dict[str, str]]):
+            Each node (UUID or name) and the settings to store onto that node.
+
+    Returns:
+        list[str]: The name of every node that was actually written to.
+
+    '''
+    changes = []
+
+    for key, settings in settings_by_node.items():
+        try:
+            node = cmds.ls(key)[0]
+        except IndexError:
+            continue
+
+        if not _is_stored(node, attribute, settings):
+            changes.append((node, settings))
+
+    if not changes:
+        return []
+
+    _IS_WRITING.append(True)
+
+    try:
+        with undo_chunk():
+            for node, settings in changes:
+                try:
+                    _write_node_settings(node, attribute, settings)
+                except RuntimeError:
+                    # The node changed since its state was cached. Try once more
+                    _ATTRIBUTE_STATES.pop(node, None)
+                    _write_node_settings(node, attribute, settings)
+    finally:
+        _IS_WRITING.pop()
+
+    for node, _ in changes:
+        # So that undoing / redoing this write updates the indexes
+        watch(node)
+
+    return [node for node, _ in changes]
+
+
+def get_nodes(attribute, namespace=None):
+    '''Find every node in the scene that has Pickrunner data.
+
+    Args:
+        attribute (str): The name of the attribute that the data is stored on.
+        namespace (:obj:`str`, optional):
+            If given, only nodes directly inside this namespace are found.
+            Otherwise, every node in every namespace is found. Default is None.
+
+    Returns:
+        list[str]: The name of every found node.
+
+    '''
+    if namespace is None:
+        return cmds.ls('*.' + attribute, recursive=True, objectsOnly=True) or []
+
+    if namespace:
+        pattern = namespace + ':*.' + attribute
+    else:
+        pattern = ':*.' + attribute
+
+    return cmds.ls(pattern, objectsOnly=True) or []
+
+
+def iter_scene_settings(attribute, namespace=None):
+    '''Find and read every node in the scene that has Pickrunner data.
+
+    Args:
+        attribute (str): The name of the attribute that the data is stored on.
+        namespace (:obj:`str`, optional):
+            If given, only nodes directly inside this namespace are found.
+            Otherwise, every node in every namespace is found. Default is None.
+
+    Yields:
+        tuple[str, str, dict[str, str]]: The name, UUID, and settings of each node.
+
+    '''
+    for node in get_nodes(attribute, namespace=namespace):
+        try:
+            settings = json.loads(cmds.getAttr(node + '.' + attribute))
+        except (TypeError, ValueError):
+            continue
+
+        if not isinstance(settings, dict):
+            continue
+
+        yield (node, get_uuid(node), settings)
+
+
+def _get_short_name(node):
+    '''str: Remove the DAG path from a node's name.'''
+    return node.split('|')[-1]
+
+
+def _iter_chunk_settings(attribute, nodes):
+    '''Read the Pickrunner data of many nodes using one selection list.
+
+    Every node that is read is watched (see :func:`watch`) so that whichever
+    index it goes into stays up-to-date, even if it's edited outside Pickrunner.
+
+    Args:
+        attribute (str): The name of the attribute that the data is stored on.
+        nodes (list[str]): The nodes to read.
+
+    Yields:
+        tuple[str, str, dict[str, str]]: The name, UUID, and settings of each node.
+
+    '''
+    selection = om.MSelectionList()
+
+    for node in nodes:
+        try:
+            selection.add(node)
+        except RuntimeError:
+            # The node was deleted or renamed since it was found
+            pass
+
+    for index in range(selection.length()):
+        node = selection.getDependNode(index)
+        _watch_node(node)
+        function_set = om.MFnDependencyNode(node)
+
+        try:
+            settings = json.loads(function_set.findPlug(attribute, False).asString())
+        except (RuntimeError, TypeError, ValueError):
+            continue
+
+        if not isinstance(settings, dict):
+            continue
+
+        yield (function_set.name(), function_set.uuid().asString(), settings)
+
+
+class Warmup(object):
+
+    '''Build the index of the scene a small piece at a time.
+
+    Every call to :meth:`Warmup.step` does as much work as it can in some
+    amount of time and then returns, so the index can be built while Maya is
+    idle without ever making Maya feel unresponsive.
+
+    '''
+
+    def __init__(self, namespace=None, attribute=ATTRIBUTE_NAME, chunk_size=WARMUP_CHUNK_SIZE):
+        '''Prepare to build the index, but don't actually do anything yet.
+
+        Args:
+            namespace (:obj:`str`, optional):
+                If given, only index the nodes directly inside of this
+                namespace. Otherwise, index the whole scene. Default is None.
+            attribute (:obj:`str`, optional):
+                The name of the attribute that the data is stored on.
+            chunk_size (:obj:`int`, optional):
+                How many nodes are read between every check of the time budget.
+
+        '''
+        super(Warmup, self).__init__()
+        self.namespace = namespace
+        self.attribute = attribute
+        self.chunk_size = chunk_size
+        self.graph = graph.LinkGraph()
+        self.uuids = set()
+        self.done = False
+        self.busy_seconds = 0.0
+        self._steps = self._iter_steps()
+
+    def _iter_steps(self):
+        '''Do each chunk of work and yield after every chunk.'''
+        nodes = get_nodes(self.attribute, namespace=self.namespace)
+        yield
+
+        for start in range(0, len(nodes), self.chunk_size):
+            chunk = nodes[start:start + self.chunk_size]
+
+            for name, uuid, settings in _iter_chunk_settings(self.attribute, chunk):
+                self.uuids.add(uuid)
+                self.graph.add_node(uuid, name=name)
+
+                for direction, target in settings.items():
+                    self.graph.set_link(uuid, direction, target)
+
+            yield
+
+        # Targets of one-way links don't have any data of their own
+        missing = [
+            identifier for identifier in self.graph.nodes()
+            if identifier not in self.graph.names
+        ]
+
+        for start in range(0, len(missing), self.chunk_size):
+            for identifier in missing[start:start + self.chunk_size]:
+                names = [_get_short_name(name) for name in cmds.ls(identifier) or [identifier]]
+                self.graph.names[identifier] = names[0]
+
+                if self.namespace is None:
+                    continue
+
+                # UUIDs repeat when a file is referenced more than once
+                for name in names:
+                    if templates.split_namespace(name)[0] == self.namespace:
+                        self.graph.names[identifier] = name
+                        break
+
+            yield
+
+    def step(self, budget=WARMUP_IDLE_BUDGET):
+        '''Build part of the index.
+
+        Args:
+            budget (:obj:`float`, optional):
+                How many seconds to work for before returning. If None, keep
+                working until the whole index is built.
+
+        Returns:
+            bool: If the index is completely built.
+
+        '''
+        start = time.time()
+
+        while not self.done:
+            try:
+                next(self._steps)
+            except StopIteration:
+                self.done = True
+                break
+
+            if budget is not None and time.time() - start >= budget:
+                break
+
+        self.busy_seconds += time.time() - start
+
+        return self.done
+
+    def finish(self):
+        '''Build the rest of the index, right now.'''
+        self.step(budget=None)
+
+
+def scan(attribute=ATTRIBUTE_NAME):
+    '''Read every Pickrunner link in the scene, all at once.
+
+    Only the nodes that actually have Pickrunner data are visited.
+
+    Args:
+        attribute (:obj:`str`, optional):
+            The name of the attribute that the data is stored on.
+
+    Returns:
+        :class:`pickrunner.graph.LinkGraph`: Every link, keyed by node UUID.
+
+    '''
+    warmup = Warmup(attribute=attribute)
+    warmup.finish()
+
+    return warmup.graph
+
+
+def get_scene_path():
+    '''str: The path to the open scene or "" if the scene was never saved.'''
+    return cmds.file(query=True, sceneName=True) or ''
+
+
+def get_scene_cache_key():
+    '''str: A key that changes whenever the scene or its references are saved.'''
+    scene = get_scene_path()
+    if not scene:
+        return ''
+
+    # Referencing the same file twice gives it a "{1}" suffix. It's the same file
+    references = set(
+        re.sub(r'{\d+}$', '', path)
+        for path in cmds.file(query=True, reference=True) or []
+    )
+
+    return cache.get_cache_key(scene, references=references)
+
+
+def get_indexed_uuids(attribute=ATTRIBUTE_NAME):
+    '''set[str]: The UUID of every node that has Pickrunner data.'''
+    nodes = get_nodes(attribute)
+    if not nodes:
+        return set()
+
+    return set(cmds.ls(nodes, uuid=True) or [])
+
+
+def get_indexed_names(attribute=ATTRIBUTE_NAME):
+    '''dict[str, str]: The UUID and name of every node that has Pickrunner data.'''
+    selection = om.MSelectionList()
+
+    for node in get_nodes(attribute):
+        try:
+            selection.add(node)
+        except RuntimeError:
+            pass
+
+    names = dict()
+
+    for index in range(selection.length()):
+        function_set = om.MFnDependencyNode(selection.getDependNode(index))
+        names[function_set.uuid().asString()] = function_set.name()
+
+    return names
+
+
+def is_cache_valid(data, attribute=ATTRIBUTE_NAME):
+    '''Check that some cached links still match the scene.
+
+    The cache's key already changes whenever the scene file is saved. On top of
+    that, every node with Pickrunner data must be in the cache, under the same
+    name, and vice-versa. That's much cheaper than reading every node's
+    Pickrunner data.
+
+    Args:
+        data (dict): The cache data. See :func:`pickrunner.cache.read`.
+        attribute (:obj:`str`, optional):
+            The name of the attribute that the data is stored on.
+
+    Returns:
+        bool: If the nodes with Pickrunner data match the nodes in the cache.
+
+    '''
+    names = data.get('names', dict())
+    cached = dict((uuid, names.get(uuid)) for uuid in data.get('settings', dict()))
+
+    return get_indexed_names(attribute) == cached
+
+
+def write_cache(links, names):
+    '''Save the index of the scene, but only if it matches the scene file on disk.
+
+    A scene with unsaved changes may have links that aren't in its file. If
+    they were cached under the file's key, the next open of the file would
+    read links that were never saved. So nothing is written for those scenes.
+
+    Args:
+        links (:class:`pickrunner.graph.LinkGraph`): The index of the whole scene.
+        names (dict[str, str]): The UUID and name of every node that has Pickrunner data.
+
+    Returns:
+        bool: If the cache was written.
+
+    '''
+    if not cache.is_enabled() or cmds.file(query=True, modified=True):
+        return False
+
+    cached_names = dict(links.names)
+    cached_names.update(names)
+
+    return cache.write(
+        get_scene_path(),
+        get_scene_cache_key(),
+        dict((uuid, links.get_links(uuid)) for uuid in names),
+        cached_names,
+    )
+
+
+def _set_loaded(links, scene, source, seconds):
+    '''Make some links the index of the current scene and report how long it took.'''
+    global _GRAPH  # pylint: disable=global-statement
+    _GRAPH = links
+
+    LAST_LOAD.clear()
+    LAST_LOAD.update({
+        'scene': scene,
+        'source': source,
+        'nodes': len(links),
+        'seconds': seconds,
+    })
+    _LOGGER.info('Loaded the Pickrunner index of "%s" from its %s in %.4f seconds.',
+                 scene, source, seconds)
+
+
+def load_from_cache():
+    '''Load the index of the whole scene, but only if it has an up-to-date cache.
+
+    Returns:
+        :class:`pickrunner.graph.LinkGraph` or NoneType: The loaded index, if any.
+
+    '''
+    start = time.time()
+    scene = get_scene_path()
+    data = cache.read(scene, get_scene_cache_key())
+
+    if data is None or not is_cache_valid(data):
+        return None
+
+    links = graph.LinkGraph.from_settings(data['settings'])
+    links.names.update(data.get('names', dict()))
+
+    # The nodes weren't read so they must be watched separately
+    _watch_nodes(get_nodes(ATTRIBUTE_NAME))
+
+    _set_loaded(links, scene, 'cache', time.time() - start)
+
+    return links
+
+
+def load():
+    '''Load the index of the whole scene, from a cache if possible.
+
+    How long the load took and whether the cache was used is stored in
+    :obj:`LAST_LOAD` and logged so that cold and warm opens can be compared.
+
+    Returns:
+        :class:`pickrunner.graph.LinkGraph`: The loaded index.
+
+    '''
+    links = load_from_cache()
+    if links is not None:
+        return links
+
+    start = time.time()
+    scene = get_scene_path()
+    warmup = Warmup()
+    warmup.finish()
+
+    write_cache(
+        warmup.graph,
+        dict((uuid, warmup.graph.names.get(uuid, uuid)) for uuid in warmup.uuids),
+    )
+    _set_loaded(warmup.graph, scene, 'scan', time.time() - start)
+
+    return warmup.graph
+
+
+def get_graph():
+    '''Get the index of the whole scene, loading it if it hasn't been loaded.
+
+    Returns:
+        :class:`pickrunner.graph.LinkGraph`: Every link, keyed by node UUID.
+
+    '''
+    if _GRAPH is None:
+        return load()
+
+    return _GRAPH
+
+
+def is_loaded():
+    '''bool: If the index of the whole scene is in memory.'''
+    return _GRAPH is not None
+
+
+def _schedule_warmup(warmup, on_done):
+    '''Build some index in small pieces, whenever Maya is idle.
+
+    Args:
+        warmup (:class:`Warmup`): The index to build.
+        on_done (callable[]):
+            A function to call once the index is built. If it returns
+            False, the warmup was cancelled and any work left is skipped.
+
+    '''
+    def _step():
+        '''Build part of the index and then wait for Maya to be idle again.'''
+        if _NAMESPACE_WARMUPS.get(warmup.namespace) is not warmup:
+            # A new scene was opened or the index was needed right away
+            return
+
+        if warmup.step():
+            on_done()
+        else:
+            utils.executeDeferred(_step)
+
+    utils.executeDeferred(_step)
+
+
+def _finish_namespace_warmup(warmup):
+    '''Make a completely built namespace index available for navigation.'''
+    if _NAMESPACE_WARMUPS.get(warmup.namespace) is not warmup:
+        return
+
+    del _NAMESPACE_WARMUPS[warmup.namespace]
+    _NAMESPACES.set(warmup.namespace, warmup.graph)
+    _SIGNATURES.pop(warmup.namespace, None)
+
+    _LOGGER.debug('Indexed Pickrunner namespace "%s" (%s nodes) in %.4f seconds of work.',
+                  warmup.namespace, len(warmup.graph), warmup.busy_seconds)
+
+
+def get_namespace_graph(namespace, background=True):
+    '''Get the index of one namespace, building it if it isn't in memory.
+
+    Only :obj:`MAX_RESIDENT_NAMESPACES` namespaces are kept in memory. When
+    another namespace is needed, the one that was used least recently is
+    forgotten. If the index of the whole scene is loaded, it's used instead.
+
+    Args:
+        namespace (str): The namespace to get, e.g. "crowd_12". "" is the root.
+        background (:obj:`bool`, optional):
+            If True and the namespace isn't in memory, start building its
+            index whenever Maya is idle and return None right away.
+            If False, build it before returning. Default is True.
+
+    Returns:
+        :class:`pickrunner.graph.LinkGraph` or NoneType:
+            The index or None if it is still being built.
+
+    '''
+    if _GRAPH is not None:
+        return _GRAPH
+
+    links = _NAMESPACES.get(namespace)
+    if links is not None:
+        return links
+
+    warmup = _NAMESPACE_WARMUPS.get(namespace)
+
+    if warmup is None:
+        warmup = Warmup(namespace=namespace)
+        _NAMESPACE_WARMUPS[namespace] = warmup
+
+        if background:
+            _schedule_warmup(warmup, functools.partial(_finish_namespace_warmup, warmup))
+
+    if background:
+        return None
+
+    warmup.finish()
+    _finish_namespace_warmup(warmup)
+
+    return warmup.graph
+
+
+def peek_namespace_graph(namespace):
+    '''Get the index of one namespace, only if it's already built and in memory.
+
+    Unlike :func:`get_namespace_graph`, nothing is built and the namespace
+    isn't marked as recently used.
+
+    Args:
+        namespace (str): The namespace to get, e.g. "crowd_12". "" is the root.
+
+    Returns:
+        :class:`pickrunner.graph.LinkGraph` or NoneType: The index, if it's in memory.
+
+    '''
+    return _NAMESPACES.peek(namespace)
+
+
+def get_relative_links(namespace):
+    '''Get every link in a namespace, using names without the namespace.
+
+    The links come from the namespace's index so the scene is never read
+    here. The index already resolves every target to the node that is in
+    the same namespace, even though UUIDs aren't unique when the same file
+    is referenced more than once. Targets in any other namespace are
+    :obj:`pickrunner.templates.EXTERNAL`.
+
+    Args:
+        namespace (str): The namespace to get, e.g. "crowd_12".
+
+    Returns:
+        dict[str, dict[str, str]] or NoneType:
+            Each relative name and its relative links or None, if the
+            namespace isn't indexed yet.
+
+    '''
+    index = peek_namespace_graph(namespace)
+
+    if index is None:
+        return None
+
+    links = dict()
+
+    for source in index.nodes():
+        source_namespace, source_name = templates.split_namespace(index.get_name(source))
+
+        if source_namespace != namespace:
+            # Only the targets of one-way links from this namespace
+            continue
+
+        relative_links = dict()
+
+        for direction, target in index.get_links(source).items():
+            target_namespace, relative = templates.split_namespace(index.get_name(target))
+
+            if target_namespace == namespace:
+                relative_links[direction] = relative
+            else:
+                # Targets in another namespace must be looked up by UUID
+                relative_links[direction] = templates.EXTERNAL
+
+        links[source_name] = relative_links
+
+    return links
+
+
+def get_namespace_signature(namespace):
+    '''Get the signature of a namespace's links, to tell instances of an asset apart.
+
+    The signature is worked out once and then kept, even after the index of
+    the namespace is forgotten, until a node in the namespace changes.
+
+    Args:
+        namespace (str): The namespace to get, e.g. "crowd_12".
+
+    Returns:
+        int or NoneType:
+            The :func:`pickrunner.templates.get_signature` of the namespace's
+            relative links or None, if the namespace isn't indexed yet.
+
+    '''
+    try:
+        return _SIGNATURES[namespace]
+    except KeyError:
+        pass
+
+    links = get_relative_links(namespace)
+    if links is None:
+        return None
+
+    signature = templates.get_signature(links)
+    _SIGNATURES[namespace] = signature
+
+    return signature
+
+
+def _forget_signatures(uuid):
+    '''Forget the signature of every namespace that some node is in, since it changed.'''
+    for name in cmds.ls(uuid) or []:
+        _SIGNATURES.pop(templates.split_namespace(name)[0], None)
+
+
+def find_link(name, uuid, direction):
+    '''Find the node that some node moves to, using the index of its namespace.
+
+    Args:
+        name (str): The name of the node to move from.
+        uuid (str): The UUID of the node to move from.
+        direction (str): The direction to move in.
+
+    Returns:
+        tuple[bool, str or NoneType]:
+            If the index knows the node and, if it does, the UUID of the node
+            to move to (or None if there's no link). If the index isn't ready
+            (it starts being built) or has no links for the node, the caller
+            should read the node directly, instead.
+
+    '''
+    links = get_namespace_graph(templates.split_namespace(name)[0])
+    if links is None:
+        return (False, None)
+
+    settings = links.get_links(uuid)
+
+    if not settings:
+        # A node that was added or edited without Pickrunner may not be indexed yet
+        return (False, None)
+
+    return (True, settings.get(direction))
+
+
+def get_namespace_stats():
+    '''dict[str, int]: How well the per-namespace indexes have been reused.'''
+    stats = _NAMESPACES.get_stats()
+    stats['pending'] = len(_NAMESPACE_WARMUPS)
+    stats['resident'] = _NAMESPACES.keys()
+
+    return stats
+
+
+def clear():
+    '''Forget every index of the current scene and stop building them.'''
+    global _GRAPH  # pylint: disable=global-statement
+    _GRAPH = None
+    _NAMESPACES.clear()
+    _NAMESPACE_WARMUPS.clear()
+    _SIGNATURES.clear()
+    _ATTRIBUTE_STATES.clear()
+    _unwatch_all()
+
+
+def _get_indexes_of(uuid):
+    '''list[:class:`pickrunner.graph.LinkGraph`]: Every loaded index that could hold a node.'''
+    indexes = []
+    if _GRAPH is not None:
+        indexes.append(_GRAPH)
+
+    for name in cmds.ls(uuid) or []:
+        namespace = templates.split_namespace(name)[0]
+        links = _NAMESPACES.peek(namespace)
+
+        if links is not None:
+            indexes.append(links)
+
+        warmup = _NAMESPACE_WARMUPS.get(namespace)
+        if warmup is not None:
+            indexes.append(warmup.graph)
+
+    return indexes
+
+
+def update_links(links):
+    '''Keep the indexes in sync with links that were just written to the scene.
+
+    Args:
+        links (iterable[tuple[str, str, str]]):
+            Every (source UUID, direction, target UUID) link that was written.
+
+    '''
+    indexes = dict()
+
+    for source, direction, target in links:
+        if source not in indexes:
+            indexes[source] = _get_indexes_of(source)
+            _forget_signatures(source)
+
+        for links_ in indexes[source]:
+            links_.set_link(source, direction, target)
+
+
+def _forget_attribute_states(*_):
+    '''Forget the cached state of every Pickrunner attribute, after an undo or redo.
+
+    Undo can delete / unlock Pickrunner's attribute. The links themselves
+    don't need to be read again here: every indexed or written node is
+    watched, so only the nodes that an undo actually changed are re-read.
+
+    '''
+    _ATTRIBUTE_STATES.clear()
+
+
+def _reread(uuid):
+    '''Make every loaded index match the Pickrunner data that's stored on a node.'''
+    for name in cmds.ls(uuid) or []:
+        _ATTRIBUTE_STATES.pop(name, None)
+
+    _forget_signatures(uuid)
+    indexes = _get_indexes_of(uuid)
+    if not indexes:
+        return
+
+    names = cmds.ls(uuid) or []
+    settings = read_settings(ATTRIBUTE_NAME, uuid)
+
+    if names:
+        watch(names[0])
+
+    for links in indexes:
+        links.set_links(uuid, settings)
+
+        if settings and names:
+            links.names[uuid] = _get_short_name(names[0])
+
+
+def _flush_pending():
+    '''Re-read every node whose Pickrunner data changed since the last flush.'''
+    while _ADDED:
+        handle = _ADDED.pop()
+
+        if not handle.isValid():
+            continue
+
+        node = om.MFnDependencyNode(handle.object())
+
+        if node.hasAttribute(ATTRIBUTE_NAME):
+            _PENDING.add(node.uuid().asString())
+
+    while _PENDING:
+        _reread(_PENDING.pop())
+
+
+def _schedule_flush():
+    '''Re-read changed nodes once Maya is idle, no matter how many changed.'''
+    if len(_PENDING) + len(_ADDED) == 1:
+        utils.executeDeferred(_flush_pending)
+
+
+def _on_attribute_changed(message, plug, _, client_data):
+    '''Re-read a node whenever its Pickrunner data is set, added or removed outside Pickrunner.'''
+    if _IS_WRITING:
+        # Pickrunner already updated the index for its own writes
+        return
+
+    if not message & (
+            om.MNodeMessage.kAttributeSet
+            | om.MNodeMessage.kAttributeAdded
+            | om.MNodeMessage.kAttributeRemoved):
+        return
+
+    if om.MFnAttribute(plug.attribute()).name != ATTRIBUTE_NAME:
+        return
+
+    uuid = client_data.uuid().asString()
+
+    if uuid not in _PENDING:
+        _PENDING.add(uuid)
+        _schedule_flush()
+
+
+def _on_node_added(node, *_):
+    '''Index nodes that were imported, duplicated, pasted or referenced, once Maya is idle.
+
+    Their Pickrunner data is only set after they're added, so they're read later.
+
+    '''
+    _ADDED.append(om.MObjectHandle(node))
+    _schedule_flush()
+
+
+def watch(name):
+    '''Re-index a node whenever its Pickrunner data changes, from now on.
+
+    Each node is only watched once.
+
+    Args:
+        name (str): The name or UUID of the node to watch.
+
+    '''
+    selection = om.MSelectionList()
+
+    try:
+        selection.add(name)
+    except RuntimeError:
+        return
+
+    _watch_node(selection.getDependNode(0))
+
+
+def _watch_nodes(nodes):
+    '''Watch many nodes, using one selection list. See :func:`watch`.'''
+    selection = om.MSelectionList()
+
+    for node in nodes:
+        try:
+            selection.add(node)
+        except RuntimeError:
+            pass
+
+    for index in range(selection.length()):
+        _watch_node(selection.getDependNode(index))
+
+
+def _watch_node(node):
+    '''Re-index a node whenever its Pickrunner data changes. See :func:`watch`.'''
+    handle = om.MObjectHandle(node)
+    key = handle.hashCode()
+
+    try:
+        watched_handle, _ = _WATCHED[key]
+    except KeyError:
+        pass
+    else:
+        if watched_handle.isValid():
+            return
+
+        _remove_callback(_WATCHED.pop(key)[1])
+
+    _WATCHED[key] = (
+        handle,
+        om.MNodeMessage.addAttributeChangedCallback(
+            node, _on_attribute_changed, om.MFnDependencyNode(node)),
+    )
+
+
+def _remove_callback(callback):
+    '''Stop a callback of a node, which may have already been deleted.'''
+    try:
+        om.MMessage.removeCallback(callback)
+    except RuntimeError:
+        # The node was deleted and its callback was removed with it
+        pass
+
+
+def _unwatch_all():
+    '''Stop watching every node and forget any changes that weren't re-read yet.'''
+    while _WATCHED:
+        _, (_, callback) = _WATCHED.popitem()
+        _remove_callback(callback)
+
+    _PENDING.clear()
+    del _ADDED[:]
+
+
+def _on_name_changed(node, previous_name, *_):
+    '''Keep the names in the index up-to-date whenever any node is renamed.'''
+    if _GRAPH is None:
+        return
+
+    uuid = om.MFnDependencyNode(node).uuid().asString()
+
+    if _GRAPH.has_node(uuid):
+        _GRAPH.names[uuid] = om.MFnDependencyNode(node).name()
+
+
+def _on_scene_opened(*_):
+    '''Load the scene's cache or start indexing its root namespace.
+
+    Other namespaces are only indexed once the user navigates inside of them.
+
+    '''
+    clear()
+
+    if load_from_cache() is None:
+        get_namespace_graph('', background=True)
+
+
+def _on_scene_saved(*_):
+    '''Cache the index, now that the scene file on disk matches it.'''
+    if _GRAPH is None or not cache.is_enabled():
+        return
+
+    names = get_indexed_names()
+
+    if all(_GRAPH.has_node(uuid) for uuid in names):
+        write_cache(_GRAPH, names)
+
+
+def install():
+    '''Index scenes whenever they're opened and forget them on new scenes.
+
+    Any buffered edits (see :mod:`pickrunner.session`) are forgotten, too.
+
+    Calling this function more than once does nothing.
+
+    '''
+    if _CALLBACKS:
+        return
+
+    def _clear(*_):
+        '''Forget the index of the scene that was just closed.'''
+        clear()
+
+    def _discard_session(*_):
+        '''Forget buffered edits. They belong to the scene that was just closed.'''
+        active = session.get_active()
+
+        if active is not None:
+            active.discard()
+
+    _CALLBACKS.append(
+        om.MSceneMessage.addCallback(om.MSceneMessage.kAfterOpen, _on_scene_opened))
+    _CALLBACKS.append(om.MSceneMessage.addCallback(om.MSceneMessage.kAfterNew, _clear))
+    _CALLBACKS.append(
+        om.MSceneMessage.addCallback(om.MSceneMessage.kAfterSave, _on_scene_saved))
+
+    for message in (om.MSceneMessage.kAfterOpen, om.MSceneMessage.kAfterNew):
+        _CALLBACKS.append(om.MSceneMessage.addCallback(message, _discard_session))
+
+    _CALLBACKS.append(om.MNodeMessage.addNameChangedCallback(
+        om.MObject.kNullObj, _on_name_changed))
+    _CALLBACKS.append(om.MDGMessage.addNodeAddedCallback(_on_node_added, 'dependNode'))
+
+    for event in ('Undo', 'Redo'):
+        _CALLBACKS.append(om.MEventMessage.addEventCallback(event, _forget_attribute_states))
+
+
+def uninstall():
+    '''Remove every callback that :func:`install` added.'''
+    while _CALLBACKS:
+        om.MMessage.removeCallback(_CALLBACKS.pop())
+
+    _unwatch_all()
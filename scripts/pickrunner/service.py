@@ -0,0 +1,737 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+'''Let other local tools, like an animation picker, use Pickrunner's links.
+
+A :class:`Service` listens on a local socket (a Unix socket or, where there
+are none, a TCP port on 127.0.0.1). Each message is one line of JSON, either
+one request or a list of requests (a batch). Each request looks like
+
+.. code-block :: json
+
+    {"id": 1, "method": "get_links", "params": {"identifiers": ["UUID-1"]}}
+
+and is answered, on one line, with ``{"id": 1, "result": ...}`` or
+``{"id": 1, "error": "..."}``. A batch is answered with a list of responses,
+in the same order, and is run all at once so a tool can ask about hundreds of
+controls for the price of one round trip. Every method is in :obj:`METHODS`.
+
+Links are read from the controller's in-memory graph (and the active edit
+session, if any), never from the scene's attributes. Nothing in this module
+knows about any DCC. In Maya, use :func:`pickrunner.mayarunner.start_service`
+or set the PICKRUNNER_SERVICE environment variable to 1 to start it with Maya.
+
+Example:
+    >>> from pickrunner import service
+    >>> with service.Client() as client:
+    ...     client.request('get_links', identifiers=['UUID-1', 'UUID-2'])
+    ...     client.batch([('move', {'direction': 'up'}), ('get_selection', {})])
+
+To measure the round-trip latency and throughput of a service that's already
+running, or of a new service with an in-memory scene, run
+
+.. code-block :: bash
+
+    QT_QPA_PLATFORM=offscreen python -m pickrunner.service --objects 10000 --requests 1000
+
+'''
+
+# IMPORT STANDARD LIBRARIES
+import argparse
+import json
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+
+try:
+    import socketserver
+except ImportError:  # Python 2
+    import SocketServer as socketserver  # pylint: disable=import-error
+
+# IMPORT LOCAL LIBRARIES
+from . import session
+
+
+ADDRESS_ENVIRONMENT_VARIABLE = 'PICKRUNNER_SERVICE_ADDRESS'
+DEFAULT_PORT = 7721
+ENABLE_ENVIRONMENT_VARIABLE = 'PICKRUNNER_SERVICE'
+METHODS = (
+    'ping',
+    'get_links',
+    'get_incoming',
+    'get_selection',
+    'select',
+    'move',
+    'assign',
+)
+PROTOCOL_VERSION = 1
+
+
+class ServiceError(Exception):
+
+    '''An error that a :class:`Service` responded with or that stopped it from starting.'''
+
+    pass
+
+
+def is_enabled():
+    '''bool: If the user wants a service to start with their DCC (PICKRUNNER_SERVICE=1).'''
+    return os.getenv(ENABLE_ENVIRONMENT_VARIABLE, '') not in ('', '0')
+
+
+def get_default_address():
+    '''Find the address that services listen on and clients connect to.
+
+    Returns:
+        str: The PICKRUNNER_SERVICE_ADDRESS environment variable, if it's set.
+        Otherwise, a Unix socket in the temporary folder or, if Unix sockets
+        aren't supported, "127.0.0.1:7721".
+
+    '''
+    address = os.getenv(ADDRESS_ENVIRONMENT_VARIABLE, '')
+
+    if address:
+        return address
+
+    if hasattr(socket, 'AF_UNIX'):
+        return os.path.join(tempfile.gettempdir(), 'pickrunner-{user}.sock'.format(
+            user=getattr(os, 'getuid', lambda: 0)()))
+
+    return '127.0.0.1:{port}'.format(port=DEFAULT_PORT)
+
+
+def _is_listening(address):
+    '''bool: If some process is accepting connections on a Unix socket.'''
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+
+    try:
+        connection.connect(address)
+    except socket.error:
+        return False
+    finally:
+        connection.close()
+
+    return True
+
+
+def _get_file_id(path):
+    '''tuple[int, int] or NoneType: What identifies a file, even if it's replaced at the same path.'''
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+
+    return (stat.st_dev, stat.st_ino)
+
+
+def _parse_address(address):
+    '''Get the socket family and socket address of some address.
+
+    Args:
+        address (str): A Unix socket path or "host:port".
+
+    Returns:
+        tuple[int, str or tuple[str, int]]: The family and address to bind / connect to.
+
+    '''
+    host, separator, port = address.rpartition(':')
+
+    if separator and port.isdigit() and os.sep not in host:
+        return (socket.AF_INET, (host or '127.0.0.1', int(port)))
+
+    return (socket.AF_UNIX, address)
+
+
+class Handler(object):
+
+    '''Answer service requests with a :class:`pickrunner.gui.BehaviorControl`.'''
+
+    def __init__(self, controller, run=None, motion=None):
+        '''Keep track of the controller to answer requests with.
+
+        Args:
+            controller (:class:`pickrunner.gui.BehaviorControl`):
+                The environment to read links from and to select objects in.
+            run (:obj:`callable[callable]`, optional):
+                Calls a function and returns its result. Every batch is run
+                through it, once. DCCs whose scene can only be used from their
+                main thread should pass a function that runs there.
+                Default: Call the function right away.
+            motion (:obj:`callable[str]`, optional):
+                Moves the selection in some direction. Default: Follow a link
+                from the last selected object, with the controller.
+
+        '''
+        super(Handler, self).__init__()
+        self.controller = controller
+        self._run = run or (lambda function: function())
+        self._motion = motion or self._move_selection
+        self._lock = threading.Lock()
+
+    def _get_objects(self, identifiers):
+        '''list: Every object that exists, out of some identifiers.'''
+        objects = []
+
+        for identifier in identifiers:
+            obj = self.controller.get_object(identifier)
+
+            if obj is not None:
+                objects.append(obj)
+
+        return objects
+
+    def _get_selection(self):
+        '''list[str]: The identifier of every selected object.'''
+        return [self.controller.get_identifier(obj) for obj in self.controller.get_selection()]
+
+    def _move_selection(self, direction):
+        '''Follow a link in some direction, from the last selected object.'''
+        try:
+            obj = self.controller.get_selection()[-1]
+        except IndexError:
+            return
+
+        self.controller.do_motion(direction, obj)
+
+    def ping(self):
+        '''dict[str, int]: Check that the service is running.'''
+        return {'version': PROTOCOL_VERSION}
+
+    def get_links(self, identifiers, directions=None):
+        '''Find the objects that some objects link to.
+
+        Args:
+            identifiers (list[str]): The objects to get the links of.
+            directions (:obj:`list[str]`, optional):
+                Only get these directions. Default: Every direction.
+
+        Returns:
+            dict[str, dict[str, str]]: Each object and its links.
+
+        '''
+        graph = self.controller.get_graph()
+        active = session.get_active()
+        links_by_object = dict()
+
+        for identifier in identifiers:
+            links = graph.get_links(identifier)
+
+            if active:
+                links = active.apply(identifier, links)
+
+            links_by_object[identifier] = dict(
+                (direction, target) for direction, target in links.items()
+                if target and (directions is None or direction in directions)
+            )
+
+        return links_by_object
+
+    def get_incoming(self, identifiers):
+        '''Find every link that points to some objects.
+
+        Args:
+            identifiers (list[str]): The objects that are linked to.
+
+        Returns:
+            dict[str, list[tuple[str, str]]]: Each object and its (source, direction) links.
+
+        '''
+        graph = self.controller.get_graph()
+        active = session.get_active()
+        incoming_by_object = dict()
+
+        for identifier in identifiers:
+            incoming = graph.get_incoming(identifier)
+
+            if active:
+                incoming = active.apply_incoming(identifier, incoming)
+
+            incoming_by_object[identifier] = sorted(incoming)
+
+        return incoming_by_object
+
+    def get_selection(self):
+        '''list[str]: The identifier of every selected object.'''
+        return self._get_selection()
+
+    def select(self, identifiers):
+        '''Select some objects.
+
+        Returns:
+            list[str]: The identifier of every selected object.
+
+        '''
+        self.controller.select(self._get_objects(identifiers))
+
+        return self._get_selection()
+
+    def move(self, direction, identifiers=None):
+        '''Move the selection in some direction, just like pressing its hotkey.
+
+        Args:
+            direction (str): The direction to move in.
+            identifiers (:obj:`list[str]`, optional):
+                The objects to select before moving. Default: The current selection.
+
+        Returns:
+            list[str]: The identifier of every selected object, after moving.
+
+        '''
+        if identifiers:
+            self.controller.select(self._get_objects(identifiers))
+
+        self._motion(direction)
+
+        return self._get_selection()
+
+    def assign(self, links):
+        '''Create many links at once.
+
+        If an edit session is active, the links are added to it. Otherwise,
+        they're written in one batch.
+
+        Args:
+            links (list[tuple[str, str, str]]): Every (source, direction, target) link.
+
+        Returns:
+            int: The number of links.
+
+        '''
+        links = [tuple(link) for link in links]
+        active = session.get_active()
+
+        if active is not None:
+            active.set_links(links)
+        else:
+            self.controller.assign_links(links)
+
+        return len(links)
+
+    def _handle(self, request):
+        '''dict[str, object]: Run one request and describe its result or error.'''
+        try:
+            identifier = request.get('id')
+            method = request['method']
+        except (AttributeError, KeyError):
+            return {'id': None, 'error': 'Requests need a "method".'}
+
+        if method not in METHODS:
+            return {'id': identifier, 'error': 'Method "{method}" does not exist.'.format(
+                method=method)}
+
+        try:
+            result = getattr(self, method)(**request.get('params', dict()))
+        except Exception as error:  # pylint: disable=broad-except
+            return {'id': identifier, 'error': '{name}: {error}'.format(
+                name=error.__class__.__name__, error=error)}
+
+        return {'id': identifier, 'result': result}
+
+    def handle(self, message):
+        '''Answer one request or a batch of requests.
+
+        Args:
+            message (dict or list[dict]): The decoded request(s).
+
+        Returns:
+            dict or list[dict]: The response(s), in the same shape as `message`.
+
+        '''
+        def _handle_all():
+            if isinstance(message, list):
+                return [self._handle(request) for request in message]
+
+            return self._handle(message)
+
+        with self._lock:
+            return self._run(_handle_all)
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+
+    '''Read lines of JSON from a connection and answer each of them.'''
+
+    def handle(self):
+        '''Answer every message until the client disconnects.'''
+        for line in self.rfile:
+            if not line.strip():
+                continue
+
+            try:
+                message = json.loads(line.decode('utf-8'))
+            except ValueError as error:
+                response = {'id': None, 'error': 'Invalid JSON: {error}'.format(error=error)}
+            else:
+                response = self.server.pickrunner_handler.handle(message)
+
+            self.wfile.write(json.dumps(response).encode('utf-8') + b'\n')
+            self.wfile.flush()
+
+
+class _TCPServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+
+    '''A TCP server that answers each connection in its own thread.
+
+    Only one process can ever listen on the address. On Windows, SO_REUSEADDR
+    would let a second process bind the same port so SO_EXCLUSIVEADDRUSE is
+    used, instead. Elsewhere, SO_REUSEADDR only lets a restarted service bind
+    while old connections are still closing.
+
+    '''
+
+    allow_reuse_address = not hasattr(socket, 'SO_EXCLUSIVEADDRUSE')
+    daemon_threads = True
+
+    def server_bind(self):
+        '''Claim the address for this process only, then bind to it.'''
+        if hasattr(socket, 'SO_EXCLUSIVEADDRUSE'):
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_EXCLUSIVEADDRUSE, 1)
+
+        socketserver.TCPServer.server_bind(self)
+
+
+if hasattr(socketserver, 'UnixStreamServer'):
+    class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+
+        '''A Unix socket server that answers each connection in its own thread.'''
+
+        daemon_threads = True
+else:
+    _UnixServer = None
+
+
+class Service(object):
+
+    '''Answer requests from other processes, in a background thread.'''
+
+    def __init__(self, handler, address=None):
+        '''Prepare a service, without starting it.
+
+        Args:
+            handler (:class:`Handler`): Answers every request.
+            address (:obj:`str`, optional):
+                A Unix socket path or "host:port". Default: :func:`get_default_address`.
+
+        '''
+        super(Service, self).__init__()
+        self.handler = handler
+        self.address = address or get_default_address()
+        self._server = None
+        self._thread = None
+        self._socket_file = None
+
+    def is_running(self):
+        '''bool: If the service is accepting connections.'''
+        return self._server is not None
+
+    def start(self):
+        '''Start listening for connections, if the service isn't already.
+
+        Raises:
+            :class:`ServiceError`:
+                If another process (e.g. another Maya) already listens on
+                the same address.
+
+        '''
+        if self.is_running():
+            return
+
+        family, address = _parse_address(self.address)
+
+        if family == socket.AF_INET:
+            try:
+                server = _TCPServer(address, _RequestHandler)
+            except socket.error as error:
+                raise ServiceError(
+                    'Could not listen on "{address}" ({error}). Another process probably '
+                    'already does. Set {variable} to a different address to run more '
+                    'than one service.'.format(
+                        address=self.address, error=error,
+                        variable=ADDRESS_ENVIRONMENT_VARIABLE))
+
+            # If port 0 was requested, clients need to know the port that was picked
+            self.address = '{0}:{1}'.format(*server.server_address)
+        else:
+            if os.path.exists(address):
+                if _is_listening(address):
+                    raise ServiceError(
+                        'Another process already listens on "{address}". Set {variable} '
+                        'to a different address to run more than one service.'.format(
+                            address=address, variable=ADDRESS_ENVIRONMENT_VARIABLE))
+
+                # Left behind by a process that didn't stop its service
+                os.remove(address)
+
+            server = _UnixServer(address, _RequestHandler)
+            os.chmod(address, 0o600)
+            self._socket_file = _get_file_id(address)
+
+        server.pickrunner_handler = self.handler
+        self._server = server
+        self._thread = threading.Thread(target=server.serve_forever, name='pickrunner_service')
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        '''Stop listening for connections and clean up the socket, if any.'''
+        if not self.is_running():
+            return
+
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+        family, address = _parse_address(self.address)
+
+        if family != socket.AF_INET and _get_file_id(address) == self._socket_file:
+            # Only remove the socket that this service made, never another process's
+            os.remove(address)
+
+        self._server = None
+        self._thread = None
+        self._socket_file = None
+
+
+class Client(object):
+
+    '''Send requests to a :class:`Service`, over one connection.'''
+
+    def __init__(self, address=None, timeout=5.0):
+        '''Prepare a client, without connecting yet.
+
+        Args:
+            address (:obj:`str`, optional):
+                The service's address. Default: :func:`get_default_address`.
+            timeout (:obj:`float`, optional): How many seconds to wait for a response.
+
+        '''
+        super(Client, self).__init__()
+        self.address = address or get_default_address()
+        self.timeout = timeout
+        self._socket = None
+        self._file = None
+        self._ids = 0
+
+    def connect(self):
+        '''Connect to the service, if this client isn't connected already.'''
+        if self._socket is not None:
+            return
+
+        family, address = _parse_address(self.address)
+        connection = socket.socket(family, socket.SOCK_STREAM)
+        connection.settimeout(self.timeout)
+        connection.connect(address)
+
+        if family == socket.AF_INET:
+            connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+        self._socket = connection
+        self._file = connection.makefile('rb')
+
+    def close(self):
+        '''Disconnect from the service.'''
+        if self._socket is None:
+            return
+
+        self._file.close()
+        self._socket.close()
+        self._socket = None
+        self._file = None
+
+    def _send(self, message):
+        '''Send a message and wait for its response.'''
+        self.connect()
+        self._socket.sendall(json.dumps(message).encode('utf-8') + b'\n')
+        line = self._file.readline()
+
+        if not line:
+            self.close()
+            raise ServiceError('The service closed the connection.')
+
+        return json.loads(line.decode('utf-8'))
+
+    def _make_request(self, method, params):
+        '''dict[str, object]: Describe a request with a new ID.'''
+        self._ids += 1
+
+        return {'id': self._ids, 'method': method, 'params': params}
+
+    @staticmethod
+    def _get_result(response):
+        '''Get the result of a response or raise its error.'''
+        if 'error' in response:
+            raise ServiceError(response['error'])
+
+        return response.get('result')
+
+    def request(self, method, **params):
+        '''Run one method on the service.
+
+        Args:
+            method (str): Any name in :obj:`METHODS`.
+            **params: The method's arguments.
+
+        Raises:
+            :class:`ServiceError`: If the method failed.
+
+        Returns:
+            object: The method's result.
+
+        '''
+        return self._get_result(self._send(self._make_request(method, params)))
+
+    def batch(self, calls):
+        '''Run many methods on the service, in one round trip.
+
+        Args:
+            calls (iterable[tuple[str, dict[str, object]]]): Each method and its arguments.
+
+        Raises:
+            :class:`ServiceError`: If any method failed.
+
+        Returns:
+            list[object]: The result of each method, in order.
+
+        '''
+        requests = [self._make_request(method, params) for method, params in calls]
+
+        if not requests:
+            return []
+
+        return [self._get_result(response) for response in self._send(requests)]
+
+    def __enter__(self):
+        '''Connect to the service.'''
+        self.connect()
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        '''Disconnect from the service.'''
+        self.close()
+
+
+def benchmark(client, identifiers, requests=1000, batch_size=100):
+    '''Measure the round-trip latency and throughput of a service.
+
+    Args:
+        client (:class:`Client`): A client of the service to measure.
+        identifiers (list[str]): Objects to ask the service about.
+        requests (:obj:`int`, optional): The number of requests to send, per test.
+        batch_size (:obj:`int`, optional): The number of requests in each batch.
+
+    Returns:
+        dict[str, dict[str, float]]: The latency, in seconds, and requests
+        per second of single "ping" and "get_links" requests and of batched
+        "get_links" requests.
+
+    '''
+    count = len(identifiers)
+
+    def _measure(send, repeats, size=1):
+        times = []
+
+        for index in range(repeats):
+            start = time.time()
+            send(index)
+            times.append(time.time() - start)
+
+        total = sum(times) or float('nan')
+        times.sort()
+
+        return {
+            'mean': total / repeats,
+            'p99': times[min(repeats - 1, int(repeats * 0.99))],
+            'max': times[-1],
+            'requests_per_second': repeats * size / total,
+        }
+
+    def _send_ping(_):
+        client.request('ping')
+
+    def _send_single(index):
+        client.request('get_links', identifiers=[identifiers[index % count]])
+
+    def _send_batch(index):
+        client.batch(
+            ('get_links', {'identifiers': [identifiers[(index * batch_size + offset) % count]]})
+            for offset in range(batch_size)
+        )
+
+    return {
+        'ping': _measure(_send_ping, requests),
+        'get_links': _measure(_send_single, requests),
+        'get_links_batched': _measure(
+            _send_batch, max(1, requests // batch_size), size=batch_size),
+    }
+
+
+def main(arguments=None):
+    '''Benchmark a service from the command-line and print the result as JSON.
+
+    Returns:
+        int: 0 if the benchmark ran, otherwise 1.
+
+    '''
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        '--address',
+        help='Measure a service that is already running. Default: Start a new '
+             'service with an in-memory scene.',
+    )
+    parser.add_argument('--objects', type=int, default=10000, help='The number of in-memory objects.')
+    parser.add_argument('--requests', type=int, default=1000, help='The number of requests per test.')
+    parser.add_argument('--batch-size', type=int, default=100, help='The number of requests per batch.')
+    parser.add_argument(
+        '--identifiers', nargs='*', default=[], help='Objects to ask a running service about.')
+    options = parser.parse_args(arguments)
+
+    service = None
+    identifiers = options.identifiers
+
+    if not options.address:
+        from . import memory  # pylint: disable=import-outside-toplevel
+
+        controller = memory.MemoryBehaviorControl()
+        identifiers = [
+            controller.create_object('ctrl_{index}'.format(index=index))
+            for index in range(options.objects)
+        ]
+        controller.assign_links(
+            (identifiers[index], 'right', identifiers[index + 1])
+            for index in range(len(identifiers) - 1)
+        )
+        address = '127.0.0.1:0'
+
+        if _UnixServer is not None:
+            address = os.path.join(tempfile.gettempdir(), 'pickrunner-benchmark-{pid}.sock'.format(
+                pid=os.getpid()))
+
+        service = Service(Handler(controller), address=address)
+        service.start()
+
+    if not identifiers:
+        print('Pass --identifiers to benchmark a running service.')
+        return 1
+
+    try:
+        with Client(address=options.address or service.address) as client:
+            result = benchmark(
+                client, identifiers, requests=options.requests, batch_size=options.batch_size)
+    except (ServiceError, socket.error) as error:
+        print('Failed: {error}'.format(error=error))
+        return 1
+    finally:
+        if service is not None:
+            service.stop()
+
+    print(json.dumps(result, indent=4, sort_keys=True))
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,198 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+'''Collect link edits in memory and write them to the scene all at once.
+
+Writing every link the moment that it's made dirties the scene, adds to the
+undo queue and refreshes everything that listens for changes. During a long
+wiring session, that adds up. An :class:`EditSession` holds new links in
+memory, instead. The GUI and navigation both read through the session so the
+links work right away but nothing is written until :meth:`EditSession.commit`
+writes every link in one batch (and one undo step). :meth:`EditSession.discard`
+just forgets them.
+
+Only one session can be active at a time. Nothing in this module knows about
+any DCC.
+
+'''
+
+# IMPORT STANDARD LIBRARIES
+import collections
+
+# IMPORT LOCAL LIBRARIES
+from . import graph as graph_
+
+_ACTIVE = None
+
+
+class EditSession(object):
+
+    '''An in-memory layer of links, on top of the links in the scene.'''
+
+    def __init__(self):
+        '''Create a session with no edits.'''
+        super(EditSession, self).__init__()
+        self._links = collections.OrderedDict()
+
+    def set_link(self, source, direction, target):
+        '''Make `source` point to `target`, for some direction, once committed.'''
+        # Re-adding a link moves it to the end so links are committed in the
+        # same order as they were last made
+        #
+        self._links.pop((source, direction), None)
+        self._links[(source, direction)] = target
+
+    def set_links(self, links):
+        '''Add many (source, direction, target) links to this session.'''
+        for source, direction, target in links:
+            self.set_link(source, direction, target)
+
+    def get_link(self, source, direction):
+        '''Find a link that was edited in this session.
+
+        Args:
+            source (str): The ID of the object to move from.
+            direction (str): The direction to move in.
+
+        Returns:
+            tuple[bool, str or NoneType]:
+                If the link was edited in this session and, if so, its target.
+
+        '''
+        try:
+            return (True, self._links[(source, direction)])
+        except KeyError:
+            return (False, None)
+
+    def get_links(self):
+        '''list[tuple[str, str, str]]: Every (source, direction, target) edit.'''
+        return [
+            (source, direction, target)
+            for (source, direction), target in self._links.items()
+        ]
+
+    def apply(self, source, settings):
+        '''Get the settings of some object, as they'd be after committing.
+
+        Args:
+            source (str): The ID of the object.
+            settings (dict[str, str]): The object's settings in the scene.
+
+        Returns:
+            dict[str, str]: A copy of `settings` with this session's edits.
+
+        '''
+        settings = dict(settings)
+
+        for (source_, direction), target in self._links.items():
+            if source_ == source:
+                settings[direction] = target
+
+        return settings
+
+    def apply_incoming(self, target, incoming):
+        '''Get the links that point to some object, as they'd be after committing.
+
+        Args:
+            target (str): The ID of the object that's linked to.
+            incoming (iterable[tuple[str, str]]):
+                The (source ID, direction) of every link to `target` in the scene.
+
+        Returns:
+            set[tuple[str, str]]: A copy of `incoming` with this session's edits.
+
+        '''
+        incoming = set(key for key in incoming if key not in self._links)
+
+        for key, target_ in self._links.items():
+            if target_ == target:
+                incoming.add(key)
+
+        return incoming
+
+    def apply_to_graph(self, graph):
+        '''Get a copy of some graph that includes this session's edits.
+
+        Args:
+            graph (:class:`pickrunner.graph.LinkGraph`): The links in the scene.
+
+        Returns:
+            :class:`pickrunner.graph.LinkGraph`: The links as they'd be after committing.
+
+        '''
+        edited = graph_.LinkGraph.from_settings(graph.to_settings())
+
+        for identifier in graph.nodes():
+            edited.add_node(identifier, graph.names.get(identifier, ''))
+
+        for source, direction, target in self.get_links():
+            edited.set_link(source, direction, target)
+
+        return edited
+
+    def commit(self, controller):
+        '''Write every edit to the scene, in one batch, and then forget them.
+
+        Args:
+            controller (:class:`pickrunner.gui.BehaviorControl`):
+                The environment to write to. Its
+                :meth:`pickrunner.gui.BehaviorControl.assign_links` is called once.
+
+        Returns:
+            list[tuple[str, str, str]]: Every link that was written.
+
+        '''
+        links = self.get_links()
+
+        if links:
+            controller.assign_links(links)
+
+        self.discard()
+
+        return links
+
+    def discard(self):
+        '''Forget every edit without writing anything.'''
+        self._links.clear()
+
+    def __len__(self):
+        '''int: The number of edited links.'''
+        return len(self._links)
+
+
+def get_active():
+    ''':class:`EditSession` or NoneType: The session that edits go to, if any.'''
+    return _ACTIVE
+
+
+def start():
+    '''Send every new edit to an :class:`EditSession` instead of the scene.
+
+    Returns:
+        :class:`EditSession`: The active session. If a session was already
+        active, it's returned and nothing else happens.
+
+    '''
+    global _ACTIVE  # pylint: disable=global-statement
+
+    if _ACTIVE is None:
+        _ACTIVE = EditSession()
+
+    return _ACTIVE
+
+
+def stop():
+    '''Send edits straight to the scene again.
+
+    Anything left in the session is *not* committed. Call
+    :meth:`EditSession.commit` first, to keep it.
+
+    Returns:
+        :class:`EditSession` or NoneType: The session that was active, if any.
+
+    '''
+    global _ACTIVE  # pylint: disable=global-statement
+
+    active, _ACTIVE = _ACTIVE, None
+
+    return active
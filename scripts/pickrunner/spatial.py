@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+'''Find the object that is in some direction of another object, on screen.
+
+When an object has no Pickrunner link for some direction, the next best guess
+is whatever object the user sees in that direction. This module does the math
+for that guess. Points are projected onto the screen all at once, using a
+single view-projection matrix, and then compared in 2D.
+
+Nothing in this module knows about any DCC. Matrices are flat lists of 16
+numbers, row-major, that multiply row vectors (the same layout that Maya uses).
+
+'''
+
+# IMPORT STANDARD LIBRARIES
+import math
+
+# IMPORT LOCAL LIBRARIES
+from . import directions
+
+
+# How much to penalize a point for being off to the side of the direction
+SIDE_WEIGHT = 2.0
+
+
+def multiply_matrices(first, second):
+    '''list[float]: Multiply two flat, row-major 4x4 matrices.'''
+    return [
+        sum(first[row * 4 + index] * second[index * 4 + column] for index in range(4))
+        for row in range(4)
+        for column in range(4)
+    ]
+
+
+def project_points(matrix, positions, aspect_ratio=1.0):
+    '''Find where many world-space points appear on the screen.
+
+    Args:
+        matrix (list[float]): The view-projection matrix of the camera.
+        positions (list[float]):
+            Every point, flattened. e.g. [x1, y1, z1, x2, y2, z2, ...].
+        aspect_ratio (:obj:`float`, optional):
+            The screen's width divided by its height. It's used to make
+            horizontal and vertical distances comparable.
+
+    Returns:
+        list[tuple[float, float] or NoneType]:
+            The screen position of each point, or None if a point is behind
+            the camera.
+
+    '''
+    (m00, m01, _, m03,
+     m10, m11, _, m13,
+     m20, m21, _, m23,
+     m30, m31, _, m33) = matrix
+
+    points = []
+
+    for index in range(0, len(positions) - 2, 3):
+        x, y, z = positions[index:index + 3]
+        w = x * m03 + y * m13 + z * m23 + m33
+
+        if w <= 0:
+            points.append(None)
+            continue
+
+        points.append((
+            (x * m00 + y * m10 + z * m20 + m30) / w * aspect_ratio,
+            (x * m01 + y * m11 + z * m21 + m31) / w,
+        ))
+
+    return points
+
+
+def get_nearest(origin, points, direction):
+    '''Find the point that's closest to `origin` in some direction.
+
+    Points are scored by how far they are along the direction plus, with a
+    penalty, how far off to the side they are. Points that aren't in the
+    direction at all are ignored.
+
+    Args:
+        origin (tuple[float, float]): The screen position to move from.
+        points (dict[object, tuple[float, float] or NoneType]):
+            Each object and its screen position.
+        direction (str): A direction from :obj:`pickrunner.directions.REGISTRY`.
+
+    Returns:
+        object or NoneType: The best object in `points`, if any.
+
+    '''
+    direction = directions.REGISTRY.get(direction)
+
+    if direction is None or not direction.is_spatial():
+        return None
+
+    length = math.hypot(*direction.vector)
+    direction_x = direction.vector[0] / length
+    direction_y = direction.vector[1] / length
+
+    origin_x, origin_y = origin
+    best = None
+    best_score = float('inf')
+
+    for key, point in points.items():
+        if point is None:
+            continue
+
+        offset_x = point[0] - origin_x
+        offset_y = point[1] - origin_y
+        along = offset_x * direction_x + offset_y * direction_y
+
+        if along <= 0:
+            continue
+
+        side = abs(offset_x * direction_y - offset_y * direction_x)
+        score = along + side * SIDE_WEIGHT
+
+        if score < best_score:
+            best = key
+            best_score = score
+
+    return best
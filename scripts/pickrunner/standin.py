@@ -0,0 +1,245 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+'''A tiny, pure-Python stand-in for a DCC scene.
+
+Pickrunner only needs a few things from a scene: nodes with a unique name and
+a UUID that never changes, string attributes to store its data onto, and undo.
+:class:`Scene` provides exactly that so that Pickrunner's logic can be
+exercised without Maya, quickly and with thousands of nodes.
+
+'''
+
+# IMPORT STANDARD LIBRARIES
+import contextlib
+import itertools
+import json
+
+
+# The attribute that Pickrunner stores its links onto, like in Maya
+ATTRIBUTE_NAME = '__mayarunner_info'
+
+
+def read_settings(scene, uuid):
+    '''Get the links that are stored on a node, ignoring anything malformed.
+
+    This mirrors :func:`pickrunner.scene_index.read_settings`.
+
+    Args:
+        scene (:class:`Scene`): The scene to read from.
+        uuid (str): The node to read.
+
+    Returns:
+        dict[str, str]: Each direction and target UUID.
+
+    '''
+    try:
+        settings = json.loads(scene.get_attribute(uuid, ATTRIBUTE_NAME))
+    except (TypeError, ValueError):
+        return dict()
+
+    if not isinstance(settings, dict):
+        return dict()
+
+    return settings
+
+
+class Scene(object):
+
+    '''An in-memory scene of named nodes that have string attributes.
+
+    Every change can be undone. Changes that are made inside of
+    :meth:`undo_chunk` are undone together, like a Maya undo chunk.
+    Like Maya's attribute-changed callbacks, :meth:`add_callback` is told
+    about every attribute that's set, including by undo.
+
+    '''
+
+    def __init__(self):
+        '''Create an empty scene.'''
+        super(Scene, self).__init__()
+        self._names = dict()
+        self._uuids = dict()
+        self._attributes = dict()
+        self._undo_queue = []
+        self._chunk = None
+        self._counter = itertools.count()
+        self._callbacks = []
+
+    def add_callback(self, function):
+        '''Call `function(uuid, attribute)` whenever an attribute is set or undone.'''
+        self._callbacks.append(function)
+
+    def remove_callback(self, function):
+        '''Stop calling a function that :meth:`add_callback` added.'''
+        self._callbacks.remove(function)
+
+    def _notify(self, uuid, attribute):
+        '''Tell every callback that an attribute of a node changed.'''
+        for function in self._callbacks:
+            function(uuid, attribute)
+
+    @contextlib.contextmanager
+    def undo_chunk(self):
+        '''Group every change made in this context into a single undo step.'''
+        if self._chunk is not None:
+            # Nested chunks are part of the outer chunk
+            yield
+            return
+
+        self._chunk = []
+
+        try:
+            yield
+        finally:
+            chunk, self._chunk = self._chunk, None
+
+            if chunk:
+                self._undo_queue.append(chunk)
+
+    def _add_undo(self, function):
+        '''Remember how to revert the change that was just made.'''
+        if self._chunk is not None:
+            self._chunk.append(function)
+        else:
+            self._undo_queue.append([function])
+
+    def undo(self):
+        '''Revert the last undo step.
+
+        Returns:
+            bool: If there was anything to undo.
+
+        '''
+        try:
+            chunk = self._undo_queue.pop()
+        except IndexError:
+            return False
+
+        for function in reversed(chunk):
+            function()
+
+        return True
+
+    def flush_undo(self):
+        '''Forget every undo step so that nothing before now can be undone.'''
+        self._undo_queue = []
+
+    def _add_node(self, uuid, name, attributes):
+        '''Add a node without recording undo.'''
+        self._names[uuid] = name
+        self._uuids[name] = uuid
+        self._attributes[uuid] = attributes
+
+    def _remove_node(self, uuid):
+        '''Remove a node without recording undo.'''
+        name = self._names.pop(uuid)
+        del self._uuids[name]
+        self._attributes.pop(uuid)
+
+    def create_node(self, name):
+        '''Make a new node.
+
+        Args:
+            name (str): The name of the node. It must be unique.
+
+        Raises:
+            ValueError: If a node with that name already exists.
+
+        Returns:
+            str: The UUID of the new node.
+
+        '''
+        if name in self._uuids:
+            raise ValueError('Node: "{name}" already exists.'.format(name=name))
+
+        uuid = 'UUID-{index:08d}'.format(index=next(self._counter))
+        self._add_node(uuid, name, dict())
+        self._add_undo(lambda: self._remove_node(uuid))
+
+        return uuid
+
+    def delete_node(self, uuid):
+        '''Remove a node and all of its attributes.'''
+        name = self._names[uuid]
+        attributes = self._attributes[uuid]
+        self._remove_node(uuid)
+        self._add_undo(lambda: self._add_node(uuid, name, attributes))
+
+    def rename_node(self, uuid, name):
+        '''Give a node a new, unique name.
+
+        Raises:
+            ValueError: If a node with that name already exists.
+
+        '''
+        if name in self._uuids:
+            raise ValueError('Node: "{name}" already exists.'.format(name=name))
+
+        previous = self._names[uuid]
+
+        def _set_name(old, new):
+            '''Move `uuid` from one name to another.'''
+            del self._uuids[old]
+            self._uuids[new] = uuid
+            self._names[uuid] = new
+
+        _set_name(previous, name)
+        self._add_undo(lambda: _set_name(name, previous))
+
+    def exists(self, uuid):
+        '''bool: If a node with this UUID is in the scene.'''
+        return uuid in self._names
+
+    def get_name(self, uuid):
+        '''str: The name of some node or "" if it doesn't exist.'''
+        return self._names.get(uuid, '')
+
+    def get_uuid(self, name):
+        '''str: The UUID of some node or "" if it doesn't exist.'''
+        return self._uuids.get(name, '')
+
+    def get_attribute(self, uuid, attribute):
+        '''str or NoneType: The value of a node's attribute, if it has one.'''
+        try:
+            return self._attributes[uuid].get(attribute)
+        except KeyError:
+            return None
+
+    def set_attribute(self, uuid, attribute, value):
+        '''Create or change an attribute of a node.
+
+        Raises:
+            KeyError: If the node doesn't exist.
+
+        '''
+        attributes = self._attributes[uuid]
+        missing = object()
+        previous = attributes.get(attribute, missing)
+        attributes[attribute] = value
+
+        def _revert():
+            '''Put the attribute back the way it was.'''
+            if previous is missing:
+                attributes.pop(attribute, None)
+            else:
+                attributes[attribute] = previous
+
+            self._notify(uuid, attribute)
+
+        self._add_undo(_revert)
+        self._notify(uuid, attribute)
+
+    def get_nodes(self, attribute=None):
+        '''list[str]: The UUID of every node, or only the nodes with some attribute.'''
+        if attribute is None:
+            return list(self._names)
+
+        return [
+            uuid for uuid, attributes in self._attributes.items()
+            if attribute in attributes
+        ]
+
+    def __len__(self):
+        '''int: The number of nodes in the scene.'''
+        return len(self._names)
@@ -0,0 +1,170 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+'''Measure how complete the Pickrunner setup of a scene is.
+
+A report has two parts. The first describes the links themselves, like how
+many objects have a link for each direction and which objects can be moved to
+but never away from. It's computed from a single pass over a
+:class:`pickrunner.graph.LinkGraph`. The second part counts how often
+Pickrunner was actually used while animating and how often it had nothing to
+offer and had to fall back to the DCC's own navigation.
+
+'''
+
+# IMPORT STANDARD LIBRARIES
+import collections
+import json
+import time
+
+# IMPORT LOCAL LIBRARIES
+from . import directions as directions_
+
+
+REPORT_VERSION = 1
+
+_MOTIONS = collections.Counter()
+_FALLBACKS = collections.Counter()
+
+
+def record_motion(direction, fell_back=False):
+    '''Count one attempt to move the selection.
+
+    Args:
+        direction (str): The direction that the user moved in.
+        fell_back (:obj:`bool`, optional):
+            If Pickrunner had no link to follow and the DCC's own navigation
+            was used instead.
+
+    '''
+    _MOTIONS[direction] += 1
+
+    if fell_back:
+        _FALLBACKS[direction] += 1
+
+
+def reset_motions():
+    '''Forget every motion that was counted by :func:`record_motion`.'''
+    _MOTIONS.clear()
+    _FALLBACKS.clear()
+
+
+def _get_rate(count, total):
+    '''float: Divide `count` by `total`, treating an empty total as 0.'''
+    if not total:
+        return 0.0
+
+    return float(count) / total
+
+
+def get_motion_stats():
+    '''Describe every motion that was counted since the last reset.
+
+    Returns:
+        dict[str, object]:
+            The "total" number of motions, the number that "fell_back" and
+            the "fallback_rate", plus the same for each direction in "directions".
+
+    '''
+    directions = dict()
+
+    for direction, total in _MOTIONS.items():
+        directions[direction] = {
+            'total': total,
+            'fell_back': _FALLBACKS[direction],
+            'fallback_rate': _get_rate(_FALLBACKS[direction], total),
+        }
+
+    total = sum(_MOTIONS.values())
+    fell_back = sum(_FALLBACKS.values())
+
+    return {
+        'total': total,
+        'fell_back': fell_back,
+        'fallback_rate': _get_rate(fell_back, total),
+        'directions': directions,
+    }
+
+
+def get_graph_stats(graph, directions=None):
+    '''Describe the links of a graph.
+
+    Args:
+        graph (:class:`pickrunner.graph.LinkGraph`): The links to describe.
+        directions (:obj:`iterable[str]`, optional):
+            The directions that every object is expected to have. Any other
+            direction that is found in `graph` is reported, too.
+            Default: Every direction in :obj:`pickrunner.directions.REGISTRY`.
+
+    Returns:
+        dict[str, object]:
+            "nodes" is the number of objects. "coverage" is, for each
+            direction, how many objects have a link in that direction and
+            what fraction of all objects that is. "dead_ends" are the objects
+            that are linked to but have no links of their own. "isolated" are
+            the objects with no links at all.
+
+    '''
+    if directions is None:
+        directions = directions_.REGISTRY.get_names()
+
+    counts = collections.Counter(dict((direction, 0) for direction in directions))
+    targets = set()
+    dead_ends = []
+    isolated = []
+    nodes = graph.nodes()
+
+    for _, direction, target in graph.edges():
+        counts[direction] += 1
+        targets.add(target)
+
+    for identifier in nodes:
+        if graph.get_links(identifier):
+            continue
+
+        if identifier in targets:
+            dead_ends.append(graph.get_name(identifier))
+        else:
+            isolated.append(graph.get_name(identifier))
+
+    coverage = dict(
+        (direction, {'count': count, 'ratio': _get_rate(count, len(nodes))})
+        for direction, count in counts.items()
+    )
+
+    return {
+        'nodes': len(nodes),
+        'links': sum(counts.values()),
+        'coverage': coverage,
+        'dead_ends': sorted(dead_ends),
+        'isolated': sorted(isolated),
+    }
+
+
+def get_report(graph, scene='', directions=None):
+    '''Describe a graph and every motion that was counted, together.
+
+    Args:
+        graph (:class:`pickrunner.graph.LinkGraph`): The links to describe.
+        scene (:obj:`str`, optional): The scene that the links came from.
+        directions (:obj:`iterable[str]`, optional):
+            The directions that every object is expected to have.
+            Default: Every direction in :obj:`pickrunner.directions.REGISTRY`.
+
+    Returns:
+        dict[str, object]: The report. It can be saved as JSON.
+
+    '''
+    return {
+        'version': REPORT_VERSION,
+        'scene': scene,
+        'time': time.time(),
+        'graph': get_graph_stats(graph, directions=directions),
+        'motions': get_motion_stats(),
+    }
+
+
+def write_report(path, report):
+    '''Save a report from :func:`get_report` as a JSON file.'''
+    with open(path, 'w') as handler:
+        json.dump(report, handler, indent=4, sort_keys=True)
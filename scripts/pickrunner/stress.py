@@ -0,0 +1,465 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+'''Hammer Pickrunner's link index with random edits and check that it holds up.
+
+:class:`Harness` builds a :class:`pickrunner.standin.Scene` with many nodes and
+drives a :class:`pickrunner.memory.MemoryBehaviorControl` for it through the
+real :class:`pickrunner.gui.AssignmentManagerWidget`, so the same code that
+writes, indexes and undoes links for a user is what's tested. It applies a
+random sequence of assignments and chains (with Auto-Pair), deletions,
+renames, motions, undos and corrupted data and checks, as it goes, that
+
+- every outgoing link of the index is also an incoming link and vice versa
+- the index matches the data that's actually stored on every node
+- with Auto-Pair, every A -> direction -> B link also creates B -> opposite -> A
+- undo reverts every link of an assignment together, as one step
+- a motion selects the linked node and never a node that doesn't exist
+- each kind of operation stays within its time budget
+
+Run it from a shell, with the "scripts" folder on the PYTHONPATH and Qt.py installed:
+
+.. code-block :: bash
+
+    QT_QPA_PLATFORM=offscreen python -m pickrunner.stress --nodes 10000 --operations 10000 --seed 1
+
+The same seed always produces the same sequence of operations.
+
+'''
+
+# IMPORT STANDARD LIBRARIES
+import argparse
+import collections
+import itertools
+import json
+import random
+import sys
+import time
+
+# IMPORT THIRD-PARTY LIBRARIES
+from Qt import QtCore
+from Qt import QtWidgets
+
+# IMPORT LOCAL LIBRARIES
+from . import directions
+from . import graph as graph_
+from . import gui
+from . import memory
+from . import standin
+
+
+# Assignments and motions are what users do most, so they're picked most often
+OPERATIONS = (
+    'assign', 'assign', 'assign', 'chain', 'move', 'move', 'delete', 'rename', 'undo', 'corrupt')
+CORRUPT_VALUES = ('', '{', '[1, 2]', 'null', '"text"', '{"up": ')
+CHECK_INTERVAL = 500
+# The most seconds that each operation may take, on average
+BUDGETS = {
+    'assign': 0.001,
+    'chain': 0.002,
+    'move': 0.001,
+    'delete': 0.001,
+    'rename': 0.001,
+    'undo': 0.001,
+    'corrupt': 0.001,
+    'rebuild': 1.0,
+}
+
+
+class InvariantError(Exception):
+
+    '''An error that is raised when the index no longer describes the scene.'''
+
+    pass
+
+
+class Harness(object):
+
+    '''A controller, its scene, the GUI that drives it and random operations to run on them.'''
+
+    def __init__(self, node_count=1000, seed=None, auto_pair=True):
+        '''Create a scene with some number of nodes and no links.
+
+        A Qt application must already exist.
+
+        Args:
+            node_count (:obj:`int`, optional): The number of nodes to create.
+            seed (:obj:`int`, optional): Makes the operations repeatable.
+            auto_pair (:obj:`bool`, optional):
+                If every assignment also links the target back to the source.
+
+        '''
+        super(Harness, self).__init__()
+        self.random = random.Random(seed)
+        self.auto_pair = auto_pair
+        self.controller = memory.MemoryBehaviorControl()
+        self.scene = self.controller.scene
+        self.widget = gui.AssignmentManagerWidget(self.controller)
+        self.widget.autopair_check_box.setChecked(auto_pair)
+        self.selection = None
+        self.timings = collections.defaultdict(list)
+        # The links that each undo step changed and what they were before it,
+        # or None for steps that didn't change any links, like deleting a node
+        #
+        self._history = []
+        self._nodes = []
+        self._names = itertools.count()
+
+        for index in range(node_count):
+            self._nodes.append(
+                self.controller.create_object('ctrl_{index}'.format(index=index)))
+
+        self.scene.flush_undo()
+
+    def _get_random_node(self):
+        '''str or NoneType: Any node that exists, if there are any.'''
+        for _ in range(len(self._nodes)):
+            uuid = self.random.choice(self._nodes)
+
+            if self.scene.exists(uuid):
+                return uuid
+
+        return None
+
+    def _get_previous_links(self, links):
+        '''list[tuple[str, str, str]]: What each (source, direction) of some links is now.'''
+        graph = self.controller.get_graph()
+
+        return [
+            (source, direction, graph.get_link(source, direction) or '')
+            for source, direction, _ in links
+        ]
+
+    def _check_links(self, links, reason):
+        '''Make sure that the index and the scene both have every (source, direction, target) link.'''
+        graph = self.controller.get_graph()
+
+        for source, direction, target in links:
+            stored = self.controller.get_settings(source).get(direction, '')
+
+            if (graph.get_link(source, direction) or '') != target or stored != target:
+                raise InvariantError(
+                    '{reason} "{source}" {direction} "{target}" was lost.'.format(
+                        reason=reason, source=source, direction=direction, target=target))
+
+    def _check_paired(self, links):
+        '''Make sure that, with Auto-Pair, every A -> direction -> B also has B -> opposite -> A.'''
+        if not self.auto_pair:
+            return
+
+        paired = []
+
+        for source, direction, target in links:
+            opposite = directions.REGISTRY.get_opposite(direction)
+
+            if opposite:
+                paired.append((target, opposite, source))
+
+        self._check_links(paired, 'Auto-Pair link')
+
+    def _record(self, links=None):
+        '''Remember the links that one undo step changed and what they were before it.'''
+        self._history.append(links)
+
+    def assign(self):
+        '''Link one random node to another, in a random direction, like the GUI does.'''
+        source = self._get_random_node()
+        target = self._get_random_node()
+
+        if source is None or source == target:
+            return
+
+        direction = self.random.choice(directions.REGISTRY.get_names())
+        opposite = directions.REGISTRY.get_opposite(direction)
+        expected = [(source, direction, target)]
+
+        if self.auto_pair and opposite:
+            expected.append((target, opposite, source))
+
+        previous = self._get_previous_links(expected)
+        links = self.widget.assign(source, direction, target)
+        self._record(previous)
+
+        self._check_links(links, 'Assigning')
+        self._check_paired(links[:1])
+
+    def chain(self):
+        '''Link a few random nodes, in order, like the GUI does when "Chain" is checked.'''
+        nodes = []
+
+        for _ in range(self.random.randint(2, 5)):
+            node = self._get_random_node()
+
+            if node is not None and node not in nodes:
+                nodes.append(node)
+
+        if len(nodes) < 2:
+            return
+
+        direction = self.random.choice(directions.REGISTRY.get_names())
+        opposite = ''
+
+        if self.auto_pair:
+            opposite = directions.REGISTRY.get_opposite(direction)
+
+        previous = self._get_previous_links(gui.get_chain_links(nodes, direction, opposite))
+        links = self.widget.assign_chain(nodes, direction)
+        self._record(previous)
+
+        self._check_links(links, 'Chaining')
+        self._check_paired(
+            [(source, direction_, target) for source, direction_, target in links
+             if direction_ == direction])
+
+    def delete(self):
+        '''Delete a random node. Just like in Maya, its links are left in the index.'''
+        uuid = self._get_random_node()
+
+        if uuid is not None:
+            self.scene.delete_node(uuid)
+            self._record()
+
+    def rename(self):
+        '''Give a random node a new name.'''
+        uuid = self._get_random_node()
+
+        if uuid is None:
+            return
+
+        self.scene.rename_node(uuid, 'renamed_{index}'.format(index=next(self._names)))
+        self._record()
+
+    def move(self):
+        '''Follow a link from the selected node, like pressing an arrow key.'''
+        if self.selection is None or not self.scene.exists(self.selection):
+            self.selection = self._get_random_node()
+
+        if self.selection is None:
+            return
+
+        direction = self.random.choice(directions.REGISTRY.get_names())
+        expected = self.controller.get_graph().get_link(self.selection, direction)
+        self.controller.select([self.selection])
+        target = self.controller.do_motion(direction, self.selection)
+
+        if target is not None:
+            if target != expected or self.controller.get_selection() != [target]:
+                raise InvariantError('Moving {direction} from "{uuid}" selected "{target}".'.format(
+                    direction=direction, uuid=self.selection, target=target))
+
+            self.selection = target
+
+        if not self.scene.exists(self.selection):
+            raise InvariantError('Moved to "{uuid}", which does not exist.'.format(
+                uuid=self.selection))
+
+    def undo(self):
+        '''Undo the last change and check that every link it made was reverted, together.'''
+        if not self.controller.undo():
+            return
+
+        previous = self._history.pop()
+
+        if previous is not None:
+            self._check_links(previous, 'Undoing back to')
+
+    def corrupt(self):
+        '''Replace the data of a random node with something that isn't valid.'''
+        uuid = self._get_random_node()
+
+        if uuid is None:
+            return
+
+        self.scene.set_attribute(
+            uuid, standin.ATTRIBUTE_NAME, self.random.choice(CORRUPT_VALUES))
+        self._record()
+
+        settings = self.controller.get_settings(uuid)
+        if settings:
+            raise InvariantError('Corrupted data of "{uuid}" was read as "{settings}".'.format(
+                uuid=uuid, settings=settings))
+
+        if self.controller.get_graph().get_links(uuid):
+            raise InvariantError('Corrupted data of "{uuid}" is still indexed.'.format(uuid=uuid))
+
+    def check(self):
+        '''Make sure that the index still describes the scene.
+
+        Raises:
+            :class:`InvariantError`: If anything is wrong.
+
+        '''
+        graph = self.controller.get_graph()
+
+        # pylint: disable=protected-access
+        for source, direction, target in graph.edges():
+            if (source, direction) not in graph._incoming.get(target, set()):
+                raise InvariantError(
+                    'Link "{source}" {direction} has no incoming link on "{target}".'
+                    ''.format(source=source, direction=direction, target=target))
+
+        for target, sources in graph._incoming.items():
+            for source, direction in sources:
+                if graph.get_link(source, direction) != target:
+                    raise InvariantError(
+                        'Incoming link "{source}" {direction} is not an outgoing link.'
+                        ''.format(source=source, direction=direction))
+
+        for uuid in self.scene.get_nodes(standin.ATTRIBUTE_NAME):
+            stored = self.controller.get_settings(uuid)
+
+            if graph.get_links(uuid) != stored:
+                raise InvariantError(
+                    'Node "{uuid}" stores "{stored}" but the index has "{links}".'.format(
+                        uuid=uuid, stored=stored, links=graph.get_links(uuid)))
+
+    def rebuild(self):
+        '''Build a new index from every node in the scene, like opening a scene.
+
+        Returns:
+            :class:`pickrunner.graph.LinkGraph`: The new index.
+
+        '''
+        return graph_.LinkGraph.from_settings(dict(
+            (uuid, standin.read_settings(self.scene, uuid))
+            for uuid in self.scene.get_nodes(standin.ATTRIBUTE_NAME)
+        ))
+
+    def _time(self, name, function):
+        '''Run a function and remember how long it took, under some name.'''
+        start = time.time()
+        result = function()
+        self.timings[name].append(time.time() - start)
+
+        return result
+
+    def run(self, count, check_interval=CHECK_INTERVAL):
+        '''Run some number of random operations, checking the index as it goes.
+
+        Args:
+            count (int): The number of operations to run.
+            check_interval (:obj:`int`, optional):
+                How many operations to run between each :meth:`check`.
+
+        Raises:
+            :class:`InvariantError`: If the index stops describing the scene.
+
+        '''
+        for index in range(count):
+            name = self.random.choice(OPERATIONS)
+            self._time(name, getattr(self, name))
+
+            if (index + 1) % check_interval == 0:
+                self.check()
+
+        self.check()
+
+        rebuilt = self._time('rebuild', self.rebuild)
+        if rebuilt.to_settings() != dict(
+                (uuid, links) for uuid, links in self.controller.get_graph().to_settings().items()
+                if self.scene.exists(uuid)):
+            raise InvariantError('Rebuilding the index gives different links.')
+
+    def get_timings(self):
+        '''dict[str, dict[str, float]]: The count, mean and max seconds of each operation.'''
+        return dict(
+            (name, {
+                'count': len(times),
+                'mean': sum(times) / len(times),
+                'max': max(times),
+            })
+            for name, times in self.timings.items()
+        )
+
+    def get_over_budget(self, budgets=None):
+        '''dict[str, float]: Every operation whose mean time is over its budget.'''
+        if budgets is None:
+            budgets = BUDGETS
+
+        return dict(
+            (name, timing['mean']) for name, timing in self.get_timings().items()
+            if timing['mean'] > budgets.get(name, float('inf'))
+        )
+
+
+def run(node_count=10000, operations=10000, seed=None, auto_pair=True, budgets=None):
+    '''Run a randomized stress test and describe the result.
+
+    Args:
+        node_count (:obj:`int`, optional): The number of nodes to create.
+        operations (:obj:`int`, optional): The number of operations to run.
+        seed (:obj:`int`, optional):
+            Makes the operations repeatable. Default: A random seed.
+        auto_pair (:obj:`bool`, optional): If assignments link both ways.
+        budgets (:obj:`dict[str, float]`, optional):
+            The most seconds that each operation may take, on average.
+            Default: :obj:`BUDGETS`.
+
+    Raises:
+        :class:`InvariantError`: If the index stops describing the scene.
+
+    Returns:
+        dict[str, object]: The "seed", "timings" and "over_budget" operations.
+
+    '''
+    if seed is None:
+        seed = random.randint(0, 2 ** 31)
+
+    # The GUI that the harness drives needs an application, even offscreen
+    application = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    harness = Harness(node_count=node_count, seed=seed, auto_pair=auto_pair)
+    harness.run(operations)
+    result = {
+        'seed': seed,
+        'nodes': node_count,
+        'operations': operations,
+        'timings': harness.get_timings(),
+        'over_budget': harness.get_over_budget(budgets),
+    }
+
+    # Delete the GUI while the application still exists or Qt crashes on exit
+    harness.widget.deleteLater()
+    application.sendPostedEvents(None, QtCore.QEvent.DeferredDelete)
+
+    return result
+
+
+def main(arguments=None):
+    '''Run :func:`run` from the command-line and print its result as JSON.
+
+    Returns:
+        int: 0 if everything passed, otherwise 1.
+
+    '''
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--nodes', type=int, default=10000, help='The number of nodes.')
+    parser.add_argument('--operations', type=int, default=10000, help='The number of operations.')
+    parser.add_argument('--seed', type=int, help='Repeat the operations of an earlier run.')
+    parser.add_argument('--no-auto-pair', action='store_true', help='Only link one way.')
+    options = parser.parse_args(arguments)
+    seed = options.seed
+
+    if seed is None:
+        seed = random.randint(0, 2 ** 31)
+
+    try:
+        result = run(
+            node_count=options.nodes,
+            operations=options.operations,
+            seed=seed,
+            auto_pair=not options.no_auto_pair,
+        )
+    except InvariantError as error:
+        print('Failed with seed {seed}: {error}'.format(seed=seed, error=error))
+        return 1
+
+    print(json.dumps(result, indent=4, sort_keys=True))
+
+    if result['over_budget']:
+        return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
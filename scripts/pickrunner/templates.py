@@ -0,0 +1,280 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+'''Share one copy of Pickrunner data between every instance of the same asset.
+
+When a rig is referenced into a scene many times, every copy carries the exact
+same Pickrunner data. Instead of caching each copy, this module stores the
+data once per asset as a :class:`TemplateGraph` whose links use names without
+any namespace, like "L_arm_ctrl". Navigating from "crowd_12:L_arm_ctrl" then
+just means looking up "L_arm_ctrl" and putting "crowd_12:" back in front of
+the result.
+
+Templates are never built by reading the scene. They're made from the index
+of a namespace that was already built (see :mod:`pickrunner.scene_index`),
+the first time that navigation touches that namespace after it was indexed.
+So memory stays proportional to the number of distinct assets that are
+actually used, not the number of instances in the scene, and templates keep
+working after the index of a namespace is forgotten to make room for others.
+
+Instances of the same asset don't always match, though. Reference edits that
+were saved in the shot, or links that were edited since, only change one
+namespace. So every namespace also has a signature (see :func:`get_signature`)
+and a template is only shared by namespaces of the same asset that have the
+same signature.
+
+Links to nodes outside of the namespace (a scene-level control, a prop,
+another character) can't be made relative. The template only remembers that
+they exist, as :obj:`EXTERNAL`, so that they're looked up some other way.
+
+'''
+
+# IMPORT LOCAL LIBRARIES
+from . import lru
+
+# The relative target of a link that leaves its namespace. Names are never empty
+EXTERNAL = ''
+# Templates are per asset, not per namespace, so a few go a long way
+MAX_RESIDENT_TEMPLATES = 32
+
+
+def split_namespace(name):
+    '''Split a node name into its namespace and its name without a namespace.
+
+    Example:
+        >>> split_namespace('crowd_12:body:L_arm_ctrl')
+        ('crowd_12:body', 'L_arm_ctrl')
+        >>> split_namespace('L_arm_ctrl')
+        ('', 'L_arm_ctrl')
+
+    Returns:
+        tuple[str, str]: The namespace and the relative name.
+
+    '''
+    name = name.split('|')[-1]
+    namespace, _, relative = name.rpartition(':')
+    return (namespace, relative)
+
+
+def join_namespace(namespace, relative):
+    '''str: Add a namespace to the front of a relative name.'''
+    if not namespace:
+        return relative
+
+    return namespace + ':' + relative
+
+
+def get_signature(links):
+    '''Summarize the relative links of a namespace, so that it's cheap to compare.
+
+    Two namespaces with the same relative links always get the same signature,
+    no matter which order their nodes were read in.
+
+    Args:
+        links (dict[str, dict[str, str]]):
+            Each relative node name and its direction / relative target names.
+
+    Returns:
+        int: The signature.
+
+    '''
+    return hash(frozenset(
+        (relative, frozenset(relative_links.items()))
+        for relative, relative_links in links.items()
+    ))
+
+
+class TemplateGraph(object):
+
+    '''The namespace-relative Pickrunner links of one asset.'''
+
+    def __init__(self, links):
+        '''Create the template.
+
+        Args:
+            links (dict[str, dict[str, str]]):
+                Each relative node name and its direction / relative target
+                names. A target of :obj:`EXTERNAL` is outside the namespace.
+
+        '''
+        super(TemplateGraph, self).__init__()
+        self._links = links
+
+    def get_link(self, relative, direction):
+        '''str or NoneType: The relative name that some node moves to (or :obj:`EXTERNAL`), if any.'''
+        try:
+            return self._links[relative][direction]
+        except KeyError:
+            return None
+
+    def get_links(self, relative):
+        '''dict[str, str]: Every direction and relative target of some node.'''
+        return dict(self._links.get(relative, dict()))
+
+    def has_node(self, relative):
+        '''bool: If some node's links are in this template, even if it has none.'''
+        return relative in self._links
+
+    def __len__(self):
+        '''int: The number of nodes in this template that have links.'''
+        return len(self._links)
+
+
+class TemplateCache(object):
+
+    '''Lazily build and share :class:`TemplateGraph` objects between namespaces.
+
+    This class doesn't know how to talk to any DCC. Instead, it is given
+    three functions, one that finds the asset that a node comes from, one
+    that gets the relative links of a namespace from its index and one that
+    gets the signature of those links.
+
+    Templates are stored per asset and signature so a namespace whose links
+    differ from the other instances' (e.g. because of reference edits) gets
+    its own template instead of using theirs.
+
+    '''
+
+    def __init__(self, get_asset, get_namespace_links, get_namespace_signature,
+                 max_size=MAX_RESIDENT_TEMPLATES):
+        '''Create an empty cache.
+
+        Args:
+            get_asset (callable[str] -> str):
+                Find the asset (e.g. the referenced file path) that a node comes
+                from. It must return "" if the node doesn't come from an asset.
+            get_namespace_links (callable[str] -> dict[str, dict[str, str]] or NoneType):
+                Get every relative link in some namespace or None if the
+                namespace isn't indexed yet.
+            get_namespace_signature (callable[str] -> int or NoneType):
+                Get the :func:`get_signature` of some namespace's relative
+                links or None if the namespace isn't indexed yet. It must be
+                cheap because it's called on every lookup.
+            max_size (:obj:`int`, optional):
+                The most templates to keep in memory at once. When more are
+                needed, the least-recently-used template is forgotten.
+
+        '''
+        super(TemplateCache, self).__init__()
+        self._get_asset = get_asset
+        self._get_namespace_links = get_namespace_links
+        self._get_namespace_signature = get_namespace_signature
+
+        self._templates = lru.LRUCache(max_size)
+        self._namespaces = dict()
+
+    def get_template(self, name):
+        '''Find the template for the namespace of some node.
+
+        The template is made from the index of the namespace if no other
+        namespace of the same asset and with the same links has made it yet.
+
+        Args:
+            name (str): The full name of a node, including its namespace.
+
+        Returns:
+            tuple[str, :class:`TemplateGraph`] or NoneType:
+                The node's namespace and its template, or None if the node
+                doesn't come from an asset or its namespace isn't indexed.
+
+        '''
+        namespace, _ = split_namespace(name)
+        if not namespace:
+            return None
+
+        try:
+            asset = self._namespaces[namespace]
+        except KeyError:
+            # Namespaces that don't come from an asset are remembered too, so
+            # that they're only ever checked once
+            #
+            asset = self._get_asset(name)
+            self._namespaces[namespace] = asset
+
+        if not asset:
+            return None
+
+        signature = self._get_namespace_signature(namespace)
+        if signature is None:
+            return None
+
+        key = (asset, signature)
+        template = self._templates.get(key)
+        if template is None:
+            links = self._get_namespace_links(namespace)
+
+            if links is None:
+                return None
+
+            template = TemplateGraph(links)
+            self._templates.set(key, template)
+
+        return (namespace, template)
+
+    def get_link(self, name, direction):
+        '''Find the node that some node moves to, using its asset's template.
+
+        Args:
+            name (str): The full name of the node to move from.
+            direction (str): The direction to move in.
+
+        Returns:
+            tuple[bool, str or NoneType]:
+                If the template knows the link and, if so, the full name of
+                the node to move to (or None if it has no link in that
+                direction). Links that leave the namespace and nodes that
+                weren't indexed when the template was made aren't known.
+
+        '''
+        found = self.get_template(name)
+        if found is None:
+            return (False, None)
+
+        namespace, template = found
+        _, source = split_namespace(name)
+
+        if not template.has_node(source):
+            return (False, None)
+
+        relative = template.get_link(source, direction)
+
+        if relative is None:
+            return (True, None)
+
+        if relative == EXTERNAL:
+            return (False, None)
+
+        return (True, join_namespace(namespace, relative))
+
+    def evict_asset(self, asset):
+        '''Forget every template and namespace of some asset.'''
+        for namespace, asset_ in list(self._namespaces.items()):
+            if not asset_ or asset_ == asset:
+                # Namespaces without an asset are forgotten too, in case the
+                # reference was loaded into a namespace that had none before
+                #
+                del self._namespaces[namespace]
+
+        for key in self._templates.keys():
+            if key[0] == asset:
+                self._templates.pop(key)
+
+    def clear(self):
+        '''Forget everything.'''
+        self._templates.clear()
+        self._namespaces.clear()
+
+    def get_template_count(self):
+        '''int: The number of templates that are in memory.'''
+        return len(self._templates)
+
+    def get_stats(self):
+        '''dict[str, int]: How well the templates have been reused.'''
+        stats = self._templates.get_stats()
+        stats['namespaces'] = len(self._namespaces)
+
+        return stats
+
+    def get_namespace_count(self):
+        '''int: The number of namespaces whose asset is known.'''
+        return len(self._namespaces)
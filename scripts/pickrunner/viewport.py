@@ -0,0 +1,228 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+'''Guess where to move to, from what the user sees in Maya's viewport.
+
+When a node has no Pickrunner link for a direction, Pickrunner normally falls
+back to pickWalk, which follows the DAG hierarchy. On a rig, that's rarely
+where the user wanted to go. If this fallback is enabled, the controls in the
+same namespace as the node are projected into the active camera, instead,
+and the nearest visible control in the pressed direction is chosen.
+
+Every control's position is queried in a single call and projected with a
+single matrix. Controls can be moved by anything (the channel box, scripts,
+constraints, animation) so their positions are queried on every key press.
+The projected positions are cached for each camera, namespace and set of
+positions, so only the projection is skipped when nothing moved.
+
+This module only uses maya.cmds and the Maya Python API.
+
+'''
+
+# IMPORT STANDARD LIBRARIES
+import collections
+
+# IMPORT THIRD-PARTY LIBRARIES
+from maya.api import OpenMaya as om
+from maya.api import OpenMayaUI as omui
+from maya import cmds
+
+# IMPORT LOCAL LIBRARIES
+from . import control_state
+from . import lru
+from . import spatial
+from . import templates
+
+
+OPTION_VARIABLE = 'pickrunner_viewportFallback'
+MAX_CACHED_VIEWS = 16
+
+_PROJECTIONS = lru.LRUCache(MAX_CACHED_VIEWS)
+_CANDIDATES = dict()
+_CALLBACKS = []
+
+
+def is_enabled():
+    '''bool: If motions without a link should use the viewport instead of pickWalk.'''
+    return bool(cmds.optionVar(query=OPTION_VARIABLE))
+
+
+def set_enabled(value):
+    '''Turn the viewport fallback on or off. The choice is saved in Maya's preferences.'''
+    cmds.optionVar(intValue=(OPTION_VARIABLE, int(bool(value))))
+
+
+def get_active_view():
+    ''':class:`maya.api.OpenMayaUI.M3dView` or NoneType: The viewport the user is in.'''
+    try:
+        return omui.M3dView.active3dView()
+    except RuntimeError:
+        return None
+
+
+def _get_elements(matrix):
+    '''list[float]: Flatten a Maya matrix, row by row.'''
+    return [matrix.getElement(row, column) for row in range(4) for column in range(4)]
+
+
+def get_view_projection(view):
+    '''Get everything needed to project points into some viewport.
+
+    Args:
+        view (:class:`maya.api.OpenMayaUI.M3dView`): The viewport.
+
+    Returns:
+        tuple[str, list[float], float]:
+            The camera's name, its view-projection matrix and the viewport's
+            width divided by its height.
+
+    '''
+    camera = view.getCamera()
+    projection = om.MFnCamera(camera).projectionMatrix()
+    matrix = spatial.multiply_matrices(
+        _get_elements(camera.inclusiveMatrixInverse()), _get_elements(projection))
+    aspect_ratio = float(view.portWidth()) / max(view.portHeight(), 1)
+
+    return (camera.fullPathName(), matrix, aspect_ratio)
+
+
+def get_candidates(namespace):
+    '''Find every control that could be moved to, in some namespace.
+
+    A control is any transform with a NURBS curve shape.
+
+    Args:
+        namespace (str): The namespace to search. "" is the root namespace.
+
+    Returns:
+        list[str]: The full path of every control.
+
+    '''
+    try:
+        return _CANDIDATES[namespace]
+    except KeyError:
+        pass
+
+    pattern = namespace + ':*' if namespace else '*'
+    shapes = cmds.ls(pattern, type='nurbsCurve', long=True, noIntermediate=True)
+    candidates = []
+
+    if shapes:
+        parents = cmds.listRelatives(shapes, parent=True, fullPath=True) or []
+        candidates = list(collections.OrderedDict.fromkeys(parents))
+
+    _CANDIDATES[namespace] = candidates
+
+    return candidates
+
+
+def _get_positions(nodes):
+    '''list[float]: The flattened world-space pivot of every node, in one query.'''
+    if not nodes:
+        return []
+
+    return cmds.xform(nodes, query=True, worldSpace=True, rotatePivot=True) or []
+
+
+def get_projected_candidates(namespace, camera, matrix, aspect_ratio):
+    '''Get the screen position of every control in a namespace.
+
+    Args:
+        namespace (str): The namespace whose controls should be projected.
+        camera (str): The name of the camera to project through.
+        matrix (list[float]): The camera's view-projection matrix.
+        aspect_ratio (float): The viewport's width divided by its height.
+
+    Returns:
+        dict[str, tuple[float, float] or NoneType]:
+            Each control and its screen position or None, if it's off-screen.
+
+    '''
+    nodes = get_candidates(namespace)
+    positions = _get_positions(nodes)
+    key = (camera, namespace, tuple(matrix), aspect_ratio, tuple(positions))
+    points = _PROJECTIONS.get(key)
+
+    if points is None:
+        points = dict(zip(nodes, spatial.project_points(
+            matrix, positions, aspect_ratio=aspect_ratio)))
+        _PROJECTIONS.set(key, points)
+
+    return points
+
+
+def find_nearest(node, direction):
+    '''Find the control that the user sees next to `node`, in some direction.
+
+    Args:
+        node (str): The name of the node to move from.
+        direction (str): The direction to move in. e.g. "up".
+
+    Returns:
+        str or NoneType: The full path of the found control, if any.
+
+    '''
+    install()
+
+    view = get_active_view()
+    if view is None:
+        return None
+
+    try:
+        node = cmds.ls(node, long=True)[0]
+    except IndexError:
+        return None
+
+    camera, matrix, aspect_ratio = get_view_projection(view)
+    namespace = templates.split_namespace(node)[0]
+    points = get_projected_candidates(namespace, camera, matrix, aspect_ratio)
+
+    try:
+        origin = points[node]
+    except KeyError:
+        origin = spatial.project_points(
+            matrix, _get_positions([node]), aspect_ratio=aspect_ratio)[0]
+
+    if origin is None:
+        return None
+
+    points = dict(
+        (candidate, point) for candidate, point in points.items()
+        if point is not None and control_state.is_navigable(candidate)
+    )
+
+    return spatial.get_nearest(origin, points, direction)
+
+
+def clear(*_):
+    '''Forget every cached control and projection.'''
+    _PROJECTIONS.clear()
+    _CANDIDATES.clear()
+
+
+def install():
+    '''Forget cached controls whenever they could have been added, removed or renamed.
+
+    Calling this function more than once does nothing.
+
+    '''
+    if _CALLBACKS:
+        return
+
+    for message in (om.MSceneMessage.kAfterOpen, om.MSceneMessage.kAfterNew):
+        _CALLBACKS.append(om.MSceneMessage.addCallback(message, clear))
+
+    for event in ('Undo', 'Redo'):
+        _CALLBACKS.append(om.MEventMessage.addEventCallback(event, clear))
+
+    _CALLBACKS.append(om.MDGMessage.addNodeAddedCallback(clear, 'nurbsCurve'))
+    _CALLBACKS.append(om.MDGMessage.addNodeRemovedCallback(clear, 'nurbsCurve'))
+    _CALLBACKS.append(om.MNodeMessage.addNameChangedCallback(om.MObject.kNullObj, clear))
+
+
+def uninstall():
+    '''Remove every callback that :func:`install` added.'''
+    while _CALLBACKS:
+        om.MMessage.removeCallback(_CALLBACKS.pop())
+
+    clear()